@@ -0,0 +1,101 @@
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+# Denetim kaydı bu kaydediciye yazılır; konsola gitmez, yalnızca JSON satırları dosyasına yazılır
+AUDIT_LOGGER = "lottery.audit"
+AUDIT_FILE_NAME = "audit.jsonl"
+# Denetim dosyası bu boyutta döndürülür; en fazla AUDIT_BACKUP_COUNT eski dosya tutulur
+AUDIT_MAX_BYTES = 5 * 1024 * 1024
+AUDIT_BACKUP_COUNT = 10
+
+audit_logger = logging.getLogger(AUDIT_LOGGER)
+audit_logger.propagate = False
+# setup_logging çağrılana kadar denetim kapalıdır; komut satırı araçları kayıt kurmaz
+audit_logger.setLevel(logging.CRITICAL + 1)
+
+
+# QueueHandler kaydı kuyruğa koymadan önce iletiyi biçimlendirir; burada biçimlendirme
+# dinleyici iş parçacığına bırakılır, çağıran yalnızca kaydı oluşturup kuyruğa ekler.
+# Bu yüzden günlük argümanları çağrıdan sonra değiştirilmemelidir.
+class LazyQueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record):
+        return record
+
+
+class JsonLinesFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            'ts': time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created)) + f".{int(record.msecs):03d}",
+            'action': record.getMessage(),
+            **getattr(record, 'audit', {})
+        }
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def parse_level(value, default=logging.INFO):
+    if not value:
+        return default
+    if value.isdigit():
+        return int(value)
+    level = logging.getLevelName(value.upper())
+    if not isinstance(level, int):
+        raise ValueError(f"Unknown log level: {value}")
+    return level
+
+
+# Kök kaydediciye ve denetim kaydedicisine kuyruk işleyicisi takar; konsol ve dosyaya
+# yazma tek bir dinleyici iş parçacığında yapılır. Düzeyler ortam değişkenleriyle seçilir:
+#   LOTTERY_LOG_LEVEL     konsol düzeyi (varsayılan INFO), ör. DEBUG, WARNING
+#   LOTTERY_AUDIT_LEVEL   denetim düzeyi (varsayılan INFO); OFF denetim dosyasını kapatır
+# Dönen dinleyici uygulama kapanırken stop ile durdurulur; kuyrukta kalanlar yazılır.
+def setup_logging(data_dir, level=None, audit_level=None):
+    level = parse_level(level or os.getenv("LOTTERY_LOG_LEVEL"))
+    audit_level = audit_level or os.getenv("LOTTERY_AUDIT_LEVEL") or "INFO"
+
+    console = logging.StreamHandler(sys.stderr)
+    console.setFormatter(logging.Formatter(LOG_FORMAT))
+    console.addFilter(lambda record: record.name != AUDIT_LOGGER)
+    handlers = [console]
+    if audit_level.upper() != "OFF":
+        try:
+            data_dir.mkdir(parents=True, exist_ok=True)
+            audit_file = logging.handlers.RotatingFileHandler(
+                data_dir / AUDIT_FILE_NAME, maxBytes=AUDIT_MAX_BYTES, backupCount=AUDIT_BACKUP_COUNT,
+                encoding="utf-8", delay=True)
+        except OSError as e:
+            print(f"Audit log could not be opened: {e}", file=sys.stderr)
+        else:
+            audit_file.setFormatter(JsonLinesFormatter())
+            audit_file.addFilter(lambda record: record.name == AUDIT_LOGGER)
+            handlers.append(audit_file)
+            audit_logger.setLevel(parse_level(audit_level))
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(LazyQueueHandler(log_queue))
+    root.setLevel(level)
+    for handler in audit_logger.handlers[:]:
+        audit_logger.removeHandler(handler)
+    audit_logger.addHandler(LazyQueueHandler(log_queue))
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers)
+    listener.start()
+    return listener
+
+
+# Denetim kaydı: action iletinin kendisi, alanlar JSON satırına eklenir. Kapalıyken
+# alanlar hiç kurulmasın diye çağıranlar önce audit_enabled'a bakabilir.
+def audit(action, **fields):
+    audit_logger.info(action, extra={'audit': fields})
+
+
+def audit_enabled():
+    return audit_logger.isEnabledFor(logging.INFO)
@@ -0,0 +1,97 @@
+import argparse
+import csv
+import json
+import logging
+import pathlib
+import sys
+
+from draw_engine import DrawEngine, run_all
+from draw_rng import DrawRandom
+
+
+def write_json(path, source, results, errors, remaining, rng_description):
+    for result in results:
+        if result['index'] in errors:
+            result['error'] = errors[result['index']]
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({'source': str(source), 'rng': rng_description, 'remaining': remaining, 'draws': results},
+                  file, ensure_ascii=False, indent=4)
+
+
+def write_csv(path, results):
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["draw_index", "title", "kind", "rank", "name"])
+        for result in results:
+            for kind in ("main", "backup"):
+                for rank, name in enumerate(result[kind], start=1):
+                    writer.writerow([result['index'], result['title'], kind, rank, name])
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="list.json dosyalarındaki tüm çekilişleri arayüz olmadan arka arkaya yürütür.")
+    parser.add_argument("inputs", nargs="+", type=pathlib.Path, help="Çekiliş JSON dosyaları")
+    parser.add_argument("-o", "--output-dir", type=pathlib.Path, default=pathlib.Path("."),
+                        help="Sonuç dosyalarının yazılacağı dizin")
+    parser.add_argument("-f", "--format", nargs="+", choices=["json", "csv"], default=["json"],
+                        help="Çıktı biçimleri")
+    parser.add_argument("--remove", choices=["main", "all"], default="all",
+                        help="Her çekilişten sonra yalnızca ana talihlileri mi yoksa hepsini mi çıkar")
+    parser.add_argument("--seed", type=int, default=None, help="Tekrarlanabilir sonuçlar için tohum")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    failed_sources = 0
+    failed_draws = 0
+    used_stems = set()
+
+    for source in args.inputs:
+        # Her dosya kendi tohumuyla çekilir; --seed verilirse dosya adıyla birleştirilir
+        rng = DrawRandom.seeded(f"{args.seed}:{source}") if args.seed is not None else DrawRandom.secure()
+        rng_description = {key: value for key, value in rng.describe().items() if key != 'state'}
+        try:
+            engine = DrawEngine.from_file(source, rng)
+        except Exception as e:
+            logging.error("Error loading %s: %s", source, e)
+            failed_sources += 1
+            continue
+
+        errors = run_all(engine, remove_backups=args.remove == "all")
+        for index, message in errors.items():
+            logging.warning("%s: %s", source, message)
+
+        # Farklı dizinlerdeki aynı adlı dosyalar birbirinin sonucunu ezmesin
+        stem = source.stem
+        suffix = 1
+        while stem in used_stems:
+            suffix += 1
+            stem = f"{source.stem}_{suffix}"
+        used_stems.add(stem)
+
+        results = engine.results()
+        if "json" in args.format:
+            write_json(args.output_dir / f"{stem}_results.json", source, results,
+                       errors, len(engine.names), rng_description)
+        if "csv" in args.format:
+            write_csv(args.output_dir / f"{stem}_results.csv", results)
+        # Atlanan çekilişler de sonuç dosyasında yer alır; tamamlanmış sayılmaz
+        failed_draws += len(errors)
+        if errors:
+            logging.warning("%s: %d draws completed, %d failed", source, len(engine.draws) - len(errors), len(errors))
+        else:
+            logging.info("%s: %d draws completed", source, len(engine.draws))
+
+    if failed_sources or failed_draws:
+        logging.error("%d of %d files could not be loaded, %d draws failed",
+                      failed_sources, len(args.inputs), failed_draws)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
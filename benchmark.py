@@ -0,0 +1,229 @@
+import argparse
+import itertools
+import json
+import logging
+import os
+import pathlib
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+# Qt bölümleri ekran olmadan çalışsın
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QMessageBox, QVBoxLayout, QWidget
+
+import lottery
+from draw_engine import DrawEngine
+from draw_journal import DrawJournal
+from name_utils import NameIndex
+
+
+def synthetic_names(count):
+    return [f"Katılımcı {index:08d}" for index in range(count)]
+
+
+def synthetic_draws(count=10):
+    return [{'title': f"Ödül {index + 1}", 'main_count': 3, 'backup_count': 2} for index in range(count)]
+
+
+# setup her tekrardan önce, ölçüm dışında çalışır
+def measure(function, repeat, setup=None):
+    timings = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        function()
+        timings.append((time.perf_counter() - started) * 1000)
+    return {'min_ms': round(min(timings), 3), 'median_ms': round(statistics.median(timings), 3)}
+
+
+class BenchmarkSuite:
+    def __init__(self, workdir, repeat):
+        self.workdir = workdir
+        self.repeat = repeat
+        self.results = []
+
+        # Gerçek veri dizinine dokunmamak için tüm yollar geçici dizine yönlendirilir
+        lottery.DATA_DIR = workdir
+        lottery.CACHE_DIR = workdir / "cache"
+        self.reset_data()
+
+        self.host = QWidget()
+        self.host_layout = QVBoxLayout(self.host)
+
+    def record(self, benchmark, size, timing):
+        entry = {'benchmark': benchmark, 'size': size, **timing}
+        self.results.append(entry)
+        print(f"{benchmark:<28} {size:>10}  min {timing['min_ms']:>12.3f} ms  median {timing['median_ms']:>12.3f} ms",
+              flush=True)
+
+    # Her kayıt yeni bir etkinlik açtığından etkinlik veritabanı ve dizinleri de silinir;
+    # yollar etkinlik dışı çalışma dizinine döner
+    def reset_data(self):
+        if lottery.EVENTS is not None:
+            lottery.EVENTS.close()
+        lottery.EVENTS = None
+        lottery.CURRENT_EVENT = None
+        lottery.JSON_FILE = self.workdir / "list.json"
+        lottery.STORE_FILE = self.workdir / "names.lns"
+        shutil.rmtree(self.workdir / "events", ignore_errors=True)
+        events_file = lottery.EVENTS_FILE_NAME
+        for name in ("list.json", "list.journal", "list.snapshot.json", "list.history.jsonl", "names.lns",
+                     events_file, f"{events_file}-wal", f"{events_file}-shm"):
+            path = self.workdir / name
+            if path.exists():
+                path.unlink()
+
+    def run_size(self, size):
+        names = synthetic_names(size)
+
+        choose_screen = lottery.ModernChooseScreen(self.host_layout, lambda: None)
+        text = "\n".join(names)
+        self.record("parse_names", size, measure(lambda: choose_screen.parse_names(text), self.repeat))
+
+        def save_round_trip():
+            choose_screen.imported_names = names
+            choose_screen.name_entry.clear()
+            choose_screen.save_and_exit()
+        self.record("save_and_exit", size, measure(save_round_trip, self.repeat, self.reset_data))
+        self.clear_host()
+
+        def load():
+            engine = DrawEngine.from_file(lottery.JSON_FILE)
+            engine.close()
+        self.record("load_data", size, measure(load, self.repeat))
+
+        self.reset_data()
+        with open(lottery.JSON_FILE, "w", encoding="utf-8") as file:
+            json.dump({'names': names, 'draws': synthetic_draws()}, file, ensure_ascii=False)
+        screens = []
+
+        # Her açılış boş günlükle başlar; önceki ekranın günlüğü yeniden oynatılmaz
+        def fresh_journal():
+            if screens:
+                screens[-1].stop_workers()
+                screens[-1].engine.close()
+                self.clear_host()
+            DrawJournal(lottery.JSON_FILE).clear()
+        self.record("open_draw_screen", size,
+                    measure(lambda: screens.append(self.open_draw_screen()), self.repeat, fresh_journal))
+        draw_screen = screens[-1]
+        self.record("perform_draw", size, measure(draw_screen.perform_draw, self.repeat))
+
+        def draw_and_remove(remove):
+            draw_screen.engine.draw()
+            remove()
+            draw_screen.engine.go_back()
+        self.record("remove_main_and_next", size,
+                    measure(lambda: draw_and_remove(draw_screen.engine.remove_main_and_next), self.repeat))
+        self.record("remove_all_and_next", size,
+                    measure(lambda: draw_and_remove(draw_screen.engine.remove_all_and_next), self.repeat))
+        draw_screen.engine.draw()
+        draw_screen.engine.remove_all_and_next()
+        self.record("undo_redo", size,
+                    measure(lambda: (draw_screen.engine.undo(), draw_screen.engine.redo()), self.repeat))
+        targets = iter(random.sample(names, min(size, self.repeat)))
+        self.record("remove_specific_name", size,
+                    measure(lambda: draw_screen.engine.remove_name(next(targets)), self.repeat))
+        draw_screen.stop_workers()
+        draw_screen.engine.close()
+        self.clear_host()
+        self.reset_data()
+
+        indexes = []
+        self.record("name_index_build", size, measure(lambda: indexes.append(NameIndex(names)), self.repeat))
+        # Her sorgu bir önek, bir soyadı öneki ve bir harf hatalı yazımdan oluşur
+        queries = itertools.cycle([name[:12] for name in random.sample(names, min(size, 100))]
+                                  + ["katilimci 0001", "katılımcı 00001", "katlimci 0002"])
+        self.record("name_suggest", size, measure(lambda: indexes[0].suggest(next(queries)), self.repeat))
+
+    # Ekran listeyi arka planda yükler; ölçüm yükleme bitene kadar sürer
+    def open_draw_screen(self):
+        screen = lottery.ModernDrawScreen(self.host_layout, lambda: None)
+        while screen.loading:
+            QApplication.processEvents()
+        return screen
+
+    def clear_host(self):
+        while self.host_layout.count():
+            widget = self.host_layout.takeAt(0).widget()
+            if widget:
+                widget.deleteLater()
+
+    def run_background(self):
+        image_path = "lotterybg.png"
+        if not os.path.exists(image_path):
+            print("lotterybg.png not found, skipping background benchmark")
+            return
+
+        def cold():
+            for cached in lottery.CACHE_DIR.glob("*.png"):
+                cached.unlink()
+            lottery.load_background_pixmap(image_path, 0.4, 1920, 1080)
+        self.record("setup_background_cold", 1920 * 1080, measure(cold, self.repeat))
+        self.record("setup_background_cached", 1920 * 1080,
+                    measure(lambda: lottery.load_background_pixmap(image_path, 0.4, 1920, 1080), self.repeat))
+        # Piramit arka planda kurulur; bu süre boyunca boyutlandırma ilk görüntüyle yapılır
+        self.record("background_pyramid", 1920 * 1080,
+                    measure(lambda: lottery.build_background_pyramid(image_path, 0.4), self.repeat))
+        # Ertelenen ölçekleme görevinin gerçek yeniden örnekleme maliyeti: 2560 seviyesinden 4K'ya
+        # büyütme ve seviyelerden birine denk gelmeyen bir pencere boyutu
+        levels = lottery.build_background_pyramid(image_path, 0.4)
+        cases = [
+            ("background_rescale_up_4k", levels[lottery.BACKGROUND_LEVELS.index(2560)], 3840, 2160),
+            ("background_rescale_3000", levels[lottery.pick_background_level(levels, 3000, 1700)], 3000, 1700),
+        ]
+        for name, level, width, height in cases:
+            task = lottery.BackgroundRescaleTask(level, width, height, 0, lottery.BackgroundSignals())
+            task.setAutoDelete(False)
+            self.record(name, width * height, measure(task.run, self.repeat))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Ayrıştırma, çekiliş, çıkarma, kalıcılık ve çizim ölçümleri.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6],
+                        help="Sentetik havuz boyutları (10^7'ye kadar)")
+    parser.add_argument("--repeat", type=int, default=3, help="Her ölçümün tekrar sayısı")
+    parser.add_argument("--output", type=pathlib.Path, default=pathlib.Path("benchmark_results.json"),
+                        help="Makinece okunabilir sonuç dosyası")
+    parser.add_argument("--seed", type=int, default=0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    random.seed(args.seed)
+    app = QApplication.instance() or QApplication(sys.argv)
+    logging.getLogger().setLevel(logging.WARNING)
+    # Ölçümler sırasında açılan bilgi kutuları akışı durdurmasın
+    QMessageBox.information = staticmethod(lambda *args, **kwargs: QMessageBox.Ok)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        suite = BenchmarkSuite(pathlib.Path(workdir), args.repeat)
+        for size in args.sizes:
+            suite.run_size(size)
+            app.processEvents()
+        suite.run_background()
+        suite.reset_data()
+
+    report = {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': args.repeat,
+        'results': suite.results
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=4)
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,164 @@
+import argparse
+import asyncio
+import base64
+import json
+import os
+import socket
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from broadcast_server import BroadcastServer, read_frame
+
+# Yavaş istemcilerin alma tamponu; küçük tutulur ki sunucu tarafı kuyruk gerçekten dolsun
+SLOW_RECEIVE_BUFFER = 4096
+
+
+def raise_file_limit(clients):
+    try:
+        import resource
+    except ImportError:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    # Her istemci için sunucu ve istemci tarafında birer soket açılır
+    needed = clients * 2 + 256
+    if soft != resource.RLIM_INFINITY and soft < needed:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (needed if hard == resource.RLIM_INFINITY else min(needed, hard), hard))
+
+
+# Tarayıcıyı taklit eden izleyici: anlık görüntüyü ve ardından gelen mesajları okur.
+# Yavaş istemciler okumaya geç başlar; sunucunun onları beklemediği ölçülür.
+async def audience_client(port, last_value, delay, result):
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    if delay:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SLOW_RECEIVE_BUFFER)
+    sock.setblocking(False)
+    await asyncio.get_running_loop().sock_connect(sock, ("127.0.0.1", port))
+    reader, writer = await asyncio.open_connection(sock=sock)
+    key = base64.b64encode(os.urandom(16)).decode("ascii")
+    writer.write(("GET /ws HTTP/1.1\r\nHost: 127.0.0.1\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                  f"Sec-WebSocket-Key: {key}\r\nSec-WebSocket-Version: 13\r\n\r\n").encode("latin-1"))
+    response = await reader.readuntil(b"\r\n\r\n")
+    if not response.startswith(b"HTTP/1.1 101"):
+        raise ConnectionError(response.split(b"\r\n")[0].decode("latin-1"))
+    result['connected'] += 1
+    if delay:
+        await asyncio.sleep(delay)
+
+    snapshots = 0
+    while True:
+        _, data = await read_frame(reader, max_size=1 << 24)
+        message = json.loads(data)
+        if message['type'] == "snapshot":
+            # İlk anlık görüntü bağlanırken gelir; sonrakiler kuyruk taşmasının işaretidir
+            snapshots += 1
+            if snapshots == 2:
+                result['resynced'] += 1
+            if message['countdown'] == last_value:
+                break
+            continue
+        result['messages'] += 1
+        if not delay:
+            result['latencies'].append(time.time() - message['sent'])
+        if message['value'] == last_value:
+            break
+    result['final'] += 1
+    writer.close()
+
+
+async def run_clients(port, count, last_value, delay):
+    result = {'connected': 0, 'messages': 0, 'resynced': 0, 'final': 0, 'latencies': []}
+    # Bağlantılar gruplar halinde açılır; dinleme kuyruğu taşmasın
+    connect_limit = asyncio.Semaphore(100)
+
+    async def client():
+        async with connect_limit:
+            task = asyncio.ensure_future(audience_client(port, last_value, delay, result))
+            await asyncio.sleep(0.001)
+        await task
+
+    await asyncio.gather(*(client() for _ in range(count)))
+    return result
+
+
+# Süreç havuzunda çalışır; istemciler sunucuyla aynı yorumlayıcı kilidini paylaşmaz
+def client_group(port, count, last_value, delay):
+    raise_file_limit(count)
+    return asyncio.run(run_clients(port, count, last_value, delay))
+
+
+def split(total, parts):
+    return [total // parts + (1 if part < total % parts else 0) for part in range(parts)]
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    raise_file_limit(args.clients)
+    server = BroadcastServer("127.0.0.1", 0, args.queue_size)
+    server.start()
+    last_value = args.messages - 1
+    padding = "x" * args.payload
+    fast_clients = args.clients - args.slow
+
+    with ProcessPoolExecutor(max_workers=args.workers + 1) as executor:
+        started = time.perf_counter()
+        fast_futures = [executor.submit(client_group, server.port, count, last_value, 0)
+                        for count in split(fast_clients, args.workers) if count]
+        slow_future = executor.submit(client_group, server.port, args.slow, last_value, args.slow_delay)
+        while server.client_count < args.clients:
+            time.sleep(0.01)
+            if time.perf_counter() - started > 60:
+                print(f"Only {server.client_count} of {args.clients} clients connected", file=sys.stderr)
+                return 1
+        connect_time = time.perf_counter() - started
+
+        # Arayüz iş parçacığı gibi yayın sunucusunu ana iş parçacığından besler
+        started = time.perf_counter()
+        publish_calls = []
+        for value in range(args.messages):
+            call_started = time.perf_counter()
+            server.publish({'type': "countdown", 'value': value, 'sent': time.time(), 'padding': padding})
+            publish_calls.append(time.perf_counter() - call_started)
+            time.sleep(args.interval)
+        publish_time = time.perf_counter() - started
+        fast = [future.result() for future in fast_futures]
+        slow = slow_future.result()
+        total_time = time.perf_counter() - started
+
+    stats = server.stats()
+    server.stop()
+
+    latencies = sorted(latency for result in fast for latency in result['latencies'])
+    delivered = sum(result['messages'] for result in fast)
+    print(f"{args.clients} clients ({args.slow} slow) connected in {connect_time:.2f} s")
+    print(f"{args.messages} messages published in {publish_time:.2f} s "
+          f"(publish call max {max(publish_calls) * 1000:.3f} ms), all clients done in {total_time:.2f} s")
+    print(f"Fast clients: {delivered} of {fast_clients * args.messages} messages delivered, "
+          f"{sum(result['resynced'] for result in fast)} resynced")
+    if latencies:
+        print(f"Fan-out latency: p50 {statistics.median(latencies) * 1000:.1f} ms  "
+              f"p99 {latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000:.1f} ms  "
+              f"max {latencies[-1] * 1000:.1f} ms")
+    print(f"Slow clients: {slow['resynced']} of {args.slow} resynced from snapshot, "
+          f"{slow['messages']} messages read, {slow['final']} reached the final state")
+    print(f"Server: {stats['dropped']} queued messages dropped in favour of snapshots")
+    return 0
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Yayın sunucusunu yerel olarak çok sayıda izleyiciyle dener.")
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--slow", type=int, default=20, help="Okumaya geç başlayan istemci sayısı")
+    parser.add_argument("--slow-delay", type=float, default=8.0, help="Yavaş istemcilerin bekleme süresi (sn)")
+    parser.add_argument("--messages", type=int, default=150)
+    parser.add_argument("--interval", type=float, default=0.04, help="Mesajlar arası süre (sn)")
+    parser.add_argument("--payload", type=int, default=4096, help="Mesaj başına dolgu baytı")
+    parser.add_argument("--queue-size", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=max(1, min(4, (os.cpu_count() or 2) - 1)),
+                        help="İstemcileri çalıştıran süreç sayısı")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
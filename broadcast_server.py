@@ -0,0 +1,319 @@
+import asyncio
+import base64
+import collections
+import hashlib
+import json
+import logging
+import socket
+import threading
+
+# RFC 6455 el sıkışmasında istemci anahtarına eklenen sabit
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+# İstemci başına bekleyebilecek en fazla mesaj; aşılırsa kuyruk anlık görüntüyle değiştirilir
+QUEUE_SIZE = 32
+# Bağlantı başına çekirdek ve aktarım tamponu; takılan istemci bundan fazla bellek tutmaz
+WRITE_BUFFER_LIMIT = 64 * 1024
+# Bu sürede yazılamayan istemci bağlantısı kapatılır
+SEND_TIMEOUT = 10
+# İzleyici ekranları yalnızca kapatma/ping gönderir; büyük çerçeveler reddedilir
+MAX_CLIENT_FRAME = 4096
+
+AUDIENCE_PAGE = """<!DOCTYPE html>
+<html lang="tr">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>İNOVEL Çekiliş</title>
+<style>
+body { margin: 0; min-height: 100vh; display: flex; flex-direction: column; align-items: center;
+       justify-content: center; background: #1e1e1e; color: #fff; font-family: "Segoe UI", sans-serif;
+       text-align: center; }
+#title { font-size: 5vw; font-weight: bold; margin: 2vh 4vw; }
+#countdown { font-size: 16vw; font-weight: bold; min-height: 1.2em; }
+#winners { font-size: 3vw; margin: 0 4vw; }
+#status { position: fixed; bottom: 1vh; right: 1vw; color: #777; font-size: 14px; }
+</style>
+</head>
+<body>
+<div id="title"></div>
+<div id="countdown"></div>
+<div id="winners"></div>
+<div id="status">bağlanıyor...</div>
+<script>
+const state = {};
+function escape(text) {
+  return String(text).replace(/[&<>"]/g, c => ({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"}[c]));
+}
+function render() {
+  document.getElementById("title").textContent = state.title || "";
+  document.getElementById("countdown").textContent = state.countdown == null ? "" : state.countdown;
+  let html = "";
+  if (state.winners) {
+    html = "<b>Ana Talihliler:</b> " + state.winners.main.map(escape).join(" - ");
+    if (state.winners.backup.length) {
+      html += "<br><br><b>Yedek Talihliler:</b> " + state.winners.backup.map(escape).join(" - ");
+    }
+  }
+  document.getElementById("winners").innerHTML = html;
+}
+function connect() {
+  const socket = new WebSocket("ws://" + location.host + "/ws");
+  socket.onopen = () => document.getElementById("status").textContent = "";
+  socket.onclose = () => {
+    document.getElementById("status").textContent = "bağlantı koptu, yeniden bağlanıyor...";
+    setTimeout(connect, 1000);
+  };
+  socket.onmessage = event => {
+    const message = JSON.parse(event.data);
+    if (message.type === "snapshot" || message.type === "draw") {
+      Object.assign(state, {title: message.title, countdown: message.countdown, winners: message.winners});
+    } else if (message.type === "countdown") {
+      state.countdown = message.value;
+      state.winners = null;
+    } else if (message.type === "winners") {
+      state.countdown = null;
+      state.winners = {main: message.main, backup: message.backup};
+    }
+    render();
+  };
+}
+connect();
+</script>
+</body>
+</html>
+"""
+
+
+def encode_frame(payload, opcode=0x1):
+    length = len(payload)
+    if length < 126:
+        header = bytes([0x80 | opcode, length])
+    elif length < 65536:
+        header = bytes([0x80 | opcode, 126]) + length.to_bytes(2, "big")
+    else:
+        header = bytes([0x80 | opcode, 127]) + length.to_bytes(8, "big")
+    return header + payload
+
+
+async def read_frame(reader, max_size=MAX_CLIENT_FRAME):
+    head = await reader.readexactly(2)
+    opcode = head[0] & 0x0F
+    length = head[1] & 0x7F
+    if length == 126:
+        length = int.from_bytes(await reader.readexactly(2), "big")
+    elif length == 127:
+        length = int.from_bytes(await reader.readexactly(8), "big")
+    if length > max_size:
+        raise ConnectionError(f"Frame too large: {length} bytes")
+    mask = await reader.readexactly(4) if head[1] & 0x80 else None
+    data = await reader.readexactly(length)
+    if mask:
+        data = bytes(byte ^ mask[position % 4] for position, byte in enumerate(data))
+    return opcode, data
+
+
+# Bağlı bir izleyici. Yazma tamponu doluyken gelen mesajlar istemcinin kendi
+# kuyruğunda bekler ve kendi görevinde yazılır; yavaş bir istemci yalnızca kendi
+# kuyruğunu doldurur. Kuyruk dolduğunda bekleyen mesajlar atılır ve yerine güncel
+# anlık görüntü konur, istemci böylece ara adımları atlayıp yetişir.
+class _Client:
+    def __init__(self, writer, queue_size):
+        self.writer = writer
+        self.transport = writer.transport
+        self.transport.set_write_buffer_limits(high=WRITE_BUFFER_LIMIT)
+        sock = writer.get_extra_info("socket")
+        if sock is not None:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, WRITE_BUFFER_LIMIT)
+        self.queue_size = queue_size
+        self.pending = collections.deque()
+        self.wakeup = asyncio.Event()
+        self.dropped = 0
+
+    def send(self, frame, snapshot_frame):
+        # Hızlı yol: tampon müsaitken çerçeve görev uyandırmadan doğrudan yazılır
+        if not self.pending and self.transport.get_write_buffer_size() < WRITE_BUFFER_LIMIT:
+            self.transport.write(frame)
+            return
+        if len(self.pending) >= self.queue_size:
+            self.dropped += len(self.pending)
+            self.pending.clear()
+            frame = snapshot_frame()
+        self.pending.append(frame)
+        self.wakeup.set()
+
+    async def run_sender(self):
+        while True:
+            await self.wakeup.wait()
+            self.wakeup.clear()
+            await asyncio.wait_for(self.writer.drain(), SEND_TIMEOUT)
+            while self.pending:
+                self.transport.write(self.pending.popleft())
+
+
+# Çekiliş ekranındaki olayları yerel ağdaki tarayıcılara ve ikinci ekranlara yayınlar.
+# Sunucu kendi iş parçacığındaki asyncio döngüsünde çalışır; publish arayüz
+# iş parçacığından çağrılır ve hiçbir zaman beklemez.
+class BroadcastServer:
+    def __init__(self, host="0.0.0.0", port=8765, queue_size=QUEUE_SIZE):
+        self.host = host
+        self.port = port
+        self.queue_size = queue_size
+        self.clients = set()
+        self.snapshot = {'type': "snapshot", 'index': None, 'total': None, 'title': "",
+                         'countdown': None, 'winners': None}
+        self.dropped = 0
+        self._snapshot_frame = None
+        self._handlers = set()
+        self._loop = None
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        started = threading.Event()
+        errors = []
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            try:
+                self._server = self._loop.run_until_complete(
+                    asyncio.start_server(self._handle, self.host, self.port, backlog=1024))
+            except OSError as e:
+                errors.append(e)
+                started.set()
+                return
+            self.port = self._server.sockets[0].getsockname()[1]
+            started.set()
+            self._loop.run_forever()
+            self._loop.close()
+
+        self._thread = threading.Thread(target=run, name="BroadcastServer", daemon=True)
+        self._thread.start()
+        started.wait()
+        if errors:
+            raise errors[0]
+        logging.info("Broadcast server listening on %s:%s", self.host, self.port)
+
+    def stop(self):
+        if self._thread is None:
+            return
+        if self._server is not None:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), self._loop).result(SEND_TIMEOUT)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._thread = None
+
+    async def _shutdown(self):
+        self._server.close()
+        for client in list(self.clients):
+            client.writer.close()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        await self._server.wait_closed()
+
+    def publish(self, message):
+        if self._loop is not None and self._server is not None:
+            self._loop.call_soon_threadsafe(self._broadcast, message)
+
+    @property
+    def client_count(self):
+        return len(self.clients)
+
+    def stats(self):
+        return {
+            'clients': len(self.clients),
+            'dropped': self.dropped + sum(client.dropped for client in self.clients)
+        }
+
+    # Tüm istemcilere aynı çerçeve gider; mesaj yalnızca bir kez kodlanır
+    def _broadcast(self, message):
+        kind = message['type']
+        if kind == "draw":
+            self.snapshot.update(index=message['index'], total=message['total'], title=message['title'],
+                                 countdown=None, winners=message['winners'])
+        elif kind == "countdown":
+            self.snapshot.update(countdown=message['value'], winners=None)
+        elif kind == "winners":
+            self.snapshot.update(countdown=None, winners={'main': message['main'], 'backup': message['backup']})
+        self._snapshot_frame = None
+
+        frame = encode_frame(json.dumps(message, ensure_ascii=False).encode("utf-8"))
+        for client in self.clients:
+            client.send(frame, self.snapshot_frame)
+
+    def snapshot_frame(self):
+        if self._snapshot_frame is None:
+            self._snapshot_frame = encode_frame(json.dumps(self.snapshot, ensure_ascii=False).encode("utf-8"))
+        return self._snapshot_frame
+
+    async def _handle(self, reader, writer):
+        handler = asyncio.current_task()
+        self._handlers.add(handler)
+        try:
+            request = await reader.readuntil(b"\r\n\r\n")
+            lines = request.decode("latin-1").split("\r\n")
+            method, path = lines[0].split(" ")[:2]
+            headers = {}
+            for line in lines[1:]:
+                if ":" in line:
+                    key, value = line.split(":", 1)
+                    headers[key.strip().lower()] = value.strip()
+
+            if path == "/ws" and headers.get("upgrade", "").lower() == "websocket":
+                await self._serve_websocket(reader, writer, headers)
+            elif method == "GET" and path == "/":
+                await self._respond(writer, "200 OK", "text/html; charset=utf-8", AUDIENCE_PAGE.encode("utf-8"))
+            elif method == "GET" and path == "/state":
+                await self._respond(writer, "200 OK", "application/json",
+                                    json.dumps(self.snapshot, ensure_ascii=False).encode("utf-8"))
+            else:
+                await self._respond(writer, "404 Not Found", "text/plain", b"Not found")
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError,
+                asyncio.TimeoutError, ValueError):
+            pass
+        finally:
+            writer.close()
+            self._handlers.discard(handler)
+
+    async def _respond(self, writer, status, content_type, body):
+        writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                     f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()
+
+    async def _serve_websocket(self, reader, writer, headers):
+        key = headers.get("sec-websocket-key")
+        if not key:
+            await self._respond(writer, "400 Bad Request", "text/plain", b"Missing Sec-WebSocket-Key")
+            return
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode("ascii")).digest()).decode("ascii")
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode("latin-1"))
+
+        client = _Client(writer, self.queue_size)
+        # Sonradan katılan ekran mevcut durumu hemen görür
+        client.send(self.snapshot_frame(), self.snapshot_frame)
+        self.clients.add(client)
+        sender = asyncio.ensure_future(client.run_sender())
+        try:
+            await self._read_client(reader, client, sender)
+        finally:
+            self.clients.discard(client)
+            self.dropped += client.dropped
+            if sender.done() and not sender.cancelled():
+                sender.exception()
+            sender.cancel()
+            await asyncio.gather(sender, return_exceptions=True)
+
+    async def _read_client(self, reader, client, sender):
+        receiver = asyncio.ensure_future(read_frame(reader))
+        while True:
+            done, _ = await asyncio.wait({receiver, sender}, return_when=asyncio.FIRST_COMPLETED)
+            if sender in done:
+                receiver.cancel()
+                # Yazma zaman aşımı veya kopan bağlantı
+                return
+            opcode, data = receiver.result()
+            if opcode == 0x8:
+                client.writer.write(encode_frame(data[:2], 0x8))
+                return
+            if opcode == 0x9:
+                client.send(encode_frame(data, 0xA), self.snapshot_frame)
+            receiver = asyncio.ensure_future(read_frame(reader))
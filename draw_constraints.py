@@ -0,0 +1,140 @@
+import bisect
+import itertools
+
+from name_pool import NamePool, WeightedNamePool
+
+
+class ConstraintError(ValueError):
+    pass
+
+
+# Çekiliş kuralları "draws" girdisinde isteğe bağlı alanlardır:
+#   "max_per": {"bolum": 2}                  -> her bölümden en fazla 2 ana (ve ayrıca 2 yedek) talihli
+#   "quota": {"kampus": {"A": 2, "B": 1}}    -> ana talihlilerin tam 2'si A'dan, 1'i B'den;
+#                                               kalan ana yerler listede olmayan değerlere gider
+#   "exclude_previous_winners": true | "all" -> önceki çekilişlerin ana (all: ana + yedek)
+#                                               talihlileri bu çekilişe katılmaz
+# max_per ve quota aynı tek özniteliği kullanmalıdır. Özniteliği olmayan katılımcılar
+# ayrı bir grup (None) sayılır.
+def parse_constraints(draw):
+    max_per = draw.get('max_per') or {}
+    quota_spec = draw.get('quota') or {}
+    attributes = set(max_per) | set(quota_spec)
+    if len(attributes) > 1:
+        raise ConstraintError(f"'{draw['title']}': max_per and quota must use the same attribute")
+    attribute = attributes.pop() if attributes else None
+    cap = max_per.get(attribute)
+    quota = quota_spec.get(attribute) or {}
+    if cap is not None and cap < 1:
+        raise ConstraintError(f"'{draw['title']}': max_per must be at least 1")
+    if sum(quota.values()) > draw["main_count"]:
+        raise ConstraintError(f"'{draw['title']}': quotas exceed the main winner count")
+    for value, count in quota.items():
+        if count < 0 or (cap is not None and count > cap):
+            raise ConstraintError(f"'{draw['title']}': quota for '{value}' conflicts with max_per")
+    exclude = draw.get('exclude_previous_winners') or False
+    return attribute, cap, quota, exclude
+
+
+def has_constraints(draw):
+    return bool(draw.get('max_per') or draw.get('quota') or draw.get('exclude_previous_winners'))
+
+
+def grouping_attributes(draws):
+    return sorted({attribute for draw in draws
+                   for attribute in itertools.chain(draw.get('max_per') or {}, draw.get('quota') or {})})
+
+
+# Kurallarda geçen her öznitelik için havuzun değer başına alt havuzları. Ana havuzla
+# aynı sırada güncellenir; remove'un döndürdüğü konumlarla restore birebir geri alır,
+# böylece alt havuzların sırası da yükleme yolundan ve geri almalardan bağımsızdır.
+class GroupedPools:
+    def __init__(self, attribute_names, attributes, weights=None):
+        self.attribute_names = list(attribute_names)
+        self.attributes = attributes
+        self.weights = weights
+        self.groups = {attribute: {} for attribute in self.attribute_names}
+
+    def value(self, name, attribute):
+        return self.attributes.get(name, {}).get(attribute)
+
+    def _pool(self, attribute, value):
+        groups = self.groups[attribute]
+        pool = groups.get(value)
+        if pool is None:
+            pool = WeightedNamePool((), self.weights) if self.weights else NamePool()
+            groups[value] = pool
+        return pool
+
+    def add(self, name):
+        for attribute in self.attribute_names:
+            self._pool(attribute, self.value(name, attribute)).add(name)
+
+    def remove(self, name, attribute_names=None):
+        positions = []
+        for attribute in attribute_names or self.attribute_names:
+            pool = self.groups[attribute].get(self.value(name, attribute))
+            position = pool.position(name) if pool is not None else None
+            if position is not None:
+                pool.remove(name)
+            positions.append(position)
+        return positions
+
+    def restore(self, name, positions, attribute_names=None):
+        for attribute, position in zip(attribute_names or self.attribute_names, positions):
+            if position is not None:
+                self._pool(attribute, self.value(name, attribute)).restore(name, position)
+
+
+def _group_weight(pool):
+    return pool.total_weight if isinstance(pool, WeightedNamePool) else len(pool)
+
+
+# Gruplardan count kişiyi sırayla çeker: her adımda kuralı bozmayan gruplar arasından
+# biri kalan ağırlığıyla orantılı seçilir, ardından o gruptan bir kişi çekilir. Bu, kuralı
+# bozacak kişileri atlayarak sırayla çekmekle aynı dağılımı verir ama hiç yeniden çekmez.
+# Seçilenler gruptan geçici olarak çıkarılır ve (isim, konumlar) olarak taken'a eklenir.
+def sample_groups(grouped, attribute, count, cap, quota, rng, taken):
+    groups = grouped.groups[attribute]
+    values = list(groups)
+    free = count - sum(quota.values())
+    counts = dict.fromkeys(values, 0)
+
+    def eligible(value):
+        if value in quota:
+            return counts[value] < quota[value]
+        return free > 0 and (cap is None or counts[value] < cap)
+
+    weights = [_group_weight(groups[value]) if eligible(value) else 0 for value in values]
+    selected = []
+    for _ in range(count):
+        cumulative = list(itertools.accumulate(weights))
+        if not cumulative or cumulative[-1] == 0:
+            break
+        position = bisect.bisect_right(cumulative, rng.randrange(cumulative[-1]))
+        value = values[position]
+        name = groups[value].sample(1, rng)[0]
+        taken.append((name, grouped.remove(name, [attribute])))
+        selected.append(name)
+        counts[value] += 1
+        if value not in quota:
+            free -= 1
+            if free == 0:
+                weights = [weight if values[index] in quota else 0 for index, weight in enumerate(weights)]
+        weights[position] = _group_weight(groups[value]) if eligible(value) else 0
+    return selected
+
+
+# Ana talihliler için kuralların karşılanabilirliğini çekilişten önce denetler
+def shortage(grouped, attribute, count, cap, quota):
+    groups = grouped.groups[attribute]
+    for value, needed in quota.items():
+        available = len(groups.get(value) or ())
+        if available < needed:
+            return f"quota for '{value}' needs {needed}, {available} eligible"
+    free = count - sum(quota.values())
+    open_places = sum(len(pool) if cap is None else min(cap, len(pool))
+                      for value, pool in groups.items() if value not in quota)
+    if open_places < free:
+        return f"{free} open places, {open_places} eligible within max_per"
+    return None
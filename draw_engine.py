@@ -0,0 +1,496 @@
+import json
+import logging
+import pathlib
+
+from app_logging import audit, audit_enabled
+from draw_constraints import (ConstraintError, GroupedPools, grouping_attributes, has_constraints,
+                              parse_constraints, sample_groups, shortage)
+from draw_rng import DrawRandom
+from json_stream import iter_object
+from name_pool import NamePool, WeightedNamePool
+from name_store import MappedNamePool
+
+
+class InsufficientParticipantsError(Exception):
+    pass
+
+
+# Büyük listelerde isimler JSON yerine list.json'un yanındaki .lns deposunda tutulur.
+# İsteğe bağlı "weights" sözlüğü isim başına bilet sayısını verir (varsayılan 1).
+# İsteğe bağlı "attributes" sözlüğü isim başına {öznitelik: değer} tutar (bölüm, kampüs...).
+def load_data(path):
+    with open(path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    weights = data.get("weights")
+    attributes = data.get("attributes")
+    if "names_store" in data:
+        return (MappedNamePool.open(pathlib.Path(path).parent / data["names_store"]), data["draws"],
+                weights, attributes)
+    return data["names"], data["draws"], weights, attributes
+
+
+# list.json'u tek geçişte okur. Önce ("header", {'draws', 'weights', 'attributes', 'names'}) üretilir;
+# isimler depodaysa header'daki 'names' açılmış havuzdur, değilse None olur ve isimler
+# ardından ("names", grup) olarak gelir. Kayıtta draws isimlerden önce yazıldığından
+# başlık dosyanın başında hazır olur; eski sıralı dosyalarda isimler sona kadar biriktirilir.
+# weights ve attributes isimlerden sonra gelirse ayrıca (anahtar, sözlük) olarak üretilir.
+def iter_data(file, batch_size=10000):
+    header = {'draws': None, 'weights': None, 'attributes': None, 'names': None}
+    pending = []
+    header_sent = False
+    for key, value in iter_object(file, ("names",), batch_size):
+        if key in ("weights", "attributes") and header_sent:
+            yield key, value
+            continue
+        if key in ("draws", "weights", "attributes"):
+            header[key] = value
+            continue
+        if key == "names_store":
+            header['names'] = MappedNamePool.open(pathlib.Path(file.name).parent / value)
+        elif key == "names":
+            pending.append(value)
+        else:
+            continue
+        if header['draws'] is not None:
+            if not header_sent:
+                header_sent = True
+                yield "header", header
+            for batch in pending:
+                yield "names", batch
+            pending = []
+    if header['draws'] is None:
+        raise ValueError("List file has no draws")
+    if not header_sent:
+        yield "header", header
+    for batch in pending:
+        yield "names", batch
+
+
+# Qt'den bağımsız çekiliş motoru: arayüz ve komut satırı aynı mantığı kullanır
+class DrawEngine:
+    def __init__(self, names, draws, rng=None, weights=None, attributes=None):
+        if weights:
+            # Ağırlıklı havuz isimleri bellekte tutar; depo kullanılıyorsa isimler buraya açılır
+            self.names = WeightedNamePool(names, weights)
+        elif isinstance(names, (NamePool, MappedNamePool)):
+            self.names = names
+        else:
+            self.names = NamePool(names)
+        self.draws = draws
+        self.weights = weights
+        self.attributes = attributes or {}
+        self.groups = None
+        self._build_groups()
+        # Varsayılan üreteç güvenli tohumludur; tohum günlüğe yazıldığı için sonuçlar denetlenebilir
+        self.rng = rng or DrawRandom.secure()
+        self.current_index = 0
+        self.winners_history = {}
+        self.removed_names = []
+        # Geri alma/yineleme adımları: her adım [olay, fark] çiftlerinden oluşur. Fark yalnızca
+        # olayın değiştirdiklerini tutar (önceki talihliler, çıkarılan isimler, önceki indeks),
+        # böylece bir adım havuzun boyutundan bağımsız olarak talihli sayısı kadar yer kaplar.
+        self.undo_steps = []
+        self.redo_steps = []
+        self.journal = None
+        # Denetim kaydının her satırına eklenen alanlar (ör. etkinlik numarası)
+        self.audit_context = {}
+        self.loading = False
+        self._pending_removals = {}
+
+    @classmethod
+    def from_file(cls, path, rng=None):
+        names, draws, weights, attributes = load_data(path)
+        return cls(names, draws, rng, weights, attributes)
+
+    @property
+    def is_finished(self):
+        return self.current_index >= len(self.draws)
+
+    @property
+    def current_draw(self):
+        return self.draws[self.current_index]
+
+    @property
+    def current_winners(self):
+        return self.winners_history.get(self.current_index)
+
+    def total_needed(self, draw=None):
+        draw = draw or self.current_draw
+        return draw["main_count"] + draw["backup_count"]
+
+    # İsimler arka planda parça parça eklenirken günlük önceden oynatılabilir. Bu sürede
+    # çıkarmalar sırayla bekletilir ve tüm isimler geldikten sonra uygulanır; böylece havuzun
+    # iç sırası (ve aynı tohumla çekilen talihliler) liste tek seferde yüklenmiş gibi olur.
+    def begin_loading(self):
+        self.loading = True
+
+    def add_names(self, names):
+        add = self.names.add
+        for name in names:
+            if add(name) and self.groups is not None:
+                self.groups.add(name)
+
+    # Kurallarda öznitelik geçen çekilişler için değer başına alt havuzlar ana havuzun
+    # sırasıyla kurulur. Yeniden kurulum yalnızca yükleme sırasında (çıkarmalar beklerken)
+    # yapıldığından bu sıra listenin kendi sırasıdır.
+    def _build_groups(self):
+        attribute_names = grouping_attributes(self.draws)
+        if not attribute_names:
+            self.groups = None
+            return
+        self.groups = GroupedPools(attribute_names, self.attributes, self.weights)
+        for name in self.names:
+            self.groups.add(name)
+
+    # Ağırlıklar isimlerden sonra okunduğunda havuz aynı sırayla ağırlıklı havuza aktarılır
+    def set_weights(self, weights):
+        if weights:
+            self.weights = weights
+            self.names = WeightedNamePool(self.names, weights)
+            self._build_groups()
+
+    def set_attributes(self, attributes):
+        if attributes:
+            self.attributes = attributes
+            self._build_groups()
+
+    def finish_loading(self):
+        self.loading = False
+        missing = set()
+        for name, entry in self._pending_removals.items():
+            position = self.names.position(name)
+            if position is None:
+                missing.add(name)
+            else:
+                self.names.remove(name)
+                entry[1] = position
+                if self.groups is not None:
+                    entry.append(self.groups.remove(name))
+        self._pending_removals = {}
+        if missing:
+            # Listede hiç bulunmayan isimler çıkarılmış sayılmaz
+            self.removed_names = [name for name in self.removed_names if name not in missing]
+
+    # Kurallı çekilişlerde uygunluk ancak çekilişte kesinleşir (yedekler ana talihlilere
+    # bağlıdır); burada yalnızca önceki talihliler düşüldükten sonraki sayı denetlenir
+    def has_enough_participants(self):
+        return len(self.names) - len(self.excluded_names()) >= self.total_needed()
+
+    # Bu çekilişe katılamayacak, hâlâ havuzda olan önceki talihliler
+    def excluded_names(self, draw=None):
+        exclude = (draw or self.current_draw).get('exclude_previous_winners')
+        if not exclude:
+            return set()
+        kinds = ("main", "backup") if exclude == "all" else ("main",)
+        return {name for index, winners in self.winners_history.items() if index < self.current_index
+                for kind in kinds for name in winners[kind] if name in self.names}
+
+    def draw(self):
+        draw = self.current_draw
+        total_needed = self.total_needed(draw)
+        if len(self.names) < total_needed:
+            raise InsufficientParticipantsError(
+                f"Draw {self.current_index} needs {total_needed} participants, {len(self.names)} left")
+        if has_constraints(draw):
+            main, backup = self._draw_constrained(draw)
+        else:
+            selected_names = self.names.sample(total_needed, self.rng)
+            main, backup = selected_names[:draw["main_count"]], selected_names[draw["main_count"]:]
+        self.commit({
+            'type': "draw",
+            'index': self.current_index,
+            'main': main,
+            'backup': backup,
+            'rng_state': self.rng.checkpoint()
+        })
+        return self.current_winners
+
+    # Kurallar kabul/ret döngüsü olmadan uygulanır: dışlananlar örneklemden önce alt
+    # havuzlardan geçici olarak çıkarılır, kotalar ve üst sınırlar gruplar arası orantılı
+    # seçimle sağlanır. Karşılanamayan çekilişte üreteç çekilişten önceki haline döner.
+    def _draw_constrained(self, draw):
+        attribute, cap, quota, _ = parse_constraints(draw)
+        excluded = self.excluded_names(draw)
+        main_count, backup_count = draw["main_count"], draw["backup_count"]
+        checkpoint = self.rng.checkpoint()
+
+        def fail(reason):
+            self.rng.restore_checkpoint(checkpoint)
+            return InsufficientParticipantsError(f"Draw {self.current_index}: {reason}")
+
+        if attribute is None:
+            eligible = len(self.names) - len(excluded)
+            if eligible < main_count + backup_count:
+                raise fail(f"needs {main_count + backup_count} participants, {eligible} eligible")
+            # Sıralı örneklemde dışlananları atlamak, onlarsız havuzdan çekmekle aynı dağılımı verir
+            selected_names = self.names.sample(main_count + backup_count + len(excluded), self.rng)
+            selected_names = [name for name in selected_names if name not in excluded][:main_count + backup_count]
+            return selected_names[:main_count], selected_names[main_count:]
+
+        taken = [(name, self.groups.remove(name, [attribute])) for name in excluded]
+        try:
+            reason = shortage(self.groups, attribute, main_count, cap, quota)
+            if reason:
+                raise fail(reason)
+            main = sample_groups(self.groups, attribute, main_count, cap, quota, self.rng, taken)
+            reason = shortage(self.groups, attribute, backup_count, cap, {})
+            if reason:
+                raise fail(f"backups: {reason}")
+            backup = sample_groups(self.groups, attribute, backup_count, cap, {}, self.rng, taken)
+        finally:
+            for name, positions in reversed(taken):
+                self.groups.restore(name, positions, [attribute])
+        return main, backup
+
+    def remove_main_and_next(self):
+        self.commit({'type': "remove", 'names': self.current_winners['main']},
+                    {'type': "goto", 'index': self.current_index + 1})
+
+    def remove_all_and_next(self):
+        winners = self.current_winners
+        self.commit({'type': "remove", 'names': winners['main'] + winners['backup']},
+                    {'type': "goto", 'index': self.current_index + 1})
+
+    def remove_name(self, name):
+        return bool(self.remove_names([name]))
+
+    # Birden çok isim tek olay olarak günlüğe yazılır; havuzda olmayanlar atlanır
+    def remove_names(self, names):
+        names = [name for name in dict.fromkeys(names) if name in self.names]
+        if names:
+            self.commit({'type': "remove", 'names': names})
+        return names
+
+    @property
+    def can_undo(self):
+        return bool(self.undo_steps)
+
+    @property
+    def can_redo(self):
+        return bool(self.redo_steps)
+
+    def undo(self):
+        if self.undo_steps:
+            self.commit({'type': "undo"})
+            return True
+        return False
+
+    def redo(self):
+        if self.redo_steps:
+            self.commit({'type': "redo"})
+            return True
+        return False
+
+    # Bir önceki çekilişe dönmek, indeks azalana kadar adımları geri almaktır; çıkarılan
+    # talihliler havuza geri döner
+    def go_back(self):
+        index = self.current_index
+        if index == 0:
+            return False
+        while self.current_index >= index and self.undo():
+            pass
+        return self.current_index < index
+
+    # Tüm durum değişiklikleri olay olarak uygulanır; günlükten yeniden oynatma
+    # aynı yolu izlediği için sonuç birebir aynı olur. Birlikte kaydedilen olayların
+    # ilki dışındakiler 'continues' taşır ve aynı geri alma adımına eklenir.
+    def apply_event(self, event):
+        kind = event['type']
+        if kind == "undo":
+            self._undo_step()
+        elif kind == "redo":
+            self._redo_step()
+        elif kind == "rng":
+            self.rng = DrawRandom.from_description(event)
+        else:
+            if 'seq' in event:
+                # Günlükten gelen olaylar adımlarda sıra numarası olmadan saklanır
+                event = {key: value for key, value in event.items() if key != 'seq'}
+            change = [event, self._apply(event)]
+            if event.get('continues') and self.undo_steps:
+                self.undo_steps[-1].append(change)
+            else:
+                self.undo_steps.append([change])
+            self.redo_steps.clear()
+
+    # Olayı uygular ve geri almak için gereken farkı döndürür
+    def _apply(self, event, redo=False):
+        kind = event['type']
+        if kind == "draw":
+            index = event['index']
+            previous = self.winners_history.get(index)
+            self.winners_history[index] = {'main': event['main'], 'backup': event['backup']}
+            # Yinelemede üreteç geri sarılmaz; tüketilen rastgelelik tekrar kullanılmaz
+            if 'rng_state' in event and not redo:
+                self.rng.restore_checkpoint(event['rng_state'])
+            return previous
+        if kind == "remove":
+            # Fark [isim, konum] çiftleridir; konum geri almada ismi aynı yere döndürür.
+            # Alt havuzlar varsa onlardaki konumlar üçüncü eleman olarak eklenir.
+            removed = []
+            for name in event['names']:
+                if self.loading:
+                    if name not in self._pending_removals:
+                        entry = [name, None]
+                        self._pending_removals[name] = entry
+                        removed.append(entry)
+                else:
+                    position = self.names.position(name)
+                    if position is not None:
+                        self.names.remove(name)
+                        entry = [name, position]
+                        if self.groups is not None:
+                            entry.append(self.groups.remove(name))
+                        removed.append(entry)
+            self.removed_names.extend(entry[0] for entry in removed)
+            return removed
+        if kind == "goto":
+            previous = self.current_index
+            self.current_index = event['index']
+            return previous
+        raise ValueError(f"Unknown journal event: {kind}")
+
+    def _revert(self, event, change):
+        kind = event['type']
+        if kind == "draw":
+            if change is None:
+                self.winners_history.pop(event['index'], None)
+            else:
+                self.winners_history[event['index']] = change
+        elif kind == "remove":
+            # Adımlar ters sırayla geri alındığından isimler removed_names'in sonunda bulunur
+            for entry in reversed(change):
+                name = entry[0]
+                if self.removed_names and self.removed_names[-1] == name:
+                    self.removed_names.pop()
+                elif name in self.removed_names:
+                    self.removed_names.remove(name)
+                else:
+                    # Yükleme bitince listede hiç bulunmadığı anlaşılan isim havuza eklenmez
+                    continue
+                if self.loading:
+                    self._pending_removals.pop(name, None)
+                else:
+                    self.names.restore(name, entry[1])
+                    if len(entry) > 2 and self.groups is not None:
+                        self.groups.restore(name, entry[2])
+        elif kind == "goto":
+            self.current_index = change
+
+    def _undo_step(self):
+        step = self.undo_steps.pop()
+        for event, change in reversed(step):
+            self._revert(event, change)
+        self.redo_steps.append([event for event, _ in step])
+
+    def _redo_step(self):
+        events = self.redo_steps.pop()
+        self.undo_steps.append([[event, self._apply(event, redo=True)] for event in events])
+
+    def commit(self, *events):
+        for position, event in enumerate(events):
+            if position:
+                event = {**event, 'continues': True}
+            self.apply_event(event)
+            if self.journal is not None:
+                self.journal.append(event)
+            if audit_enabled():
+                self._audit(event)
+        if self.journal is not None and self.journal.needs_compaction:
+            self.journal.compact(self.state())
+
+    # Yalnızca yeni kaydedilen olaylar denetime yazılır; günlükten yeniden oynatma yazılmaz.
+    # Listeler kopyalanır; kayıt dinleyici iş parçacığında biçimlendirilir.
+    def _audit(self, event):
+        kind = event['type']
+        if kind == "draw":
+            draw = self.draws[event['index']]
+            audit("draw", **self.audit_context, draw_index=event['index'], title=draw['title'],
+                  main=list(event['main']), backup=list(event['backup']))
+        elif kind == "remove":
+            audit("removal", **self.audit_context, draw_index=self.current_index, names=list(event['names']))
+        elif kind == "goto":
+            audit("next_draw", **self.audit_context, draw_index=event['index'])
+        elif kind == "rng":
+            audit("seed", **self.audit_context, mode=event['mode'], commitment=event['commitment'])
+        else:
+            events = self.redo_steps[-1] if kind == "undo" else [step_event for step_event, _ in self.undo_steps[-1]]
+            audit(kind, **self.audit_context,
+                  events=[{'type': step_event['type'],
+                           **{key: list(value) if isinstance(value, list) else value
+                              for key, value in step_event.items() if key in ("index", "main", "backup", "names")}}
+                          for step_event in events])
+
+    def state(self):
+        return {
+            'current_index': self.current_index,
+            'winners_history': {str(index): winners for index, winners in self.winners_history.items()},
+            'removed_names': self.removed_names,
+            'undo_steps': self.undo_steps,
+            'redo_steps': self.redo_steps,
+            'rng': self.rng.describe()
+        }
+
+    def restore(self, state):
+        self.current_index = state['current_index']
+        self.winners_history = {int(index): winners for index, winners in state['winners_history'].items()}
+        self.removed_names = []
+        self._apply({'type': "remove", 'names': state['removed_names']})
+        self.undo_steps = state.get('undo_steps', [])
+        self.redo_steps = state.get('redo_steps', [])
+        if 'rng' in state:
+            self.rng = DrawRandom.from_description(state['rng'])
+
+    # Anlık görüntü ve günlüğü yeniden oynatıp motoru kaldığı yerden sürdürür
+    def replay(self, snapshot, events):
+        if snapshot is not None:
+            self.restore(snapshot)
+        for event in events:
+            self.apply_event(event)
+
+    def attach_journal(self, journal):
+        snapshot, events = journal.load()
+        self.replay(snapshot, events)
+        self.journal = journal
+        if snapshot is None and not events:
+            # Yeni etkinlik: tohum ve taahhüt ilk olay olarak kaydedilir
+            self.commit({'type': "rng", **self.rng.describe()})
+        # Yükleme sürerken bekleyen çıkarmaların konumları henüz belli değildir
+        if journal.needs_compaction and not self.loading:
+            journal.compact(self.state())
+        if snapshot is not None or events:
+            logging.debug("Resumed from journal: %d events replayed", len(events))
+
+    def close(self):
+        if self.journal is not None:
+            self.journal.close()
+        if isinstance(self.names, MappedNamePool):
+            self.names.close()
+
+    def results(self):
+        return [
+            {
+                'index': index,
+                'title': draw["title"],
+                'main': self.winners_history.get(index, {}).get('main', []),
+                'backup': self.winners_history.get(index, {}).get('backup', [])
+            }
+            for index, draw in enumerate(self.draws)
+        ]
+
+
+# Tüm çekilişleri arka arkaya yürütür; remove_backups ana+yedek çıkarma seçimine karşılık gelir
+def run_all(engine, remove_backups=True):
+    errors = {}
+    while not engine.is_finished:
+        try:
+            engine.draw()
+        except (InsufficientParticipantsError, ConstraintError) as e:
+            errors[engine.current_index] = str(e)
+            engine.commit({'type': "goto", 'index': engine.current_index + 1})
+            continue
+        if remove_backups:
+            engine.remove_all_and_next()
+        else:
+            engine.remove_main_and_next()
+    return errors
@@ -0,0 +1,116 @@
+import json
+import logging
+import os
+
+
+# list.json'un yanında tutulan, yalnızca sona eklenen çekiliş günlüğü.
+# Her olay tek satırlık JSON olarak yazılır ve fsync ile diske indirilir;
+# belirli aralıklarla tüm durum bir anlık görüntüye sıkıştırılıp günlük sıfırlanır.
+# Sıkıştırılan olaylar silinmez, denetim ve yeniden oynatma için geçmiş dosyasına taşınır.
+class DrawJournal:
+    def __init__(self, json_path, compact_every=100):
+        self.path = json_path.with_suffix(".journal")
+        self.snapshot_path = json_path.with_suffix(".snapshot.json")
+        self.history_path = json_path.with_suffix(".history.jsonl")
+        self.compact_every = compact_every
+        self.pending_events = 0
+        self.next_seq = 0
+        self.file = None
+
+    @property
+    def needs_compaction(self):
+        return self.pending_events >= self.compact_every
+
+    @staticmethod
+    def _read_events(path):
+        events = []
+        truncated = False
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as file:
+                for line in file:
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # Çökme anında yarım kalmış son satır
+                        logging.warning("Skipping truncated journal line in %s", path)
+                        truncated = True
+                        break
+        return events, truncated
+
+    def load(self):
+        snapshot = None
+        if self.snapshot_path.exists():
+            with open(self.snapshot_path, "r", encoding="utf-8") as file:
+                snapshot = json.load(file)
+            self.next_seq = snapshot.get('seq', 0)
+
+        events, truncated = self._read_events(self.path)
+        # Sıkıştırma sırasında kesilen bir günlükte anlık görüntüye zaten girmiş olaylar atlanır
+        events = [event for event in events if event.get('seq', self.next_seq) >= self.next_seq]
+        if events:
+            self.next_seq = events[-1].get('seq', self.next_seq) + 1
+        if truncated:
+            # Yeni olaylar yarım satırın devamına yazılmasın diye günlük sağlam haliyle yeniden yazılır
+            with open(self.path, "w", encoding="utf-8") as file:
+                file.writelines(json.dumps(event, ensure_ascii=False) + "\n" for event in events)
+                file.flush()
+                os.fsync(file.fileno())
+        self.pending_events = len(events)
+        return snapshot, events
+
+    def append(self, event):
+        if self.file is None:
+            self.file = open(self.path, "a", encoding="utf-8")
+        record = {'seq': self.next_seq, **event}
+        self.file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        self.next_seq += 1
+        self.pending_events += 1
+
+    def compact(self, state):
+        temp_path = self.snapshot_path.with_suffix(".tmp")
+        with open(temp_path, "w", encoding="utf-8") as file:
+            json.dump({**state, 'seq': self.next_seq}, file, ensure_ascii=False)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, self.snapshot_path)
+
+        # Anlık görüntü yerine oturduktan sonra olaylar geçmişe taşınıp günlük boşaltılabilir
+        self.close()
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as source, \
+                    open(self.history_path, "a", encoding="utf-8") as history:
+                history.write(source.read())
+                history.flush()
+                os.fsync(history.fileno())
+        with open(self.path, "w", encoding="utf-8") as file:
+            file.flush()
+            os.fsync(file.fileno())
+        self.pending_events = 0
+        logging.debug("Journal compacted into %s", self.snapshot_path)
+
+    # Etkinliğin baştan sona tüm olayları; sıra numarası tekrarlananlar bir kez verilir
+    def history(self):
+        last_seq = -1
+        for path in (self.history_path, self.path):
+            events, _ = self._read_events(path)
+            for event in events:
+                seq = event.get('seq')
+                if seq is not None:
+                    if seq <= last_seq:
+                        continue
+                    last_seq = seq
+                yield event
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def clear(self):
+        self.close()
+        for path in (self.path, self.snapshot_path, self.history_path):
+            if path.exists():
+                os.remove(path)
+        self.pending_events = 0
@@ -0,0 +1,95 @@
+import hashlib
+import random
+import secrets
+
+# Her yenilemede üretilen bayt sayısı; güvenli kaynak bu sayede çekiliş başına değil toplu çağrılır
+BLOCK_SIZE = 4096
+
+
+# Tohumdan türetilen, SHAKE-256 sayaç kipinde çalışan deterministik üreteç.
+# random.Random'dan türediği için sample/randrange gibi yöntemler aynen kullanılır.
+# Tohum bilindiğinde tüm çekilişler yeniden üretilebilir; durum (blok, ofset)
+# çifti olarak kaydedilip geri yüklenebilir.
+class DrawRandom(random.Random):
+    def __init__(self, seed_bytes, mode="seeded"):
+        self.seed_bytes = seed_bytes
+        self.mode = mode
+        self._block = 0
+        self._buffer = b""
+        self._offset = 0
+        super().__init__()
+        self._refill(0)
+
+    @classmethod
+    def seeded(cls, value):
+        return cls(hashlib.sha256(str(value).encode("utf-8")).digest(), "seeded")
+
+    @classmethod
+    def secure(cls):
+        return cls(secrets.token_bytes(32), "secure")
+
+    @classmethod
+    def from_description(cls, description):
+        rng = cls(bytes.fromhex(description['seed']), description['mode'])
+        if description.get('state'):
+            rng.restore_checkpoint(description['state'])
+        return rng
+
+    # Tohum açıklanmadan önce yayımlanabilecek taahhüt değeri
+    @property
+    def commitment(self):
+        return hashlib.sha256(self.seed_bytes).hexdigest()
+
+    def describe(self):
+        return {
+            'mode': self.mode,
+            'seed': self.seed_bytes.hex(),
+            'commitment': self.commitment,
+            'state': self.checkpoint()
+        }
+
+    def _refill(self, block):
+        self._block = block
+        self._buffer = hashlib.shake_256(self.seed_bytes + block.to_bytes(8, "little")).digest(BLOCK_SIZE)
+        self._offset = 0
+
+    def _take(self, count):
+        chunks = []
+        while count:
+            if self._offset >= BLOCK_SIZE:
+                self._refill(self._block + 1)
+            chunk = self._buffer[self._offset:self._offset + count]
+            self._offset += len(chunk)
+            count -= len(chunk)
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    def checkpoint(self):
+        return [self._block, self._offset]
+
+    def restore_checkpoint(self, state):
+        block, offset = state
+        if block != self._block:
+            self._refill(block)
+        self._offset = offset
+
+    def seed(self, a=None, version=2):
+        # random.Random.__init__ tarafından çağrılır; tohum yapıcıda belirlenir
+        self.gauss_next = None
+
+    def getrandbits(self, k):
+        if k <= 0:
+            return 0
+        size = (k + 7) // 8
+        return int.from_bytes(self._take(size), "little") >> (size * 8 - k)
+
+    def random(self):
+        return self.getrandbits(53) * (2.0 ** -53)
+
+    def getstate(self):
+        return (self.mode, self.seed_bytes, self._block, self._offset)
+
+    def setstate(self, state):
+        self.mode, self.seed_bytes, block, offset = state
+        self._refill(block)
+        self._offset = offset
@@ -0,0 +1,200 @@
+import argparse
+import json
+import pathlib
+import sqlite3
+import sys
+import time
+
+from name_utils import normalize_name
+
+# Etkinlik dizinleri veritabanının yanındaki bu dizinin altında açılır
+EVENTS_DIR = "events"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    directory TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    archived_at REAL,
+    participant_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS draws (
+    event_id INTEGER NOT NULL REFERENCES events(id),
+    draw_index INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    main_count INTEGER NOT NULL,
+    backup_count INTEGER NOT NULL,
+    rules TEXT,
+    PRIMARY KEY (event_id, draw_index)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS winners (
+    event_id INTEGER NOT NULL REFERENCES events(id),
+    draw_index INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    rank INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    name_key TEXT NOT NULL,
+    PRIMARY KEY (event_id, draw_index, kind, rank)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS winners_by_name ON winners (name_key, event_id);
+CREATE TABLE IF NOT EXISTS removals (
+    event_id INTEGER NOT NULL REFERENCES events(id),
+    name TEXT NOT NULL,
+    PRIMARY KEY (event_id, name)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS settings (
+    key TEXT PRIMARY KEY,
+    value TEXT
+) WITHOUT ROWID;
+"""
+
+_RULE_KEYS = ("max_per", "quota", "exclude_previous_winners")
+
+
+# Birden çok çekiliş etkinliğinin dizini. Her etkinliğin listesi, günlüğü ve isim deposu
+# kendi dizininde durur (akışlı yükleme ve eşlenmiş depo dosya tabanlıdır); veritabanı
+# etkinlikleri, çekiliş tanımlarını, talihlileri ve çıkarılanları dizinli tutar. Böylece
+# etkinlikler arası geçiş ve "son N etkinlikte kazandı mı" soruları dosya taramadan yanıtlanır.
+# Talihliler günlükten türetilir; günlük her zaman asıl kaynaktır ve açılışta yeniden eşitlenir.
+class EventStore:
+    def __init__(self, path):
+        self.path = pathlib.Path(path)
+        self.root = self.path.parent
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.row_factory = sqlite3.Row
+        # WAL: okuyucular yazmayı beklemez; NORMAL eşitleme WAL'da çökme güvenliğini korur
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("PRAGMA foreign_keys=ON")
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def directory(self, event):
+        return self.root / event['directory']
+
+    def list_file(self, event):
+        return self.directory(event) / "list.json"
+
+    def create_event(self, title, draws, participant_count, directory=None):
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO events (title, directory, created_at, participant_count) VALUES (?, '', ?, ?)",
+                (title, time.time(), participant_count))
+            event_id = cursor.lastrowid
+            directory = directory or f"{EVENTS_DIR}/{event_id:04d}"
+            self.connection.execute("UPDATE events SET directory = ? WHERE id = ?", (directory, event_id))
+            self.connection.executemany(
+                "INSERT INTO draws VALUES (?, ?, ?, ?, ?, ?)",
+                [(event_id, index, draw["title"], draw["main_count"], draw["backup_count"],
+                  json.dumps({key: draw[key] for key in _RULE_KEYS if key in draw}, ensure_ascii=False))
+                 for index, draw in enumerate(draws)])
+        event = self.event(event_id)
+        self.directory(event).mkdir(parents=True, exist_ok=True)
+        return event
+
+    def event(self, event_id):
+        return self.connection.execute("SELECT * FROM events WHERE id = ?", (event_id,)).fetchone()
+
+    def events(self, include_archived=True):
+        query = "SELECT * FROM events"
+        if not include_archived:
+            query += " WHERE archived_at IS NULL"
+        return self.connection.execute(query + " ORDER BY id DESC").fetchall()
+
+    # Sıfırlama etkinliği silmez; arşivlenen etkinlik dosyalarıyla birlikte saklanır
+    def archive(self, event_id):
+        with self.connection:
+            self.connection.execute("UPDATE events SET archived_at = ? WHERE id = ? AND archived_at IS NULL",
+                                    (time.time(), event_id))
+            self.connection.execute("DELETE FROM settings WHERE key = 'current_event' AND value = ?",
+                                    (str(event_id),))
+
+    @property
+    def current_event(self):
+        row = self.connection.execute("SELECT value FROM settings WHERE key = 'current_event'").fetchone()
+        return self.event(int(row['value'])) if row else None
+
+    def set_current_event(self, event_id):
+        with self.connection:
+            self.connection.execute("INSERT OR REPLACE INTO settings VALUES ('current_event', ?)", (str(event_id),))
+
+    # Etkinliğin talihli ve çıkarma kayıtları tek işlemde motorun durumuyla değiştirilir
+    def record_results(self, event_id, results, removed_names):
+        with self.connection:
+            self.connection.execute("DELETE FROM winners WHERE event_id = ?", (event_id,))
+            self.connection.executemany(
+                "INSERT INTO winners VALUES (?, ?, ?, ?, ?, ?)",
+                [(event_id, result['index'], kind, rank, name, normalize_name(name))
+                 for result in results for kind in ("main", "backup")
+                 for rank, name in enumerate(result[kind], start=1)])
+            self.connection.execute("DELETE FROM removals WHERE event_id = ?", (event_id,))
+            self.connection.executemany("INSERT OR IGNORE INTO removals VALUES (?, ?)",
+                                        ((event_id, name) for name in removed_names))
+
+    def results(self, event_id):
+        results = [{'index': row['draw_index'], 'title': row['title'], 'main': [], 'backup': []}
+                   for row in self.connection.execute(
+                       "SELECT draw_index, title FROM draws WHERE event_id = ? ORDER BY draw_index", (event_id,))]
+        for row in self.connection.execute(
+                "SELECT draw_index, kind, name FROM winners WHERE event_id = ? ORDER BY draw_index, kind, rank",
+                (event_id,)):
+            results[row['draw_index']][row['kind']].append(row['name'])
+        return results
+
+    # Verilen isimlerden, before etkinliğinden önceki son last etkinlikte ana talihli olanlar.
+    # İsimler normalize edilmiş anahtarla eşleşir; her isim winners_by_name dizininde aranır.
+    def recent_winners(self, names, last, before=None, kinds=("main",)):
+        event_ids = [row['id'] for row in self.connection.execute(
+            "SELECT id FROM events WHERE id < ? ORDER BY id DESC LIMIT ?",
+            (before if before is not None else sys.maxsize, last))]
+        if not event_ids:
+            return {}
+        event_marks = ",".join("?" * len(event_ids))
+        kind_marks = ",".join("?" * len(kinds))
+        found = {}
+        for name in names:
+            rows = self.connection.execute(
+                f"SELECT DISTINCT event_id FROM winners WHERE name_key = ? AND event_id IN ({event_marks}) "
+                f"AND kind IN ({kind_marks}) ORDER BY event_id DESC",
+                (normalize_name(name), *event_ids, *kinds)).fetchall()
+            if rows:
+                found[name] = [row['event_id'] for row in rows]
+        return found
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Etkinlik veritabanını sorgular.")
+    parser.add_argument("database", type=pathlib.Path, help="events.sqlite3 dosyası")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="Etkinlikleri listeler")
+    wins = commands.add_parser("wins", help="İsimlerin son etkinliklerde kazanıp kazanmadığını gösterir")
+    wins.add_argument("names", nargs="+")
+    wins.add_argument("--last", type=int, default=5, help="Bakılacak etkinlik sayısı")
+    wins.add_argument("--backups", action="store_true", help="Yedek talihlileri de say")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    store = EventStore(args.database)
+    if args.command == "list":
+        for event in store.events():
+            status = "archived" if event['archived_at'] else "open"
+            created = time.strftime("%Y-%m-%d %H:%M", time.localtime(event['created_at']))
+            print(f"{event['id']:>5}  {created}  {status:<8}  {event['participant_count']:>9}  {event['title']}")
+    else:
+        kinds = ("main", "backup") if args.backups else ("main",)
+        found = store.recent_winners(args.names, args.last, kinds=kinds)
+        for name in args.names:
+            events = found.get(name)
+            print(f"{name}: " + (f"won in events {', '.join(map(str, events))}" if events else "no wins"))
+    store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
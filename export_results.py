@@ -0,0 +1,262 @@
+import argparse
+import csv
+import html
+import json
+import logging
+import multiprocessing
+import os
+import pathlib
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from PyQt5.QtCore import Qt, QMarginsF
+from PyQt5.QtGui import (QGuiApplication, QImage, QPainter, QColor, QFont, QLinearGradient,
+                         QPdfWriter, QPageSize, QPageLayout)
+
+from draw_engine import DrawEngine
+from draw_journal import DrawJournal
+
+# A4 yatay, 150 dpi
+CERTIFICATE_DPI = 150
+CERTIFICATE_SIZE = (1754, 1240)
+# Süreçler arası gidiş gelişi azaltmak için her görevde işlenen sertifika sayısı
+BATCH_SIZE = 25
+# Görsel kayıt kalitesi; 1754x1240 sertifikada PNG'nin Qt varsayılan sıkıştırması ~0.85 s sürer,
+# 80 ile ~0.27 s'ye iner. Fotoğraf ağırlıklı arka plan için JPEG (92, ~0.05 s) hem hızlı hem küçüktür.
+IMAGE_FORMATS = {'jpg': ("JPG", 92), 'png': ("PNG", 80)}
+DEFAULT_ASSETS = {'background': "lotterybg.png", 'logos': ["inovellogo.png", "dpulogo.png"]}
+KIND_LABELS = {'main': "Ana Talihli", 'backup': "Yedek Talihli"}
+
+# Sertifika süreçlerindeki ölçeklenmiş görseller; her süreçte bir kez yüklenir
+_WORKER = {}
+
+
+def iter_winners(results):
+    for result in results:
+        for kind in ("main", "backup"):
+            for rank, name in enumerate(result[kind], start=1):
+                yield result, kind, rank, name
+
+
+# Raporlar satır satır yazılır; sonuçların metin kopyası bellekte kurulmaz
+def write_csv(path, results):
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file)
+        writer.writerow(["draw_index", "title", "kind", "rank", "name"])
+        for result, kind, rank, name in iter_winners(results):
+            writer.writerow([result['index'], result['title'], kind, rank, name])
+
+
+def write_json(path, results, meta=None):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("{")
+        for key, value in (meta or {}).items():
+            file.write(f"{json.dumps(key)}: {json.dumps(value, ensure_ascii=False)}, ")
+        file.write('"draws": [')
+        for position, result in enumerate(results):
+            file.write(",\n" if position else "\n")
+            file.write(json.dumps(result, ensure_ascii=False))
+        file.write("\n]}\n")
+
+
+def write_html(path, results, title="Çekiliş Sonuçları"):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(f"<!DOCTYPE html>\n<html lang=\"tr\"><head><meta charset=\"utf-8\"><title>{html.escape(title)}</title>\n"
+                   "<style>body{font-family:'Segoe UI',sans-serif;margin:2em;color:#222}"
+                   "h2{border-bottom:2px solid #4A90E2;padding-bottom:.2em}"
+                   "table{border-collapse:collapse;margin-bottom:2em}"
+                   "td,th{border:1px solid #ccc;padding:.3em .8em;text-align:left}</style></head><body>\n"
+                   f"<h1>{html.escape(title)}</h1>\n")
+        for result in results:
+            file.write(f"<h2>{html.escape(result['title'])}</h2>\n")
+            if not result['main'] and not result['backup']:
+                file.write("<p>Çekiliş yapılmadı.</p>\n")
+                continue
+            file.write("<table><tr><th>Sıra</th><th>Tür</th><th>İsim</th></tr>\n")
+            for kind in ("main", "backup"):
+                for rank, name in enumerate(result[kind], start=1):
+                    file.write(f"<tr><td>{rank}</td><td>{KIND_LABELS[kind]}</td><td>{html.escape(name)}</td></tr>\n")
+            file.write("</table>\n")
+        file.write("</body></html>\n")
+
+
+def certificate_jobs(results):
+    for result, kind, rank, name in iter_winners(results):
+        yield {'index': result['index'], 'title': result['title'], 'kind': kind, 'rank': rank, 'name': name}
+
+
+# Aynı kişi farklı çekilişlerde kazanabilir; çekiliş sırası dosya adını tekil kılar
+def certificate_filename(job, fmt):
+    safe_name = re.sub(r"[^\w\-]+", "_", job['name']).strip("_")[:60] or "isimsiz"
+    return f"{job['index'] + 1:03d}_{job['kind']}_{job['rank']:03d}_{safe_name}.{fmt}"
+
+
+def _init_worker(assets):
+    # Süreçlerde ekran yoktur; Qt çizimi ekran dışı platformla yapılır
+    os.environ["QT_QPA_PLATFORM"] = "offscreen"
+    _WORKER['app'] = QGuiApplication.instance() or QGuiApplication(["export_results"])
+    _WORKER['background'] = QImage(assets['background'])
+    _WORKER['logos'] = [QImage(path) for path in assets['logos']]
+    _WORKER['base'] = {}
+
+
+# Degrade, yarı saydam arka plan ve logolardan oluşan sabit katman sayfa boyutu
+# başına bir kez çizilir; her sertifikada yalnızca metin eklenir
+def _base_layer(width, height):
+    key = (width, height)
+    if key not in _WORKER['base']:
+        image = QImage(width, height, QImage.Format_RGB32)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        gradient = QLinearGradient(0, 0, width, height)
+        gradient.setColorAt(0, QColor("#1E1E2E"))
+        gradient.setColorAt(1, QColor("#2E2E4E"))
+        painter.fillRect(0, 0, width, height, gradient)
+
+        background = _WORKER['background']
+        if not background.isNull():
+            background = background.scaled(width, height, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+            painter.setOpacity(0.4)
+            painter.drawImage((width - background.width()) // 2, (height - background.height()) // 2, background)
+            painter.setOpacity(1.0)
+
+        margin = height // 20
+        logo_size = height // 7
+        logos = [logo.scaled(logo_size, logo_size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+                 for logo in _WORKER['logos'] if not logo.isNull()]
+        if logos:
+            painter.drawImage(margin, margin, logos[0])
+        if len(logos) > 1:
+            painter.drawImage(width - margin - logos[1].width(), margin, logos[1])
+        painter.end()
+        _WORKER['base'][key] = image
+    return _WORKER['base'][key]
+
+
+def _font(height, ratio, bold=False):
+    font = QFont("Segoe UI")
+    font.setPixelSize(max(1, int(height * ratio)))
+    font.setBold(bold)
+    return font
+
+
+def paint_certificate(painter, width, height, job):
+    painter.drawImage(0, 0, _base_layer(width, height))
+    margin = height // 20
+    painter.setPen(QColor("#FFFFFF"))
+    lines = [
+        (0.10, 0.045, True, "İNOVEL ÇEKİLİŞ UYGULAMASI"),
+        (0.30, 0.075, True, "TEBRİKLER"),
+        (0.44, 0.085, True, job['name']),
+        (0.60, 0.045, False, job['title']),
+        (0.70, 0.040, False, KIND_LABELS[job['kind']] if job['kind'] == "main" else
+         f"{job['rank']}. {KIND_LABELS[job['kind']]}"),
+        (0.88, 0.028, False, time.strftime("%d.%m.%Y")),
+    ]
+    for top, size, bold, text in lines:
+        painter.setFont(_font(height, size, bold))
+        painter.drawText(margin, int(height * top), width - 2 * margin, int(height * size * 2),
+                         Qt.AlignCenter | Qt.TextWordWrap, text)
+
+
+def _render_batch(jobs, output_dir, fmt):
+    output_dir = pathlib.Path(output_dir)
+    for job in jobs:
+        path = output_dir / certificate_filename(job, fmt)
+        if fmt == "pdf":
+            device = QPdfWriter(str(path))
+            device.setResolution(CERTIFICATE_DPI)
+            device.setPageSize(QPageSize(QPageSize.A4))
+            device.setPageOrientation(QPageLayout.Landscape)
+            device.setPageMargins(QMarginsF(0, 0, 0, 0))
+        else:
+            device = QImage(*CERTIFICATE_SIZE, QImage.Format_RGB32)
+        painter = QPainter(device)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        paint_certificate(painter, device.width(), device.height(), job)
+        painter.end()
+        if fmt != "pdf" and not device.save(str(path), *IMAGE_FORMATS[fmt]):
+            raise OSError(f"Certificate could not be written: {path}")
+    return len(jobs)
+
+
+# Sertifikalar ayrı süreçlerde çizilir; çağıran süreç (arayüz) yalnızca ilerlemeyi izler.
+# Qt'nin çalışan bir uygulamayla fork edilmesi güvenli olmadığından süreçler spawn ile açılır.
+# should_stop doğru döndüğünde bekleyen gruplar iptal edilir.
+def render_certificates(results, output_dir, fmt="jpg", workers=None, assets=None,
+                        progress=None, should_stop=None):
+    output_dir = pathlib.Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = list(certificate_jobs(results))
+    if not jobs:
+        return 0
+    # Bir çekirdek arayüze bırakılır
+    workers = workers or max(1, (os.cpu_count() or 1) - 1)
+    assets = {key: [str(pathlib.Path(path).resolve()) for path in value] if isinstance(value, list)
+              else str(pathlib.Path(value).resolve()) for key, value in (assets or DEFAULT_ASSETS).items()}
+    batches = [jobs[start:start + BATCH_SIZE] for start in range(0, len(jobs), BATCH_SIZE)]
+
+    done = 0
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches)), mp_context=multiprocessing.get_context("spawn"),
+                             initializer=_init_worker, initargs=(assets,)) as executor:
+        futures = [executor.submit(_render_batch, batch, str(output_dir), fmt) for batch in batches]
+        for future in as_completed(futures):
+            done += future.result()
+            if progress is not None:
+                progress(done, len(jobs))
+            if should_stop is not None and should_stop():
+                executor.shutdown(cancel_futures=True)
+                break
+    return done
+
+
+def export_reports(results, output_dir, formats, meta=None):
+    output_dir = pathlib.Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    writers = {
+        'csv': lambda path: write_csv(path, results),
+        'json': lambda path: write_json(path, results, meta),
+        'html': lambda path: write_html(path, results),
+    }
+    for fmt in formats:
+        path = output_dir / f"results.{fmt}"
+        writers[fmt](path)
+        paths.append(path)
+    return paths
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Kayıtlı çekiliş sonuçlarını rapor ve sertifika olarak dışa aktarır.")
+    parser.add_argument("input", type=pathlib.Path, help="list.json dosyası (günlük dosyaları yanında olmalı)")
+    parser.add_argument("-o", "--output-dir", type=pathlib.Path, default=pathlib.Path("export"),
+                        help="Çıktıların yazılacağı dizin")
+    parser.add_argument("-f", "--format", nargs="+", choices=["csv", "json", "html"], default=["csv", "json", "html"],
+                        help="Rapor biçimleri")
+    parser.add_argument("--certificates", choices=["jpg", "png", "pdf"], help="Talihli başına sertifika biçimi")
+    parser.add_argument("--workers", type=int, default=None, help="Sertifika süreç sayısı")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    engine = DrawEngine.from_file(args.input)
+    engine.replay(*DrawJournal(args.input).load())
+    results = engine.results()
+    meta = {'source': str(args.input), 'commitment': engine.rng.commitment}
+    engine.close()
+
+    for path in export_reports(results, args.output_dir, args.format, meta):
+        logging.info("Report written: %s", path)
+    if args.certificates:
+        started = time.perf_counter()
+        count = render_certificates(results, args.output_dir / "certificates", args.certificates, args.workers)
+        logging.info("%s certificates rendered in %.1f s", count, time.perf_counter() - started)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+import argparse
+import csv
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from draw_constraints import has_constraints
+from draw_engine import load_data
+from name_store import MappedNamePool
+
+# Bir yığında üretilecek en fazla rastgele anahtar sayısı (deneme x katılımcı)
+BATCH_ELEMENTS = 4_000_000
+
+
+# Bir yığın denemeyi vektörel olarak yürütür. Her çekilişte kalan katılımcılara
+# rastgele anahtar verilir ve en küçük k anahtar seçilir; ağırlıklı listelerde
+# Efraimidis-Spirakis anahtarı (-log U / w) yerine koyarak sıralı ağırlıklı
+# çekilişle aynı dağılım elde edilir.
+def simulate_batch(weights, draws, remove_backups, trials, seed):
+    rng = np.random.default_rng(seed)
+    count = len(weights)
+    main_wins = np.zeros(count, dtype=np.int64)
+    backup_wins = np.zeros(count, dtype=np.int64)
+    available = np.ones((trials, count), dtype=bool)
+    remaining = count
+    uniform = count == 0 or bool(np.all(weights == weights[0]))
+    rows = np.arange(trials)[:, None]
+
+    for draw, remove_all in zip(draws, remove_backups):
+        main_count, backup_count = draw["main_count"], draw["backup_count"]
+        needed = main_count + backup_count
+        if needed == 0 or remaining < needed:
+            continue
+
+        keys = rng.random((trials, count))
+        if not uniform:
+            keys = -np.log(keys) / weights
+        keys[~available] = np.inf
+
+        selected = np.argpartition(keys, needed - 1, axis=1)[:, :needed]
+        order = np.argsort(keys[rows, selected], axis=1)
+        selected = selected[rows, order]
+
+        main = selected[:, :main_count]
+        backup = selected[:, main_count:]
+        main_wins += np.bincount(main.ravel(), minlength=count)
+        backup_wins += np.bincount(backup.ravel(), minlength=count)
+
+        available[rows, main] = False
+        remaining -= main_count
+        if remove_all:
+            available[rows, backup] = False
+            remaining -= backup_count
+
+    return main_wins, backup_wins
+
+
+# Wilson-Hilferty yaklaşımı; çok serbestlik dereceli ki-kare için yeterince hassas
+def chi_square_p_value(statistic, dof):
+    if dof <= 0:
+        return float("nan")
+    z = ((statistic / dof) ** (1 / 3) - (1 - 2 / (9 * dof))) / math.sqrt(2 / (9 * dof))
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+# Eşit biletli listede ana kazanma sayılarının tekdüzelik testi. Her denemede katılımcı en
+# fazla bir kez ana talihli olur, yani sayım Binom(T, p)'dir ve varyansı T·p·(1-p)'dir; ayrıca
+# denemedeki toplam ana talihli sayısı sabit olduğundan sayılar eşit biçimde negatif ilişkilidir
+# (kovaryans -T·p·(1-p)/(n-1)). Pearson terimleri bu yüzden (n-1)/(n·(1-p)) ile ölçeklenir;
+# sonuç n-1 serbestlik dereceli ki-karedir. Herkes kazanıyor ya da kimse kazanmıyorsa test yoktur.
+def uniformity_test(main_wins, trials, expected):
+    count = len(main_wins)
+    if count < 2 or not 0 < expected < 1:
+        return None
+    expected_count = expected * trials
+    pearson = float(np.sum((main_wins - expected_count) ** 2 / expected_count))
+    statistic = pearson * (count - 1) / (count * (1 - expected))
+    dof = count - 1
+    return statistic, dof, chi_square_p_value(statistic, dof)
+
+
+# Testin kendisini denetler: adil bir listede p değerleri yaklaşık tekdüze dağılmalı,
+# bir kişiye iki bilet verilmiş listede ise eşit beklentiye karşı test reddetmelidir
+def self_check(runs=200, trials=2000, seed=0):
+    count = 15
+    draws = [{'main_count': 3, 'backup_count': 2}] * 3
+    remove_backups = [True] * len(draws)
+    expected = expected_main_winners(count, draws, remove_backups) / count
+    seeds = np.random.SeedSequence(seed).spawn(runs + 1)
+
+    p_values = []
+    fair = np.ones(count)
+    for run_seed in seeds[:runs]:
+        main_wins, _ = simulate_batch(fair, draws, remove_backups, trials, run_seed)
+        p_values.append(uniformity_test(main_wins, trials, expected)[2])
+    p_values = np.asarray(p_values)
+    rejected = float(np.mean(p_values < 0.05))
+    # Tekdüze dağılımdan sapma: deneysel dağılım fonksiyonunun en büyük farkı (Kolmogorov-Smirnov)
+    ks = float(np.max(np.abs(np.sort(p_values) - (np.arange(1, runs + 1) - 0.5) / runs)))
+
+    biased = np.ones(count)
+    biased[0] = 2
+    main_wins, _ = simulate_batch(biased, draws, remove_backups, trials * 10, seeds[runs])
+    biased_p = uniformity_test(main_wins, trials * 10, expected)[2]
+
+    print(f"Fair runs: {runs}, mean p = {p_values.mean():.3f}, rejected at 5%: {rejected:.3f}, KS = {ks:.3f}")
+    print(f"Biased pool (one double ticket): p = {biased_p:.3g}")
+    # KS eşiği 200 örnek için %1 düzeyindeki kritik değerdir (1.63 / sqrt(n))
+    ok = ks < 1.63 / math.sqrt(runs) and 0.01 <= rejected <= 0.10 and biased_p < 1e-6
+    print("Self-check " + ("passed" if ok else "FAILED"))
+    return ok
+
+
+def wilson_interval(successes, trials, z=1.959964):
+    phat = successes / trials
+    denominator = 1 + z * z / trials
+    centre = (phat + z * z / (2 * trials)) / denominator
+    margin = z * np.sqrt(phat * (1 - phat) / trials + z * z / (4 * trials * trials)) / denominator
+    return centre - margin, centre + margin
+
+
+def run_simulation(names, weights, draws, remove_backups, trials, workers, seed):
+    weights = np.asarray(weights, dtype=np.float64)
+    batch_trials = max(1, BATCH_ELEMENTS // max(len(names), 1))
+    batches = [batch_trials] * (trials // batch_trials)
+    if trials % batch_trials:
+        batches.append(trials % batch_trials)
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+
+    main_wins = np.zeros(len(names), dtype=np.int64)
+    backup_wins = np.zeros(len(names), dtype=np.int64)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(simulate_batch, weights, draws, remove_backups, batch, batch_seed)
+                   for batch, batch_seed in zip(batches, seeds)]
+        for future in futures:
+            batch_main, batch_backup = future.result()
+            main_wins += batch_main
+            backup_wins += batch_backup
+    return main_wins, backup_wins
+
+
+def expected_main_winners(count, draws, remove_backups):
+    remaining = count
+    total = 0
+    for draw, remove_all in zip(draws, remove_backups):
+        needed = draw["main_count"] + draw["backup_count"]
+        if needed == 0 or remaining < needed:
+            continue
+        total += draw["main_count"]
+        remaining -= needed if remove_all else draw["main_count"]
+    return total
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Çekiliş dizisini Monte Carlo ile tekrar tekrar oynatıp kazanma olasılıklarını denetler.")
+    parser.add_argument("input", nargs="?", help="list.json dosyası")
+    parser.add_argument("-n", "--trials", type=int, default=1_000_000, help="Etkinlik tekrar sayısı")
+    parser.add_argument("--remove", nargs="+", choices=["main", "all"], default=["all"],
+                        help="Her çekilişten sonra çıkarılanlar; tek değer tüm çekilişlere uygulanır")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Süreç sayısı")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("-o", "--output", help="Katılımcı başına sonuçların yazılacağı CSV dosyası")
+    parser.add_argument("--self-check", action="store_true",
+                        help="Ki-kare testinin adil listede tekdüze p verdiğini ve yanlı listeyi reddettiğini denetler")
+    args = parser.parse_args(argv)
+    if args.input is None and not args.self_check:
+        parser.error("input is required unless --self-check is given")
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.self_check:
+        return 0 if self_check() else 1
+    pool, draws, weight_map, _ = load_data(args.input)
+    try:
+        names = list(pool)
+    finally:
+        # Büyük listeler eşlenmiş dosyadan okunur; benzetim yalnızca bellekteki kopyayı kullanır
+        if isinstance(pool, MappedNamePool):
+            pool.close()
+    if any(has_constraints(draw) for draw in draws):
+        # Vektörel benzetim kota, üst sınır ve dışlama kurallarını modellemez
+        print("Warning: draw constraints are ignored by the simulation", file=sys.stderr)
+    if not names:
+        print("The list has no participants", file=sys.stderr)
+        return 2
+    weight_map = weight_map or {}
+    weights = [weight_map.get(name, 1) for name in names]
+
+    if len(args.remove) == 1:
+        remove_backups = [args.remove[0] == "all"] * len(draws)
+    elif len(args.remove) == len(draws):
+        remove_backups = [policy == "all" for policy in args.remove]
+    else:
+        print(f"--remove needs 1 or {len(draws)} values", file=sys.stderr)
+        return 2
+
+    started = time.perf_counter()
+    main_wins, backup_wins = run_simulation(names, weights, draws, remove_backups,
+                                            args.trials, args.workers, args.seed)
+    elapsed = time.perf_counter() - started
+
+    frequencies = main_wins / args.trials
+    low, high = wilson_interval(main_wins, args.trials)
+    print(f"{len(names)} participants, {len(draws)} draws, {args.trials} trials in {elapsed:.1f} s")
+    print(f"Main win frequency: min {frequencies.min():.6f}  max {frequencies.max():.6f}  "
+          f"mean {frequencies.mean():.6f}")
+
+    expected = None
+    if len(set(weights)) == 1:
+        # Eşit biletli listelerde simetri gereği herkesin beklenen ana kazanma olasılığı aynıdır
+        expected = expected_main_winners(len(names), draws, remove_backups) / len(names)
+        outside = int(np.sum((expected < low) | (expected > high)))
+        print(f"Expected per participant: {expected:.6f}")
+        test = uniformity_test(main_wins, args.trials, expected)
+        if test is None:
+            print("Chi-square: not applicable (every participant always or never wins)")
+        else:
+            statistic, dof, p_value = test
+            print(f"Chi-square: {statistic:.2f} (dof {dof}), p = {p_value:.4f}")
+        print(f"Participants whose 95% CI excludes the expectation: {outside} "
+              f"(~{0.05 * len(names):.0f} expected by chance)")
+    else:
+        print("Weighted list: chi-square against a uniform expectation is not applicable; "
+              "see per-participant intervals.")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(["name", "weight", "main_wins", "backup_wins", "frequency",
+                             "ci_low", "ci_high", "expected"])
+            for index, name in enumerate(names):
+                writer.writerow([name, weights[index], int(main_wins[index]), int(backup_wins[index]),
+                                 f"{frequencies[index]:.8f}", f"{low[index]:.8f}", f"{high[index]:.8f}",
+                                 "" if expected is None else f"{expected:.8f}"])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import json
+
+# Her okumada dosyadan alınan karakter sayısı
+CHUNK_SIZE = 1 << 20
+_WHITESPACE = " \t\n\r"
+_DELIMITERS = _WHITESPACE + ",]}:"
+_DECODER = json.JSONDecoder()
+
+
+# Tamponlu okuyucu: değerler json'un C ayrıştırıcısıyla çözülür, tampon yalnızca
+# bir değer parçanın sonunda yarım kaldığında doldurulur.
+class _Reader:
+    def __init__(self, file, chunk_size):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.buffer = ""
+        self.position = 0
+        self.eof = False
+
+    def fill(self):
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+    # Boşlukları atlayıp sıradaki karakteri döndürür
+    def peek(self):
+        while True:
+            while self.position < len(self.buffer) and self.buffer[self.position] in _WHITESPACE:
+                self.position += 1
+            if self.position < len(self.buffer):
+                return self.buffer[self.position]
+            if not self.fill():
+                raise json.JSONDecodeError("Unexpected end of data", self.buffer, self.position)
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buffer, self.position)
+        self.position += 1
+
+    def value(self):
+        self.peek()
+        while True:
+            try:
+                value, end = _DECODER.raw_decode(self.buffer, self.position)
+                # Tamponun sonunda biten sayı bir sonraki parçada sürüyor olabilir ("2." + "5")
+                if self.eof or (end < len(self.buffer) and self.buffer[end] in _DELIMITERS):
+                    self.position = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self.fill()
+
+    # '[' okunduktan sonra dizinin elemanlarını listeler halinde üretir. Tamponda tamamı
+    # bulunan dizgi elemanları tek json.loads çağrısıyla çözülür; kesim noktası bir
+    # dizginin içine düşerse o tampon için eleman eleman okumaya geçilir.
+    def items(self):
+        slow_until = -1
+        while True:
+            if self.peek() == "]":
+                self.position += 1
+                return
+            cut = self.buffer.rfind('",', self.position)
+            if cut > slow_until:
+                try:
+                    items = json.loads("[" + self.buffer[self.position:cut + 1] + "]")
+                except json.JSONDecodeError:
+                    slow_until = cut
+                else:
+                    self.position = cut + 2
+                    yield items
+                    continue
+            yield [self.value()]
+            if self.peek() == ",":
+                self.position += 1
+            else:
+                self.expect("]")
+                return
+
+
+# Bir JSON nesnesinin üst düzey anahtarlarını dosya sırasıyla (anahtar, değer) olarak üretir.
+# stream_keys içindeki anahtarların dizi değerleri belleğe tek seferde alınmaz;
+# batch_size elemanlık gruplar halinde (anahtar, grup) olarak art arda üretilir.
+def iter_object(file, stream_keys=(), batch_size=10000, chunk_size=CHUNK_SIZE):
+    reader = _Reader(file, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        key = reader.value()
+        reader.expect(":")
+        if key in stream_keys and reader.peek() == "[":
+            reader.position += 1
+            batch = []
+            emitted = False
+            for items in reader.items():
+                batch.extend(items)
+                while len(batch) >= batch_size:
+                    yield key, batch[:batch_size]
+                    batch = batch[batch_size:]
+                    emitted = True
+            if batch or not emitted:
+                yield key, batch
+        else:
+            yield key, reader.value()
+        if reader.peek() == ",":
+            reader.position += 1
+        else:
+            reader.expect("}")
+            return
@@ -5,39 +5,984 @@ import random
 import time
 import logging
 import pathlib
+import hashlib
+import itertools
+import collections
+import csv
+import multiprocessing
+import socket
+from startup_timeline import StartupTimeline
+
+# Açılış zaman çizelgesi; ağır Qt içe aktarımlarından önce başlatılır
+STARTUP = StartupTimeline(target_ms=int(os.getenv("LOTTERY_STARTUP_TARGET_MS", "1000")))
+
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
                             QLabel, QPushButton, QFrame, QLineEdit, QSpinBox, QMessageBox,
-                            QScrollArea, QTableWidget, QTableWidgetItem, QHeaderView,
+                            QTableWidget, QTableWidgetItem, QHeaderView,
                             QSizePolicy, QTabWidget, QToolButton, QStackedWidget, QTextEdit,
-                            QCheckBox, QInputDialog)
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, QSize
-from PyQt5.QtGui import QPixmap, QFont, QPalette, QBrush, QImage, QIcon, QColor
+                            QCheckBox, QFileDialog, QProgressDialog, QDialog,
+                            QTableView, QDialogButtonBox, QSplashScreen, QCompleter, QListWidget,
+                            QProgressBar, QComboBox, QPlainTextEdit, QFormLayout, QAbstractItemView, QAction)
+from PyQt5.QtCore import (Qt, QThread, pyqtSignal, QSize, QAbstractListModel, QAbstractTableModel, QModelIndex, QTimer,
+                          QObject, QElapsedTimer, QStringListModel, QRunnable, QThreadPool)
+from PyQt5.QtGui import QPixmap, QFont, QPalette, QBrush, QImage, QIcon, QColor, QPainter, QKeySequence
+from draw_constraints import ConstraintError, parse_constraints
+from app_logging import audit, setup_logging
+from draw_engine import DrawEngine, InsufficientParticipantsError, iter_data, load_data
+from draw_journal import DrawJournal
+from event_store import EventStore
+from name_pool import TombstoneList
+from name_store import MappedNamePool, write_store
+from name_utils import NameIndex, dedupe_names, iter_name_file, normalize_name
 
-# Log ayarları
-logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+STARTUP.mark("imports")
 
-# Kullanıcıya özgü veri dizini
+# Kullanıcıya özgü veri dizini. Yalnızca yol hesaplanır; dizin ilk yazmada oluşturulur,
+# böylece içe aktarma sırasında dosya sistemine dokunulmaz.
 def get_data_dir():
     if os.name == 'nt':  # Windows
         data_dir = pathlib.Path(os.getenv('APPDATA')) / "LotteryApp"
     else:  # macOS veya diğer
         data_dir = pathlib.Path.home() / "Library" / "Application Support" / "LotteryApp"
-    data_dir.mkdir(parents=True, exist_ok=True)
     return data_dir
 
-# Global JSON dosya yolu
+# Global JSON dosya yolu; etkin etkinlik seçildiğinde onun dizinini gösterir
 DATA_DIR = get_data_dir()
 JSON_FILE = DATA_DIR / "list.json"
+STORE_FILE = DATA_DIR / "names.lns"
+EVENTS_FILE_NAME = "events.sqlite3"
+# Talihlilerin daha önce kazanıp kazanmadığına bakılan son etkinlik sayısı
+RECENT_EVENTS = int(os.getenv("LOTTERY_RECENT_EVENTS", "5"))
+# Bu sayının üzerindeki listeler JSON yerine sıkıştırılmış depoya yazılır
+STORE_THRESHOLD = 100000
+CACHE_DIR = DATA_DIR / "cache"
+STARTUP_LOG_FILE = DATA_DIR / "startup_timings.jsonl"
+# Arka plan piramidinin seviye genişlikleri. Pencere boyutlandırılırken onu örten en küçük
+# seviye hemen kullanılır; kaynaktan büyük seviyeler 4K ekranlar için bir kez yumuşak büyütülür.
+BACKGROUND_LEVELS = (960, 1280, 1920, 2560, 3840)
+# Boyutlandırma durduktan bu kadar sonra tam kaliteli ölçekleme arka planda başlar
+BACKGROUND_RESCALE_DELAY_MS = 150
+# --broadcast ile açılan seyirci ekranı sunucusu; kapalıyken None
+BROADCAST = None
+# Kayıtlar kuyruk üzerinden ayrı bir iş parçacığında yazılır; uygulama açılırken kurulur
+LOG_LISTENER = None
+# Etkinlik veritabanı ilk kullanımda açılır; CURRENT_EVENT etkin etkinliğin satırıdır
+EVENTS = None
+CURRENT_EVENT = None
+
+
+def event_store():
+    global EVENTS
+    if EVENTS is None:
+        EVENTS = EventStore(DATA_DIR / EVENTS_FILE_NAME)
+    return EVENTS
+
+
+def activate_event(event):
+    global CURRENT_EVENT, JSON_FILE, STORE_FILE
+    CURRENT_EVENT = event
+    if event is not None:
+        directory = event_store().directory(event)
+        JSON_FILE = directory / "list.json"
+        STORE_FILE = directory / "names.lns"
+        event_store().set_current_event(event['id'])
+    else:
+        # Etkin etkinlik yokken yollar boşaltılır; arşivlenen etkinliğin dosyalarına yazılamaz
+        JSON_FILE = None
+        STORE_FILE = None
+
+
+# Etkin etkinliği bulur. Veritabanından önceki tek list.json düzeni bir kez etkinlik
+# olarak kaydedilir; dosyaları veri dizininde yerinde kalır.
+def load_current_event():
+    store = event_store()
+    event = store.current_event
+    if event is None and not store.events() and (DATA_DIR / "list.json").exists():
+        names, draws, _, _ = load_data(DATA_DIR / "list.json")
+        event = store.create_event("Önceki çekiliş", draws, len(names), directory=".")
+        if isinstance(names, MappedNamePool):
+            names.close()
+        logging.info("Imported the existing list as event %s", event['id'])
+    activate_event(event)
+    return event
+
+# Önbellek anahtarı kaynak dosyanın özeti ve işleme parametrelerinden oluşur
+def cache_file_for(image_path, tag):
+    with open(image_path, "rb") as file:
+        source_hash = hashlib.sha1(file.read()).hexdigest()[:16]
+    return CACHE_DIR / f"{pathlib.Path(image_path).stem}_{source_hash}_{tag}.png"
+
+def load_cached_pixmap(cache_file):
+    if cache_file.exists():
+        pixmap = QPixmap(str(cache_file))
+        if not pixmap.isNull():
+            logging.debug("Image loaded from cache: %s", cache_file)
+            return pixmap
+    return None
+
+def save_cached_image(image, cache_file):
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        image.save(str(cache_file), "PNG")
+    except OSError as e:
+        logging.warning("Image cache could not be written: %s", e)
+
+# Logolar her açılışta yeniden ölçeklenmesin diye küçültülmüş halleri saklanır
+def load_scaled_pixmap(image_path, width, height):
+    if not os.path.exists(image_path):
+        return QPixmap()
+    cache_file = cache_file_for(image_path, f"{width}x{height}")
+    pixmap = load_cached_pixmap(cache_file)
+    if pixmap is not None:
+        return pixmap
+    
+    image = QImage(image_path)
+    if image.isNull():
+        return QPixmap()
+    image = image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    save_cached_image(image, cache_file)
+    return QPixmap.fromImage(image)
+
+# Opaklığı tek bir QPainter geçişiyle uygular; yalnızca QImage kullandığından iş parçacıklarında da çalışır
+def apply_opacity(source, opacity):
+    background_image = QImage(source.size(), QImage.Format_ARGB32_Premultiplied)
+    background_image.fill(Qt.transparent)
+    painter = QPainter(background_image)
+    painter.setOpacity(opacity)
+    painter.drawImage(0, 0, source)
+    painter.end()
+    return background_image
+
+def decode_image(image_path):
+    source = QImage(image_path)
+    if source.isNull():
+        raise ValueError(f"Image could not be decoded: {image_path}")
+    return source
+
+# Opaklığı uygular, ölçekler ve sonucu diskte saklar
+def load_background_pixmap(image_path, opacity, width, height):
+    cache_file = cache_file_for(image_path, f"bg{int(round(opacity * 100))}_{width}x{height}")
+    pixmap = load_cached_pixmap(cache_file)
+    if pixmap is not None:
+        return pixmap
+    
+    source = decode_image(image_path)
+    source = source.scaled(width, height, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+    background_image = apply_opacity(source, opacity)
+    
+    save_cached_image(background_image, cache_file)
+    return QPixmap.fromImage(background_image)
+
+# Opaklık kaynak çözünürlükte bir kez uygulanır, seviyeler bundan yumuşak ölçeklenir
+def build_background_pyramid(image_path, opacity):
+    processed = apply_opacity(decode_image(image_path), opacity)
+    return [processed.scaledToWidth(width, Qt.SmoothTransformation) for width in BACKGROUND_LEVELS]
+
+# Pencereyi örten en küçük seviye; hiçbiri örtmüyorsa en büyüğü
+def pick_background_level(levels, width, height):
+    for position, level in enumerate(levels):
+        if level.width() >= width and level.height() >= height:
+            return position
+    return len(levels) - 1
+
+
+# Havuz görevleri QObject olmadığından sonuçlar bu nesnenin sinyalleriyle GUI iş parçacığına taşınır
+class BackgroundSignals(QObject):
+    pyramid_ready = pyqtSignal(list)
+    rescaled = pyqtSignal(int, QImage)
+
+
+class BackgroundPyramidTask(QRunnable):
+    def __init__(self, image_path, opacity, signals):
+        super().__init__()
+        self.image_path = image_path
+        self.opacity = opacity
+        self.signals = signals
+    
+    def run(self):
+        try:
+            self.signals.pyramid_ready.emit(build_background_pyramid(self.image_path, self.opacity))
+        except Exception as e:
+            logging.error("Background pyramid could not be built: %s", e)
+
+
+class BackgroundRescaleTask(QRunnable):
+    def __init__(self, level, width, height, generation, signals):
+        super().__init__()
+        self.level = level
+        self.width = width
+        self.height = height
+        self.generation = generation
+        self.signals = signals
+    
+    def run(self):
+        image = self.level.scaled(self.width, self.height, Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation)
+        self.signals.rescaled.emit(self.generation, image)
+
+# Geri sayım ve isim akışı animasyonunu GUI iş parçacığındaki tek bir zamanlayıcıyla yürütür.
+# Her çekilişte yeni iş parçacığı açılmaz; animasyon iptal edilebilir veya kısaltılabilir.
+class DrawAnimator(QObject):
+    tick = pyqtSignal(int)
+    frame = pyqtSignal(float)
+    done = pyqtSignal()
+    
+    FRAME_INTERVAL_MS = 16  # ~60 fps
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.duration_ms = 0
+        self.last_tick = None
+        self.clock = QElapsedTimer()
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.setInterval(self.FRAME_INTERVAL_MS)
+        self.timer.timeout.connect(self.advance)
+    
+    def is_running(self):
+        return self.timer.isActive()
+    
+    def start(self, seconds):
+        self.cancel()
+        self.duration_ms = int(seconds * 1000)
+        if self.duration_ms <= 0:
+            self.done.emit()
+            return
+        self.last_tick = None
+        self.clock.start()
+        self.timer.start()
+        self.advance()
+    
+    def advance(self):
+        elapsed = self.clock.elapsed()
+        if elapsed >= self.duration_ms:
+            self.finish_now()
+            return
+        remaining = (self.duration_ms - elapsed + 999) // 1000
+        # Sayı etiketi saniyede bir güncellenir, her karede değil
+        if remaining != self.last_tick:
+            self.last_tick = remaining
+            self.tick.emit(remaining)
+        self.frame.emit(elapsed / 1000)
+    
+    def finish_now(self):
+        if self.timer.isActive():
+            self.timer.stop()
+            self.done.emit()
+    
+    def cancel(self):
+        self.timer.stop()
+
+
+# Geri sayım sırasında akan isimler. Şerit bir kez pixmap'e çizilir; her karede
+# yalnızca kaydırma ofseti değişir, metin yeniden yerleştirilmez.
+class RollingNamesWidget(QWidget):
+    ROW_HEIGHT = 56
+    SPEED = 900  # piksel/saniye
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.names = []
+        self.strip = None
+        self.offset = 0.0
+        self.setMinimumHeight(self.ROW_HEIGHT * 3)
+        self.setAttribute(Qt.WA_OpaquePaintEvent, False)
+    
+    def set_names(self, names):
+        self.names = names
+        self.strip = None
+        self.offset = 0.0
+    
+    def render_strip(self):
+        width = max(self.width(), 1)
+        strip = QPixmap(width, max(len(self.names), 1) * self.ROW_HEIGHT)
+        strip.fill(Qt.transparent)
+        painter = QPainter(strip)
+        painter.setFont(QFont("Segoe UI", 26, QFont.Bold))
+        painter.setPen(QColor("#FFFFFF"))
+        for row, name in enumerate(self.names):
+            painter.drawText(0, row * self.ROW_HEIGHT, width, self.ROW_HEIGHT, Qt.AlignCenter, name)
+        painter.end()
+        self.strip = strip
+    
+    def set_elapsed(self, seconds):
+        self.offset = seconds * self.SPEED
+        self.update()
+    
+    def resizeEvent(self, event):
+        self.strip = None
+        super().resizeEvent(event)
+    
+    def paintEvent(self, event):
+        if not self.names:
+            return
+        if self.strip is None:
+            self.render_strip()
+        strip_height = self.strip.height()
+        top = (self.height() - self.ROW_HEIGHT) // 2 - int(self.offset) % strip_height
+        painter = QPainter(self)
+        # Şerit sonsuz dönüyormuş gibi görünsün diye gerekli kadar tekrar çizilir
+        y = top - strip_height
+        while y < self.height():
+            painter.drawPixmap(0, y, self.strip)
+            y += strip_height
+        painter.end()
+
+# Katılımcı dosyasını satır satır okuyup tekrarları ayıklayan arka plan işçisi
+class NameImportWorker(QThread):
+    progress = pyqtSignal(int)
+    imported = pyqtSignal(list, list, dict, dict)
+    failed = pyqtSignal(str)
+    
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+    
+    def run(self):
+        try:
+            is_csv = self.path.lower().endswith(".csv")
+            weights = {}
+            attributes = {}
+            # utf-8-sig: Excel'in eklediği BOM isim olarak okunmasın
+            with open(self.path, "r", encoding="utf-8-sig", newline="") as file:
+                size = max(os.fstat(file.fileno()).st_size, 1)
+                unique_names, duplicate_names = dedupe_names(
+                    self.stream_names(file, size, is_csv, weights, attributes))
+            if not self.isInterruptionRequested():
+                self.imported.emit(unique_names, duplicate_names, weights, attributes)
+        except Exception as e:
+            logging.error("Error importing names: %s", e)
+            self.failed.emit(str(e))
+    
+    def stream_names(self, file, size, is_csv, weights, attributes):
+        for count, name in enumerate(iter_name_file(file, is_csv, weights, attributes), 1):
+            if count % 10000 == 0:
+                if self.isInterruptionRequested():
+                    return
+                self.progress.emit(min(99, file.buffer.tell() * 100 // size))
+            yield name
+
+
+# list.json'u arka planda akış halinde okur. Çekiliş tanımları gelir gelmez header
+# yayınlanır; isimler gruplar halinde ana iş parçacığındaki havuza aktarılır.
+class DataLoadWorker(QThread):
+    progress = pyqtSignal(int)
+    header_loaded = pyqtSignal(object)
+    names_loaded = pyqtSignal(list)
+    weights_loaded = pyqtSignal(dict)
+    attributes_loaded = pyqtSignal(dict)
+    loaded = pyqtSignal()
+    failed = pyqtSignal(str)
+    
+    def __init__(self, path):
+        super().__init__()
+        self.path = path
+    
+    def run(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                size = max(os.fstat(file.fileno()).st_size, 1)
+                for kind, value in iter_data(file):
+                    if self.isInterruptionRequested():
+                        if kind == "header" and value['names'] is not None:
+                            value['names'].close()
+                        return
+                    if kind == "header":
+                        self.header_loaded.emit(value)
+                    elif kind == "weights":
+                        self.weights_loaded.emit(value)
+                    elif kind == "attributes":
+                        self.attributes_loaded.emit(value)
+                    else:
+                        self.names_loaded.emit(value)
+                    self.progress.emit(min(99, file.buffer.tell() * 100 // size))
+            self.loaded.emit()
+        except Exception as e:
+            logging.error("Error loading JSON: %s", e)
+            self.failed.emit(str(e))
+
+
+# İsim arama dizinini arka planda kurar; milyonluk listelerde kurulum saniyeler sürer.
+# Kaynak değişmeyen bir kopya olmalıdır, çünkü havuz bu sırada çekilişle küçülebilir.
+class NameIndexWorker(QThread):
+    ready = pyqtSignal(object)
+    
+    def __init__(self, names):
+        super().__init__()
+        self.names = names
+        # Kaynak (ör. eşlenmiş depo) okunurken doğrudur; bitince kaynak kapatılabilir
+        self.reading_source = True
+    
+    def run(self):
+        try:
+            names = list(self.stream_names())
+            self.reading_source = False
+            self.names = None
+            name_index = NameIndex(names, self.isInterruptionRequested)
+            if not name_index.cancelled and not self.isInterruptionRequested():
+                logging.debug("Name index built: %d names", len(name_index))
+                self.ready.emit(name_index)
+        except Exception as e:
+            # Kesilen iş parçacığının kaynağı kapatılmış olabilir
+            if not self.isInterruptionRequested():
+                logging.error("Error building name index: %s", e)
+        finally:
+            self.reading_source = False
+    
+    # Ekran kapanırken dizin kurulumu beklenmez: iş parçacığı uygulamaya devredilir, sinyali
+    # koparılır ve bitince silinir. Yalnızca kaynak hâlâ okunuyorsa (en fazla bir grup) beklenir,
+    # böylece motor depoyu güvenle kapatabilir.
+    def retire(self):
+        self.requestInterruption()
+        try:
+            self.ready.disconnect()
+        except TypeError:
+            pass
+        while self.reading_source and not self.wait(10):
+            pass
+        self.setParent(QApplication.instance())
+        self.finished.connect(self.deleteLater)
+        if self.isFinished():
+            self.deleteLater()
+    
+    def stream_names(self):
+        for count, name in enumerate(self.names, 1):
+            if count % 10000 == 0 and self.isInterruptionRequested():
+                return
+            yield name
 
-class CountdownThread(QThread):
-    signal = pyqtSignal(int)
-    finished = pyqtSignal()
+
+# Sonuç raporlarını yazar ve sertifikaları ayrı süreçlerde çizdirir. Bu iş parçacığı
+# yalnızca süreçleri bekleyip ilerleme bildirir; arayüz dışa aktarma sürerken kullanılabilir.
+class ExportWorker(QThread):
+    progress = pyqtSignal(int)
+    exported = pyqtSignal(str)
+    failed = pyqtSignal(str)
+    
+    def __init__(self, results, output_dir, certificate_format, meta):
+        super().__init__()
+        self.results = results
+        self.output_dir = pathlib.Path(output_dir)
+        self.certificate_format = certificate_format
+        self.meta = meta
     
     def run(self):
-        for i in range(3, 0, -1):
-            self.signal.emit(i)
-            time.sleep(1)
-        self.finished.emit()
+        try:
+            from export_results import export_reports, render_certificates
+            export_reports(self.results, self.output_dir, ["csv", "json", "html"], self.meta)
+            count = 0
+            if self.certificate_format:
+                count = render_certificates(
+                    self.results, self.output_dir / "certificates", self.certificate_format,
+                    progress=lambda done, total: self.progress.emit(done * 100 // total),
+                    should_stop=self.isInterruptionRequested)
+            if not self.isInterruptionRequested():
+                logging.debug("Results exported to %s: %s certificates", self.output_dir, count)
+                self.exported.emit(f"Sonuçlar {self.output_dir} dizinine aktarıldı. {count} sertifika oluşturuldu.")
+        except Exception as e:
+            logging.error("Error exporting results: %s", e)
+            self.failed.emit(str(e))
+
+
+# Canlı havuzu kopyalamadan gösteren liste modeli. Filtre aktifken yalnızca
+# eşleşen isimlerin referansları tutulur; görünüm sadece görünen satırları çizer.
+class ParticipantListModel(QAbstractListModel):
+    def __init__(self, pool):
+        super().__init__()
+        self.pool = pool
+        self.matches = None
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.pool) if self.matches is None else len(self.matches)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        source = self.pool if self.matches is None else self.matches
+        return source[index.row()]
+    
+    def set_matches(self, matches):
+        self.beginResetModel()
+        self.matches = matches
+        self.endResetModel()
+    
+    def append_matches(self, names):
+        if not names:
+            return
+        start = len(self.matches)
+        self.beginInsertRows(QModelIndex(), start, start + len(names) - 1)
+        self.matches.extend(names)
+        self.endInsertRows()
+
+
+# Çekiliş tanımları için varsayılanlar ve sınırlar
+DEFAULT_DRAW = {'title': "Çekiliş Başlığı", 'main_count': 3, 'backup_count': 2}
+COUNT_LIMITS = {'main_count': (1, 100), 'backup_count': (0, 100)}
+
+
+def new_draw(title=None, main_count=None, backup_count=None):
+    return {
+        'title': DEFAULT_DRAW['title'] if title is None else title,
+        'main_count': DEFAULT_DRAW['main_count'] if main_count is None else main_count,
+        'backup_count': DEFAULT_DRAW['backup_count'] if backup_count is None else backup_count,
+        'rules': {}
+    }
+
+
+# Yapıştırılan ya da dosyadan okunan "başlık, ana, yedek" satırları. Ayraç sekme, noktalı
+# virgül veya virgüldür; sayısal olmayan sayı sütunlu ilk satır başlık sayılır.
+def parse_draw_rows(text):
+    lines = [line for line in text.splitlines() if line.strip()]
+    if not lines:
+        return []
+    first_line = lines[0]
+    delimiter = "\t" if "\t" in first_line else ";" if first_line.count(";") > first_line.count(",") else ","
+    draws = []
+    for line_number, row in enumerate(csv.reader(lines, delimiter=delimiter), 1):
+        cells = [cell.strip() for cell in row]
+        if not cells or not cells[0]:
+            continue
+        counts = cells[1:3]
+        if line_number == 1 and counts and not counts[0].isdigit():
+            continue
+        values = []
+        for key, cell in zip(("main_count", "backup_count"), counts):
+            if not cell:
+                values.append(None)
+                continue
+            if not cell.isdigit():
+                raise ValueError(f"{line_number}. satır: '{cell}' bir sayı değil")
+            low, high = COUNT_LIMITS[key]
+            if not low <= int(cell) <= high:
+                raise ValueError(f"{line_number}. satır: {cell} değeri {low}-{high} aralığında olmalı")
+            values.append(int(cell))
+        draws.append(new_draw(cells[0], *values))
+    return draws
+
+
+def rules_summary(rules):
+    parts = []
+    if rules.get('quota'):
+        parts.append("kota")
+    if rules.get('max_per'):
+        parts.append("üst sınır")
+    if rules.get('exclude_previous_winners'):
+        parts.append("dışlama")
+    return ", ".join(parts)
+
+
+# Çekiliş tanımlarının tablosu. Görünüm yalnızca görünen satırları çizer; satır başına
+# widget kurulmaz. Toplu ekleme tek ekleme bildirimiyle yapılır. Satırlar TombstoneList'te
+# tutulur: silme sırayı korur ama listeyi kaydırmaz (O(log n)).
+class DrawTableModel(QAbstractTableModel):
+    COLUMNS = [("title", "Çekiliş Başlığı"), ("main_count", "Ana"), ("backup_count", "Yedek"), ("rules", "Kurallar")]
+    
+    def __init__(self, draws=()):
+        super().__init__()
+        self.draws = TombstoneList(draws)
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.draws)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][1]
+        return super().headerData(section, orientation, role)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        key = self.COLUMNS[index.column()][0]
+        draw = self.draws[index.row()]
+        if key == "rules":
+            return rules_summary(draw['rules'])
+        return draw[key]
+    
+    def flags(self, index):
+        flags = super().flags(index)
+        if index.isValid() and self.COLUMNS[index.column()][0] != "rules":
+            flags |= Qt.ItemIsEditable
+        return flags
+    
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        key = self.COLUMNS[index.column()][0]
+        if key == "title":
+            value = str(value).strip()
+        elif key in COUNT_LIMITS:
+            low, high = COUNT_LIMITS[key]
+            value = min(max(int(value), low), high)
+        else:
+            return False
+        self.draws[index.row()][key] = value
+        self.dataChanged.emit(index, index)
+        return True
+    
+    def append_draws(self, draws):
+        if not draws:
+            return
+        start = len(self.draws)
+        self.beginInsertRows(QModelIndex(), start, start + len(draws) - 1)
+        self.draws.extend(draws)
+        self.endInsertRows()
+    
+    # Ardışık satırlar tek bildirimle, sondan başa doğru silinir
+    def remove_rows(self, rows):
+        rows = sorted(set(rows), reverse=True)
+        while rows:
+            last = first = rows.pop(0)
+            while rows and rows[0] == first - 1:
+                first = rows.pop(0)
+            self.beginRemoveRows(QModelIndex(), first, last)
+            for row in range(last, first - 1, -1):
+                self.draws.delete(row)
+            self.endRemoveRows()
+    
+    def set_rules(self, row, rules):
+        self.draws[row]['rules'] = rules
+        index = self.index(row, len(self.COLUMNS) - 1)
+        self.dataChanged.emit(index, index)
+
+
+class ParticipantDialog(QDialog):
+    # Her zamanlayıcı adımında taranan isim sayısı; arayüz bu aralıklarla nefes alır
+    FILTER_CHUNK = 20000
+    
+    def __init__(self, pool, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.query = ""
+        self.scan_source = None
+        self.scan_position = 0
+        
+        self.setWindowTitle("Katılımcı Listesi")
+        self.resize(600, 700)
+        layout = QVBoxLayout(self)
+        
+        self.search_entry = QLineEdit()
+        self.search_entry.setPlaceholderText("İsim ara...")
+        self.search_entry.setClearButtonEnabled(True)
+        layout.addWidget(self.search_entry)
+        
+        self.count_label = QLabel()
+        layout.addWidget(self.count_label)
+        
+        self.model = ParticipantListModel(pool)
+        # Sabit satır yüksekliği: milyonlarca satırda bile yerleşim hesabı yapılmaz
+        self.names_view = QTableView()
+        self.names_view.setModel(self.model)
+        self.names_view.horizontalHeader().hide()
+        self.names_view.horizontalHeader().setStretchLastSection(True)
+        self.names_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.names_view.verticalHeader().setDefaultSectionSize(24)
+        self.names_view.setShowGrid(False)
+        layout.addWidget(self.names_view, stretch=1)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok)
+        buttons.accepted.connect(self.accept)
+        layout.addWidget(buttons)
+        
+        # Her tuş vuruşunda değil, yazma durduğunda filtrele
+        self.debounce_timer = QTimer(self)
+        self.debounce_timer.setSingleShot(True)
+        self.debounce_timer.setInterval(150)
+        self.debounce_timer.timeout.connect(self.start_filter)
+        self.search_entry.textChanged.connect(self.debounce_timer.start)
+        
+        self.scan_timer = QTimer(self)
+        self.scan_timer.timeout.connect(self.scan_chunk)
+        
+        self.update_count_label()
+    
+    def start_filter(self):
+        query = normalize_name(self.search_entry.text())
+        self.scan_timer.stop()
+        
+        if not query:
+            self.query = ""
+            self.model.set_matches(None)
+            self.update_count_label()
+            return
+        
+        # Önceki aramayı daraltan sorgularda yalnızca önceki eşleşmeler taranır
+        narrowing = (self.query and query.startswith(self.query)
+                     and self.model.matches is not None and self.scan_source is None)
+        self.scan_source = list(self.model.matches) if narrowing else self.pool
+        self.scan_position = 0
+        self.query = query
+        self.model.set_matches([])
+        self.scan_timer.start(0)
+    
+    def scan_chunk(self):
+        end = min(self.scan_position + self.FILTER_CHUNK, len(self.scan_source))
+        query = self.query
+        matches = [self.scan_source[position] for position in range(self.scan_position, end)
+                   if query in normalize_name(self.scan_source[position])]
+        self.scan_position = end
+        self.model.append_matches(matches)
+        
+        if end >= len(self.scan_source):
+            self.scan_timer.stop()
+            self.scan_source = None
+        self.update_count_label()
+    
+    def update_count_label(self):
+        text = f"Toplam {len(self.pool)} katılımcı"
+        if self.model.matches is not None:
+            text += f" — {len(self.model.matches)} eşleşme"
+            if self.scan_source is not None:
+                text += " (aranıyor...)"
+        self.count_label.setText(text)
+
+
+# Çıkarılacak isimler yazarken önerilerle seçilip bir listede toplanır ve tek
+# seferde çıkarılır. Öneriler büyük/küçük harf ve Türkçe karakterlerden bağımsızdır.
+class RemoveNamesDialog(QDialog):
+    def __init__(self, pool, name_index=None, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.name_index = name_index
+        self.pending = []
+        
+        self.setWindowTitle("İsim Çıkar")
+        self.resize(500, 450)
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Listeden çıkarılacak isimleri yazıp Enter'a basın:"))
+        
+        entry_layout = QHBoxLayout()
+        self.name_entry = QLineEdit()
+        self.name_entry.setPlaceholderText("İsim ara...")
+        entry_layout.addWidget(self.name_entry, stretch=1)
+        add_button = QPushButton("Ekle")
+        add_button.clicked.connect(self.add_entry)
+        entry_layout.addWidget(add_button)
+        layout.addLayout(entry_layout)
+        
+        # Filtreleme dizinde yapılır; tamamlayıcı önerileri olduğu gibi gösterir
+        self.suggestions = QStringListModel(self)
+        self.completer = QCompleter(self.suggestions, self)
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setMaxVisibleItems(12)
+        self.completer.activated[str].connect(self.add_name)
+        self.name_entry.setCompleter(self.completer)
+        self.name_entry.textEdited.connect(self.update_suggestions)
+        self.name_entry.returnPressed.connect(self.add_entry)
+        
+        self.status_label = QLabel()
+        self.status_label.setWordWrap(True)
+        layout.addWidget(self.status_label)
+        
+        self.pending_list = QListWidget()
+        self.pending_list.setSelectionMode(QListWidget.ExtendedSelection)
+        layout.addWidget(self.pending_list, stretch=1)
+        
+        discard_button = QPushButton("Seçilenleri Listeden Kaldır")
+        discard_button.clicked.connect(self.discard_selected)
+        layout.addWidget(discard_button)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        self.ok_button = buttons.button(QDialogButtonBox.Ok)
+        self.ok_button.setText("Çıkar")
+        # Enter isim eklemek için kullanılır; diyaloğu kapatmasın
+        self.ok_button.setAutoDefault(False)
+        buttons.button(QDialogButtonBox.Cancel).setAutoDefault(False)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        
+        self.set_index(name_index)
+        self.update_ok_button()
+    
+    def set_index(self, name_index):
+        self.name_index = name_index
+        if name_index is None:
+            self.status_label.setText("Öneriler hazırlanıyor; tam isim yazarak ekleyebilirsiniz.")
+        else:
+            self.status_label.setText("")
+            self.update_suggestions(self.name_entry.text())
+    
+    def is_available(self, name):
+        return name in self.pool and name not in self.pending
+    
+    def update_suggestions(self, text):
+        if self.name_index is not None:
+            self.suggestions.setStringList(self.name_index.suggest(text, contains=self.is_available))
+    
+    def resolve(self, text):
+        if self.name_index is not None:
+            return self.name_index.resolve(text, contains=self.is_available)
+        return text if self.is_available(text) else None
+    
+    def add_entry(self):
+        text = self.name_entry.text().strip()
+        if not text:
+            return
+        name = self.resolve(text)
+        suggestions = self.suggestions.stringList() if self.name_index is not None else []
+        # Tam eşleşme yoksa tek öneri kalmışsa o isim kastedilmiştir
+        if name is None and len(suggestions) == 1:
+            name = suggestions[0]
+        if name is not None:
+            self.add_name(name)
+            return
+        suggestions = suggestions[:3]
+        message = f"'{text}' ismi listede bulunamadı."
+        if suggestions:
+            message += " Bunu mu demek istediniz: " + ", ".join(suggestions) + "?"
+        self.status_label.setText(message)
+    
+    def add_name(self, name):
+        if name in self.pending or name not in self.pool:
+            return
+        self.pending.append(name)
+        self.pending_list.addItem(name)
+        self.status_label.setText("")
+        # Tamamlayıcı seçimden sonra metni yeniden yazar; temizlik olay döngüsüne bırakılır
+        QTimer.singleShot(0, self.name_entry.clear)
+        self.update_ok_button()
+    
+    def discard_selected(self):
+        for item in self.pending_list.selectedItems():
+            self.pending.remove(item.text())
+            self.pending_list.takeItem(self.pending_list.row(item))
+        self.update_ok_button()
+    
+    def update_ok_button(self):
+        self.ok_button.setEnabled(bool(self.pending))
+        self.ok_button.setText(f"Çıkar ({len(self.pending)})" if self.pending else "Çıkar")
+
+
+# Bir çekilişin kuralları: önceki talihlileri dışlama, öznitelik değeri başına üst sınır
+# ve değer başına ana talihli kotası. Kurallar kaydedilmeden önce doğrulanır.
+class DrawRulesDialog(QDialog):
+    EXCLUDE_CHOICES = [("Hayır", False), ("Önceki ana talihliler", True), ("Önceki ana ve yedek talihliler", "all")]
+    
+    def __init__(self, rules, attribute_names, title, main_count, parent=None):
+        super().__init__(parent)
+        self.title = title
+        self.main_count = main_count
+        self.rules = dict(rules)
+        attribute, cap, quota, exclude = parse_constraints({'title': title, 'main_count': main_count, **rules})
+        
+        self.setWindowTitle(f"Çekiliş Kuralları — {title}")
+        layout = QFormLayout(self)
+        
+        self.exclude_combo = QComboBox()
+        for label, value in self.EXCLUDE_CHOICES:
+            self.exclude_combo.addItem(label, value)
+        self.exclude_combo.setCurrentIndex([value for _, value in self.EXCLUDE_CHOICES].index(exclude))
+        layout.addRow("Katılamayacaklar:", self.exclude_combo)
+        
+        # Öznitelikler içe aktarılan CSV'nin başlık sütunlarıdır; elle de yazılabilir
+        self.attribute_combo = QComboBox()
+        self.attribute_combo.setEditable(True)
+        self.attribute_combo.addItem("")
+        self.attribute_combo.addItems(attribute_names)
+        self.attribute_combo.setCurrentText(attribute or "")
+        layout.addRow("Öznitelik:", self.attribute_combo)
+        
+        self.cap_spin = QSpinBox()
+        self.cap_spin.setRange(0, 1000)
+        self.cap_spin.setSpecialValueText("Sınırsız")
+        self.cap_spin.setValue(cap or 0)
+        layout.addRow("Değer başına en fazla:", self.cap_spin)
+        
+        self.quota_entry = QPlainTextEdit()
+        self.quota_entry.setPlaceholderText("Her satıra bir kota: değer: sayı")
+        self.quota_entry.setPlainText("\n".join(f"{value}: {count}" for value, count in quota.items()))
+        layout.addRow("Ana talihli kotaları:", self.quota_entry)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addRow(buttons)
+    
+    def parse_quota(self):
+        quota = {}
+        for line in self.quota_entry.toPlainText().splitlines():
+            if not line.strip():
+                continue
+            value, separator, count = line.rpartition(":")
+            if not separator or not value.strip() or not count.strip().isdigit():
+                raise ConstraintError(f"'{line.strip()}' satırı 'değer: sayı' biçiminde değil")
+            quota[value.strip()] = int(count)
+        return quota
+    
+    def accept(self):
+        rules = {}
+        exclude = self.exclude_combo.currentData()
+        if exclude:
+            rules['exclude_previous_winners'] = exclude
+        attribute = self.attribute_combo.currentText().strip()
+        try:
+            quota = self.parse_quota()
+            if (quota or self.cap_spin.value()) and not attribute:
+                raise ConstraintError("üst sınır ve kotalar için öznitelik seçilmeli")
+            if self.cap_spin.value():
+                rules['max_per'] = {attribute: self.cap_spin.value()}
+            if quota:
+                rules['quota'] = {attribute: quota}
+            parse_constraints({'title': self.title, 'main_count': self.main_count, **rules})
+        except ConstraintError as e:
+            QMessageBox.warning(self, "Uyarı", f"Kurallar geçersiz: {e}")
+            return
+        self.rules = rules
+        super().accept()
+
+
+# Kayıtlı etkinlikler: seçilen etkinlik açılır ya da yeni etkinlik başlatılır
+class EventsDialog(QDialog):
+    def __init__(self, store, current_event=None, parent=None):
+        super().__init__(parent)
+        self.selected = None
+        self.new_event = False
+        self.events = store.events()
+        
+        self.setWindowTitle("Etkinlikler")
+        self.resize(700, 500)
+        layout = QVBoxLayout(self)
+        
+        self.table = QTableWidget(len(self.events), 4)
+        self.table.setHorizontalHeaderLabels(["Etkinlik", "Tarih", "Katılımcı", "Durum"])
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        for row, event in enumerate(self.events):
+            status = "Arşivlendi" if event['archived_at'] else "Açık"
+            if current_event is not None and event['id'] == current_event['id']:
+                status += " (etkin)"
+                self.table.selectRow(row)
+            values = [event['title'], time.strftime("%d.%m.%Y %H:%M", time.localtime(event['created_at'])),
+                      str(event['participant_count']), status]
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+        self.table.doubleClicked.connect(self.accept)
+        layout.addWidget(self.table, stretch=1)
+        
+        buttons = QDialogButtonBox(QDialogButtonBox.Open | QDialogButtonBox.Cancel)
+        new_button = buttons.addButton("Yeni Etkinlik", QDialogButtonBox.ActionRole)
+        new_button.clicked.connect(self.start_new_event)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+    
+    def start_new_event(self):
+        self.new_event = True
+        super().accept()
+    
+    def accept(self):
+        row = self.table.currentRow()
+        if row < 0:
+            return
+        self.selected = self.events[row]
+        super().accept()
+
 
 class LotteryApp(QMainWindow):
     def __init__(self):
@@ -51,9 +996,30 @@ class LotteryApp(QMainWindow):
         self.main_layout = QVBoxLayout(self.central_widget)
         self.main_layout.setSpacing(20)
         self.main_layout.setContentsMargins(20, 20, 20, 20)
-        
-        # Arkaplan ayarla
-        self.setup_background("lotterybg.png", opacity=0.4)
+        self.startup_finished = False
+        self.draw_screen = None
+        # Uygulama arka plan işleri bitmeden kapanırsa iş parçacıkları çalışırken yok edilmesin.
+        # Bağlantı pencereye aittir; ekran başına bağlanırsa eski ekranlar kapanışa kadar yaşar.
+        QApplication.instance().aboutToQuit.connect(self.shutdown)
+        
+        # Arka plan: piramit hazır olunca boyutlandırmada seviye seçilir, tam kaliteli
+        # ölçekleme boyutlandırma durduktan sonra tek iş parçacıklı havuzda yapılır
+        self.background_levels = None
+        self.background_pixmaps = {}
+        self.background_level = None
+        self.background_size = None
+        self.background_request = None
+        self.background_generation = 0
+        self.background_pool = QThreadPool(self)
+        self.background_pool.setMaxThreadCount(1)
+        self.background_signals = BackgroundSignals(self)
+        self.background_signals.pyramid_ready.connect(self.on_background_pyramid_ready)
+        self.background_signals.rescaled.connect(self.on_background_rescaled)
+        self.background_timer = QTimer(self)
+        self.background_timer.setSingleShot(True)
+        self.background_timer.setInterval(BACKGROUND_RESCALE_DELAY_MS)
+        self.background_timer.timeout.connect(self.start_background_rescale)
+        QApplication.instance().aboutToQuit.connect(self.background_pool.waitForDone)
         
         # Modern stil ayarla
         self.setup_style()
@@ -69,13 +1035,35 @@ class LotteryApp(QMainWindow):
         
         # Footer bölümü
         self.create_footer()
+        STARTUP.mark("window_init")
+    
+    # Arka plan ve içerik ekranı ilk kare çizildikten sonra kurulur; pencere hemen görünür
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.startup_finished:
+            self.startup_finished = True
+            if STARTUP.elapsed_ms("first_frame") is None:
+                STARTUP.mark("first_frame")
+            QTimer.singleShot(0, self.finish_startup)
+    
+    def finish_startup(self):
+        # Arkaplan ayarla
+        self.setup_background("lotterybg.png", opacity=0.4)
+        STARTUP.mark("background")
         
         # Ekranı yükle
-        logging.debug(f"Checking for JSON file at: {JSON_FILE}")
-        if not JSON_FILE.exists():
+        load_current_event()
+        logging.debug("Checking for JSON file at: %s", JSON_FILE)
+        if CURRENT_EVENT is None or not JSON_FILE.exists():
             self.open_choose_screen()
         else:
             self.open_draw_screen()
+        
+        if STARTUP.elapsed_ms("screen_ready") is None:
+            STARTUP.mark("screen_ready")
+            STARTUP.save(STARTUP_LOG_FILE)
+            if "--startup-timing" in sys.argv or os.getenv("LOTTERY_STARTUP_TIMING"):
+                print(STARTUP.report(), flush=True)
     
     def create_header(self):
         header_frame = QFrame()
@@ -86,9 +1074,8 @@ class LotteryApp(QMainWindow):
         
         # İnovel logosu (solda)
         inovel_logo_label = QLabel()
-        inovel_pixmap = QPixmap("inovellogo.png")
+        inovel_pixmap = load_scaled_pixmap("inovellogo.png", 80, 80)
         if not inovel_pixmap.isNull():
-            inovel_pixmap = inovel_pixmap.scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             inovel_logo_label.setPixmap(inovel_pixmap)
         else:
             logging.error("Inovel logo not found: inovellogo")
@@ -105,9 +1092,8 @@ class LotteryApp(QMainWindow):
         
         # DPU logosu (sağda)
         dpu_logo_label = QLabel()
-        dpu_pixmap = QPixmap("dpulogo.png")
+        dpu_pixmap = load_scaled_pixmap("dpulogo.png", 80, 80)
         if not dpu_pixmap.isNull():
-            dpu_pixmap = dpu_pixmap.scaled(80, 80, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             dpu_logo_label.setPixmap(dpu_pixmap)
         else:
             logging.error("DPU logo not found: dpulogo")
@@ -198,7 +1184,7 @@ class LotteryApp(QMainWindow):
     def setup_background(self, image_path, opacity=0.4):
         try:
             if not os.path.exists(image_path):
-                logging.error(f"Background image not found: {image_path}")
+                logging.error("Background image not found: %s", image_path)
                 # Varsayılan gradyan arka plan
                 self.setStyleSheet("""
                     QMainWindow {
@@ -210,25 +1196,13 @@ class LotteryApp(QMainWindow):
                 """)
                 return
             
-            background_image = QImage(image_path)
-            for y in range(background_image.height()):
-                for x in range(background_image.width()):
-                    color = QColor(background_image.pixelColor(x, y))
-                    color.setAlpha(int(255 * opacity))
-                    background_image.setPixelColor(x, y, color)
-            
-            pixmap = QPixmap.fromImage(background_image)
-            self.background_image = pixmap.scaled(self.width(), self.height(),
-                                                Qt.KeepAspectRatioByExpanding)
-            
-            palette = QPalette()
-            palette.setBrush(QPalette.Window, QBrush(self.background_image))
-            self.setPalette(palette)
-            self.setAutoFillBackground(True)
+            self.set_background_pixmap(load_background_pixmap(image_path, opacity, self.width(), self.height()))
+            self.background_size = (self.width(), self.height())
+            self.background_pool.start(BackgroundPyramidTask(image_path, opacity, self.background_signals))
             
-            logging.debug(f"Background loaded successfully: {image_path}")
+            logging.debug("Background loaded successfully: %s", image_path)
         except Exception as e:
-            logging.error(f"Background loading error: {str(e)}")
+            logging.error("Background loading error: %s", e)
             self.setStyleSheet("""
                 QMainWindow {
                     background: qlineargradient(
@@ -238,13 +1212,98 @@ class LotteryApp(QMainWindow):
                 }
             """)
     
+    def set_background_pixmap(self, pixmap):
+        self.background_image = pixmap
+        palette = QPalette()
+        palette.setBrush(QPalette.Window, QBrush(pixmap))
+        self.setPalette(palette)
+        self.setAutoFillBackground(True)
+    
+    def on_background_pyramid_ready(self, levels):
+        self.background_levels = levels
+        # Piramit kurulurken pencere boyutu değişmiş olabilir
+        if self.background_size != (self.width(), self.height()):
+            self.background_timer.start()
+    
+    # Boyutlandırma sırasında ölçekleme yapılmaz: gösterilen görüntü pencereyi örtmeye devam
+    # ediyorsa kırpılarak kalır, aksi halde örten hazır seviyeye geçilir. Seviyeler yalnızca
+    # ilk kullanımda QPixmap'e dönüştürülür.
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        if self.background_levels is None:
+            return
+        level = pick_background_level(self.background_levels, self.width(), self.height())
+        covers = self.background_image.width() >= self.width() and self.background_image.height() >= self.height()
+        if level != self.background_level or not covers:
+            if level not in self.background_pixmaps:
+                self.background_pixmaps[level] = QPixmap.fromImage(self.background_levels[level])
+            self.set_background_pixmap(self.background_pixmaps[level])
+            self.background_level = level
+            self.background_size = None
+        self.background_timer.start()
+    
+    def start_background_rescale(self):
+        size = (self.width(), self.height())
+        if self.background_levels is None or size == self.background_size:
+            return
+        # Eski boyutlar için sıradaki işler atılır; geç gelen sonuçlar nesil numarasıyla elenir
+        self.background_generation += 1
+        self.background_pool.clear()
+        level = pick_background_level(self.background_levels, *size)
+        self.background_request = (size, level)
+        self.background_pool.start(BackgroundRescaleTask(self.background_levels[level], *size,
+                                                         self.background_generation, self.background_signals))
+    
+    def on_background_rescaled(self, generation, image):
+        # Sonuç beklenirken pencere büyüdüyse gösterilmez; bekleyen zamanlayıcı yenisini ister
+        if generation != self.background_generation or image.width() < self.width() or image.height() < self.height():
+            return
+        self.set_background_pixmap(QPixmap.fromImage(image))
+        self.background_size, self.background_level = self.background_request
+    
+    # Çekiliş ekranı bırakılırken iş parçacıkları durdurulur, motorun günlüğü ve deposu kapatılır
+    def release_draw_screen(self):
+        if self.draw_screen is not None:
+            self.draw_screen.stop_workers()
+            if self.draw_screen.engine is not None:
+                self.draw_screen.engine.close()
+            self.draw_screen = None
+    
+    # Kapanışta devredilmiş dizin iş parçacıkları da beklenir; kesildikleri için kısa sürer
+    def shutdown(self):
+        self.release_draw_screen()
+        for worker in QApplication.instance().findChildren(NameIndexWorker):
+            worker.wait()
+    
     def open_choose_screen(self):
+        self.release_draw_screen()
         self.clear_content()
-        self.choose_screen = ModernChooseScreen(self.content_layout, self.open_draw_screen)
+        self.choose_screen = ModernChooseScreen(self.content_layout, self.open_draw_screen, self.show_events)
     
     def open_draw_screen(self):
+        if JSON_FILE is None:
+            self.open_choose_screen()
+            return
+        self.release_draw_screen()
         self.clear_content()
-        self.draw_screen = ModernDrawScreen(self.content_layout, self.open_choose_screen)
+        self.draw_screen = ModernDrawScreen(self.content_layout, self.open_choose_screen, self.show_events)
+    
+    # Etkinlikler arası geçiş: seçilen etkinliğin dizini etkinleşir ve ekranı yeniden açılır
+    def show_events(self):
+        dialog = EventsDialog(event_store(), CURRENT_EVENT)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        self.release_draw_screen()
+        if dialog.new_event:
+            activate_event(None)
+            self.open_choose_screen()
+            return
+        activate_event(dialog.selected)
+        if JSON_FILE.exists():
+            self.open_draw_screen()
+        else:
+            QMessageBox.warning(None, "Uyarı", f"'{dialog.selected['title']}' etkinliğinin listesi bulunamadı.")
+            self.open_choose_screen()
     
     def clear_content(self):
         while self.content_layout.count():
@@ -262,10 +1321,15 @@ class LotteryApp(QMainWindow):
 
 
 class ModernChooseScreen:
-    def __init__(self, layout, on_done):
+    def __init__(self, layout, on_done, on_events=None):
         self.layout = layout
         self.on_done = on_done
-        self.lotteries = []
+        self.on_events = on_events
+        self.draw_model = DrawTableModel(new_draw() for _ in range(3))
+        self.imported_names = []
+        self.imported_weights = {}
+        self.imported_attributes = {}
+        self.import_worker = None
         self.create_widgets()
     
     def create_widgets(self):
@@ -287,25 +1351,63 @@ class ModernChooseScreen:
         main_layout.setSpacing(15)
         main_layout.setContentsMargins(20, 20, 20, 20)
         
-        scroll_area = QScrollArea()
-        scroll_area.setWidgetResizable(True)
-        scroll_widget = QWidget()
-        self.entries_layout = QVBoxLayout(scroll_widget)
-        self.entries_layout.setSpacing(10)
-        self.entries_layout.setContentsMargins(10, 10, 10, 10)
-        scroll_area.setWidget(scroll_widget)
-        main_layout.addWidget(scroll_area, stretch=1)
-        
-        for _ in range(3):
-            self.add_lottery_entry()
+        event_layout = QHBoxLayout()
+        event_label = QLabel("Etkinlik Adı")
+        event_label.setStyleSheet("color: #FFFFFF; font-size: 14px;")
+        event_layout.addWidget(event_label)
+        self.event_title_entry = QLineEdit()
+        self.event_title_entry.setText(f"Çekiliş {time.strftime('%d.%m.%Y %H:%M')}")
+        event_layout.addWidget(self.event_title_entry, stretch=1)
+        if self.on_events is not None:
+            events_button = QPushButton("ETKİNLİKLER")
+            events_button.setIcon(QIcon.fromTheme("document-open-recent"))
+            events_button.clicked.connect(self.on_events)
+            event_layout.addWidget(events_button)
+        main_layout.addLayout(event_layout)
+        
+        # Satırlar tek bir tablo görünümünde; yüzlerce çekiliş de olsa yalnızca görünenler çizilir
+        self.draw_view = QTableView()
+        self.draw_view.setModel(self.draw_model)
+        self.draw_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.draw_view.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed |
+                                       QAbstractItemView.AnyKeyPressed)
+        self.draw_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.draw_view.verticalHeader().setDefaultSectionSize(36)
+        header = self.draw_view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header.setSectionResizeMode(0, QHeaderView.Stretch)
+        self.draw_view.doubleClicked.connect(self.on_draw_double_clicked)
+        paste_action = QAction("Yapıştır", self.draw_view)
+        paste_action.setShortcut(QKeySequence.Paste)
+        paste_action.setShortcutContext(Qt.WidgetShortcut)
+        paste_action.triggered.connect(self.paste_draws)
+        self.draw_view.addAction(paste_action)
+        main_layout.addWidget(self.draw_view, stretch=1)
         
         buttons_layout = QVBoxLayout()
         buttons_layout.setSpacing(15)
         
+        rows_layout = QHBoxLayout()
         add_button = QPushButton("Yeni Çekiliş Satırı Ekle")
         add_button.setIcon(QIcon.fromTheme("list-add"))
         add_button.clicked.connect(self.add_lottery_entry)
-        buttons_layout.addWidget(add_button)
+        rows_layout.addWidget(add_button)
+        
+        rules_button = QPushButton("Kurallar")
+        rules_button.setIcon(QIcon.fromTheme("preferences-system"))
+        rules_button.clicked.connect(lambda: self.edit_rules(self.draw_view.currentIndex().row()))
+        rows_layout.addWidget(rules_button)
+        
+        delete_button = QPushButton("Seçili Satırları Sil")
+        delete_button.setIcon(QIcon.fromTheme("edit-delete"))
+        delete_button.clicked.connect(self.delete_selected_entries)
+        rows_layout.addWidget(delete_button)
+        
+        import_draws_button = QPushButton("Çekilişleri İçe Aktar (CSV)")
+        import_draws_button.setIcon(QIcon.fromTheme("document-open"))
+        import_draws_button.clicked.connect(self.import_draws_file)
+        rows_layout.addWidget(import_draws_button)
+        buttons_layout.addLayout(rows_layout)
         
         names_frame = QFrame()
         names_layout = QVBoxLayout(names_frame)
@@ -326,6 +1428,16 @@ class ModernChooseScreen:
         sample_data_button.clicked.connect(self.add_sample_data)
         names_layout.addWidget(sample_data_button)
         
+        import_button = QPushButton("Dosyadan İçe Aktar (TXT/CSV)")
+        import_button.setIcon(QIcon.fromTheme("document-open"))
+        import_button.clicked.connect(self.import_names_file)
+        names_layout.addWidget(import_button)
+        
+        self.import_label = QLabel()
+        self.import_label.setStyleSheet("color: #BBBBBB; font-size: 14px;")
+        self.import_label.hide()
+        names_layout.addWidget(self.import_label)
+        
         buttons_layout.addWidget(names_frame)
         
         save_button = QPushButton("Kaydet ve Çekilişe Başla")
@@ -338,64 +1450,69 @@ class ModernChooseScreen:
         self.layout.addWidget(main_frame, stretch=2)
     
     def add_lottery_entry(self):
-        frame = QFrame()
-        layout = QHBoxLayout(frame)
-        layout.setContentsMargins(10, 10, 10, 10)
-        layout.setSpacing(10)
-        
-        title_entry = QLineEdit()
-        title_entry.setText("Çekiliş Başlığı")
-        title_entry.setPlaceholderText("Çekiliş başlığını girin")
-        layout.addWidget(title_entry, stretch=3)
-        
-        main_count = QSpinBox()
-        main_count.setMinimum(1)
-        main_count.setMaximum(100)
-        main_count.setValue(3)
-        layout.addWidget(main_count, stretch=1)
-        
-        main_label = QLabel("Ana")
-        main_label.setStyleSheet("color: #FFFFFF; font-size: 14px;")
-        layout.addWidget(main_label)
-        
-        backup_count = QSpinBox()
-        backup_count.setMinimum(0)
-        backup_count.setMaximum(100)
-        backup_count.setValue(2)
-        layout.addWidget(backup_count, stretch=1)
-        
-        backup_label = QLabel("Yedek")
-        backup_label.setStyleSheet("color: #FFFFFF; font-size: 14px;")
-        layout.addWidget(backup_label)
-        
-        delete_button = QPushButton("Sil")
-        delete_button.setIcon(QIcon.fromTheme("edit-delete"))
-        delete_button.setFixedWidth(80)
-        delete_button.clicked.connect(lambda: self.delete_lottery_entry(frame, title_entry, main_count, backup_count))
-        layout.addWidget(delete_button)
-        
-        self.entries_layout.addWidget(frame)
-        
-        self.lotteries.append({
-            'frame': frame,
-            'title_entry': title_entry,
-            'main_count': main_count,
-            'backup_count': backup_count
-        })
+        self.draw_model.append_draws([new_draw()])
+        row = self.draw_model.rowCount() - 1
+        self.draw_view.scrollToBottom()
+        self.draw_view.setCurrentIndex(self.draw_model.index(row, 0))
+    
+    def on_draw_double_clicked(self, index):
+        if DrawTableModel.COLUMNS[index.column()][0] == "rules":
+            self.edit_rules(index.row())
+    
+    def edit_rules(self, row):
+        if not 0 <= row < self.draw_model.rowCount():
+            QMessageBox.warning(None, "Uyarı", "Önce bir çekiliş satırı seçin.")
+            return
+        draw = self.draw_model.draws[row]
+        attribute_names = sorted({attribute for values in self.imported_attributes.values() for attribute in values})
+        dialog = DrawRulesDialog(draw['rules'], attribute_names, draw['title'], draw['main_count'])
+        if dialog.exec_() == QDialog.Accepted:
+            self.draw_model.set_rules(row, dialog.rules)
     
-    def delete_lottery_entry(self, frame, title_entry, main_count, backup_count):
-        if len(self.lotteries) <= 1:
+    def delete_selected_entries(self):
+        rows = [index.row() for index in self.draw_view.selectionModel().selectedRows()]
+        if not rows and self.draw_view.currentIndex().isValid():
+            rows = [self.draw_view.currentIndex().row()]
+        self.delete_lottery_entries(rows)
+    
+    def delete_lottery_entries(self, rows):
+        rows = set(rows)
+        if not rows:
+            return
+        if len(rows) >= self.draw_model.rowCount():
             QMessageBox.warning(None, "Uyarı", "En az bir çekiliş satırı kalmalı!")
             return
-        
-        for item in self.lotteries:
-            if item['frame'] == frame:
-                self.lotteries.remove(item)
-                break
-        
-        frame.deleteLater()
-        self.entries_layout.removeWidget(frame)
-        logging.debug("Lottery entry deleted successfully")
+        self.draw_model.remove_rows(rows)
+        logging.debug("%d lottery entries deleted", len(rows))
+    
+    # Elektronik tablodan kopyalanan ya da dosyadan okunan satırlar tek seferde eklenir
+    def append_draw_text(self, text):
+        try:
+            draws = parse_draw_rows(text)
+        except ValueError as e:
+            QMessageBox.warning(None, "Uyarı", f"Çekiliş satırları okunamadı: {e}")
+            return 0
+        self.draw_model.append_draws(draws)
+        logging.debug("%d lottery entries appended", len(draws))
+        return len(draws)
+    
+    def paste_draws(self):
+        self.append_draw_text(QApplication.clipboard().text())
+    
+    def import_draws_file(self):
+        path, _ = QFileDialog.getOpenFileName(None, "Çekiliş Dosyası Seç", "",
+                                              "Çekiliş dosyaları (*.csv *.tsv *.txt);;Tüm dosyalar (*)")
+        if not path:
+            return
+        try:
+            with open(path, encoding="utf-8-sig") as file:
+                text = file.read()
+        except (OSError, UnicodeDecodeError) as e:
+            QMessageBox.critical(None, "Hata", f"Dosya okunamadı: {e}")
+            return
+        count = self.append_draw_text(text)
+        if count:
+            QMessageBox.information(None, "Başarılı", f"{count} çekiliş satırı eklendi.")
     
     def add_sample_data(self):
         sample_names = """Ahmet Yılmaz
@@ -414,35 +1531,103 @@ Hatice Yalçın
 Elif Güneş
 Murat Çetin"""
         self.name_entry.setText(sample_names)
+    
+    def import_names_file(self):
+        path, _ = QFileDialog.getOpenFileName(None, "İsim Dosyası Seç", "",
+                                              "İsim dosyaları (*.txt *.csv);;Tüm dosyalar (*)")
+        if not path:
+            return
+        
+        logging.debug("Importing names from: %s", path)
+        self.import_progress = QProgressDialog("İsimler içe aktarılıyor...", "İptal", 0, 100)
+        self.import_progress.setWindowTitle("İçe Aktar")
+        self.import_progress.setWindowModality(Qt.ApplicationModal)
+        self.import_progress.setMinimumDuration(0)
+        
+        self.import_worker = NameImportWorker(path)
+        self.import_worker.progress.connect(self.import_progress.setValue)
+        self.import_worker.imported.connect(self.on_names_imported)
+        self.import_worker.failed.connect(self.on_import_failed)
+        self.import_worker.finished.connect(self.import_progress.close)
+        self.import_progress.canceled.connect(self.import_worker.requestInterruption)
+        self.import_worker.start()
+    
+    def on_names_imported(self, unique_names, duplicate_names, weights, attributes):
+        self.imported_names = unique_names
+        self.imported_weights = weights
+        self.imported_attributes = attributes
+        logging.debug("Imported %d names", len(unique_names))
+        text = f"Dosyadan {len(unique_names)} isim içe aktarıldı."
+        if weights:
+            text += f" {len(weights)} kişi birden fazla bilete sahip."
+        if attributes:
+            columns = sorted({attribute for values in attributes.values() for attribute in values})
+            text += f" Öznitelikler: {', '.join(columns)}."
+        self.import_label.setText(text)
+        self.import_label.show()
+        self.show_duplicate_report(duplicate_names)
+    
+    def on_import_failed(self, message):
+        QMessageBox.critical(None, "Hata", f"Dosya içe aktarılırken hata oluştu: {message}")
 
     def save_and_exit(self):
         try:
-            logging.debug(f"Saving JSON to: {JSON_FILE}")
             final_data = []
-            for item in self.lotteries:
-                title = item['title_entry'].text().strip()
-                main_count = item['main_count'].value()
-                backup_count = item['backup_count'].value()
+            for item in self.draw_model.draws:
+                title = item['title'].strip()
                 if not title:
                     QMessageBox.critical(None, "Hata", "Başlık boş bırakılamaz!")
                     return
-                final_data.append({
+                draw = {
                     'title': title,
-                    'main_count': main_count,
-                    'backup_count': backup_count
-                })
+                    'main_count': item['main_count'],
+                    'backup_count': item['backup_count'],
+                    **item['rules']
+                }
+                # Ana talihli sayısı kurallar girildikten sonra değişmiş olabilir
+                try:
+                    parse_constraints(draw)
+                except ConstraintError as e:
+                    QMessageBox.critical(None, "Hata", f"Çekiliş kuralları geçersiz: {e}")
+                    return
+                final_data.append(draw)
             
             names_text = self.name_entry.toPlainText().strip()
-            if not names_text:
+            if not names_text and not self.imported_names:
                 QMessageBox.critical(None, "Hata", "İsim listesi boş olamaz!")
                 return
             
-            name_list = self.parse_names(names_text)
+            if not names_text:
+                name_list = self.imported_names
+            else:
+                name_list = self.parse_names(names_text, self.imported_names)
             if not name_list:
                 QMessageBox.critical(None, "Hata", "İsim listesi boş veya hatalı.")
                 return
             
-            full_data = {'names': name_list, 'draws': final_data}
+            # Her kayıt yeni bir etkinlik açar; liste, günlük ve depo etkinliğin kendi dizinine yazılır
+            event_title = self.event_title_entry.text().strip() or f"Çekiliş {time.strftime('%d.%m.%Y %H:%M')}"
+            activate_event(event_store().create_event(event_title, final_data, len(name_list)))
+            logging.debug("Saving JSON to: %s", JSON_FILE)
+            audit("event_created", event=CURRENT_EVENT['id'], title=event_title, participants=len(name_list),
+                  draws=len(final_data))
+            # Çekilişler ve ağırlıklar isimlerden önce yazılır; çekiliş ekranı isimler
+            # okunurken kullanılabilir hale gelir
+            full_data = {'draws': final_data}
+            if self.imported_weights:
+                # Tekrar olarak elenen yazımların ağırlıkları kaydedilmez
+                kept_names = set(name_list)
+                full_data['weights'] = {name: weight for name, weight in self.imported_weights.items()
+                                        if name in kept_names}
+            if self.imported_attributes:
+                kept_names = set(name_list)
+                full_data['attributes'] = {name: values for name, values in self.imported_attributes.items()
+                                           if name in kept_names}
+            if len(name_list) > STORE_THRESHOLD:
+                write_store(name_list, STORE_FILE)
+                full_data['names_store'] = STORE_FILE.name
+            else:
+                full_data['names'] = name_list
             with open(JSON_FILE, "w", encoding="utf-8") as file:
                 json.dump(full_data, file, ensure_ascii=False, indent=4)
             
@@ -450,59 +1635,160 @@ Murat Çetin"""
             QMessageBox.information(None, "Başarılı", f"Çekiliş listesi kaydedildi! Toplam {len(name_list)} isim eklendi.")
             self.on_done()
         except Exception as e:
-            logging.error(f"Error saving JSON: {str(e)}")
+            logging.error("Error saving JSON: %s", e)
             QMessageBox.critical(None, "Hata", f"JSON kaydedilirken hata oluştu: {str(e)}")
     
-    def parse_names(self, text):
-        names = []
-        lines = text.strip().split('\n')
-        for line in lines:
-            name = line.strip()
-            if name:
-                names.append(name)
-        
-        unique_names = []
-        duplicate_names = []
-        for name in names:
-            if name not in unique_names:
-                unique_names.append(name)
-            else:
-                duplicate_names.append(name)
+    def parse_names(self, text, imported_names=()):
+        names = (line.strip() for line in text.splitlines())
+        unique_names, duplicate_names = dedupe_names(
+            itertools.chain(imported_names, (name for name in names if name)))
+        self.show_duplicate_report(duplicate_names)
         
+        return unique_names if unique_names else None
+    
+    def show_duplicate_report(self, duplicate_names):
         if duplicate_names:
             message = f"Dikkat: {len(duplicate_names)} tekrar eden isim bulundu ve listeden çıkarıldı:\n"
             message += ", ".join(duplicate_names[:5])
             if len(duplicate_names) > 5:
                 message += f" ve {len(duplicate_names)-5} isim daha."
             QMessageBox.information(None, "Tekrar Eden İsimler Kaldırıldı", message)
-    
-        return unique_names if unique_names else None
 
 
 class ModernDrawScreen:
-    def __init__(self, layout, on_reset):
+    def __init__(self, layout, on_reset, on_events=None):
         self.layout = layout
         self.on_reset = on_reset
+        self.on_events = on_events
+        self.engine = None
+        self.loading = True
+        self.stopped = False
+        self.name_index = None
+        self.index_worker = None
+        self.export_worker = None
+        self.animator = DrawAnimator()
+        self.animator.tick.connect(self.update_countdown)
+        self.animator.done.connect(self.perform_draw)
         self.load_data()
+    
+    def load_data(self):
+        logging.debug("Loading JSON from: %s", JSON_FILE)
+        self.load_progress = QProgressBar()
+        self.load_progress.setFormat("Liste yükleniyor... %p%")
+        self.layout.addWidget(self.load_progress)
+        
+        # Gelen isim grupları her zamanlayıcı adımında bir tane eklenir; böylece
+        # gruplar arasında arayüz çizilebilir
+        self.pending_names = collections.deque()
+        self.names_timer = QTimer()
+        self.names_timer.timeout.connect(self.add_pending_names)
+        self.all_names_received = False
+        
+        self.load_worker = DataLoadWorker(JSON_FILE)
+        self.load_worker.progress.connect(self.load_progress.setValue)
+        self.load_worker.header_loaded.connect(self.on_header_loaded)
+        self.load_worker.names_loaded.connect(self.on_names_loaded)
+        self.load_worker.weights_loaded.connect(self.on_weights_loaded)
+        self.load_worker.attributes_loaded.connect(self.on_attributes_loaded)
+        self.load_worker.loaded.connect(self.on_data_loaded)
+        self.load_worker.failed.connect(self.on_load_failed)
+        self.load_worker.start()
+    
+    # Çekiliş tanımları geldiğinde ekran kurulur; isimler gelmeye devam ederken
+    # gezinme ve sonuçlar kullanılabilir, çekiliş ise yükleme bitince açılır
+    def on_header_loaded(self, header):
+        if self.stopped:
+            return
+        self.engine = DrawEngine(header['names'] or [], header['draws'], weights=header['weights'],
+                                 attributes=header['attributes'])
+        if header['names'] is None:
+            self.engine.begin_loading()
+        if CURRENT_EVENT is not None:
+            self.engine.audit_context = {'event': CURRENT_EVENT['id']}
+        self.engine.attach_journal(DrawJournal(JSON_FILE))
         self.create_widgets()
-        self.current_index = 0
-        self.winners_history = {}
+        self.animator.frame.connect(self.rolling_names.set_elapsed)
         self.update_draw_info()
-        self.countdown_thread = None
     
-    def load_data(self):
-        try:
-            logging.debug(f"Loading JSON from: {JSON_FILE}")
-            with open(JSON_FILE, "r", encoding="utf-8") as file:
-                data = json.load(file)
-                self.original_names = data["names"]
-                self.names = data["names"].copy()
-                self.draws = data["draws"]
-            logging.debug("JSON loaded successfully")
-        except Exception as e:
-            logging.error(f"Error loading JSON: {str(e)}")
-            QMessageBox.critical(None, "Hata", f"JSON dosyası yüklenirken hata oluştu: {str(e)}")
-            raise
+    def on_names_loaded(self, names):
+        if self.stopped:
+            return
+        self.pending_names.append(names)
+        if not self.names_timer.isActive():
+            self.names_timer.start(0)
+    
+    def on_weights_loaded(self, weights):
+        if self.stopped:
+            return
+        self.engine.set_weights(weights)
+    
+    def on_attributes_loaded(self, attributes):
+        if self.stopped:
+            return
+        self.engine.set_attributes(attributes)
+    
+    def add_pending_names(self):
+        if self.pending_names:
+            self.engine.add_names(self.pending_names.popleft())
+            self.update_remaining_label()
+        if not self.pending_names:
+            self.names_timer.stop()
+            if self.all_names_received:
+                self.finish_loading()
+    
+    def on_data_loaded(self):
+        if self.stopped:
+            return
+        self.all_names_received = True
+        if not self.pending_names:
+            self.finish_loading()
+    
+    def finish_loading(self):
+        self.engine.finish_loading()
+        self.loading = False
+        self.load_progress.hide()
+        logging.debug("JSON loaded successfully")
+        # Veritabanı bir önceki oturumda günlüğün gerisinde kalmış olabilir
+        self.record_results()
+        self.start_name_index()
+        self.update_draw_info()
+    
+    def on_load_failed(self, message):
+        if self.stopped:
+            return
+        self.loading = False
+        self.load_progress.hide()
+        QMessageBox.critical(None, "Hata", f"JSON dosyası yüklenirken hata oluştu: {message}")
+    
+    def start_name_index(self):
+        names = self.engine.names
+        if isinstance(names, MappedNamePool):
+            # Depodaki isimler değişmez; çıkarılanlar arama sırasında elenir
+            store = names.store
+            source = (store.name(name_id) for name_id in range(store.count))
+        else:
+            source = names.to_list()
+        self.index_worker = NameIndexWorker(source)
+        self.index_worker.ready.connect(self.on_name_index_ready)
+        self.index_worker.start()
+    
+    def on_name_index_ready(self, name_index):
+        if self.stopped:
+            return
+        self.name_index = name_index
+    
+    def stop_workers(self):
+        for worker in (self.load_worker, self.export_worker):
+            if worker is not None:
+                worker.requestInterruption()
+                worker.wait()
+        if self.index_worker is not None:
+            self.index_worker.retire()
+            self.index_worker = None
+        # Kuyrukta bekleyen sinyaller ekran kaldırıldıktan sonra işlenmesin
+        self.stopped = True
+        self.names_timer.stop()
+        self.pending_names.clear()
     
     def create_widgets(self):
         main_frame = QFrame()
@@ -528,6 +1814,31 @@ class ModernDrawScreen:
         self.start_button.clicked.connect(self.start_draw)
         main_layout.addWidget(self.start_button)
         
+        animation_layout = QHBoxLayout()
+        animation_layout.setSpacing(15)
+        
+        countdown_text = QLabel("Geri sayım (sn):")
+        countdown_text.setStyleSheet("color: #FFFFFF; font-size: 14px; background: transparent;")
+        animation_layout.addWidget(countdown_text)
+        
+        self.countdown_spin = QSpinBox()
+        self.countdown_spin.setMinimum(0)
+        self.countdown_spin.setMaximum(30)
+        self.countdown_spin.setValue(3)
+        animation_layout.addWidget(self.countdown_spin)
+        
+        self.skip_animation_check = QCheckBox("Animasyonu atla (art arda çekiliş)")
+        animation_layout.addWidget(self.skip_animation_check)
+        animation_layout.addStretch()
+        
+        self.skip_button = QPushButton("ATLA")
+        self.skip_button.setIcon(QIcon.fromTheme("media-skip-forward"))
+        self.skip_button.clicked.connect(self.animator.finish_now)
+        self.skip_button.hide()
+        animation_layout.addWidget(self.skip_button)
+        
+        main_layout.addLayout(animation_layout)
+        
         self.countdown_label = QLabel()
         self.countdown_label.setFont(QFont("Segoe UI", 72, QFont.Bold))
         self.countdown_label.setAlignment(Qt.AlignCenter)
@@ -535,6 +1846,10 @@ class ModernDrawScreen:
         self.countdown_label.setMinimumHeight(100)
         main_layout.addWidget(self.countdown_label)
         
+        self.rolling_names = RollingNamesWidget()
+        self.rolling_names.hide()
+        main_layout.addWidget(self.rolling_names)
+        
         result_frame = QFrame()
         result_layout = QVBoxLayout(result_frame)
         result_layout.setContentsMargins(15, 15, 15, 15)
@@ -578,12 +1893,31 @@ class ModernDrawScreen:
         self.show_names_button.clicked.connect(self.show_names)
         bottom_button_layout.addWidget(self.show_names_button)
         
-        self.back_button = QPushButton("ÖNCEKİ ÇEKİLİŞE DÖN")
-        self.back_button.setIcon(QIcon.fromTheme("go-previous"))
-        self.back_button.clicked.connect(self.go_back)
+        self.back_button = QPushButton("GERİ AL")
+        self.back_button.setIcon(QIcon.fromTheme("edit-undo"))
+        self.back_button.setShortcut(QKeySequence.Undo)
+        self.back_button.clicked.connect(self.undo)
         self.back_button.setEnabled(False)
         bottom_button_layout.addWidget(self.back_button)
         
+        self.redo_button = QPushButton("YİNELE")
+        self.redo_button.setIcon(QIcon.fromTheme("edit-redo"))
+        self.redo_button.setShortcut(QKeySequence.Redo)
+        self.redo_button.clicked.connect(self.redo)
+        self.redo_button.setEnabled(False)
+        bottom_button_layout.addWidget(self.redo_button)
+        
+        self.export_button = QPushButton("SONUÇLARI DIŞA AKTAR")
+        self.export_button.setIcon(QIcon.fromTheme("document-save"))
+        self.export_button.clicked.connect(self.export_results)
+        bottom_button_layout.addWidget(self.export_button)
+        
+        if self.on_events is not None:
+            self.events_button = QPushButton("ETKİNLİKLER")
+            self.events_button.setIcon(QIcon.fromTheme("document-open-recent"))
+            self.events_button.clicked.connect(self.on_events)
+            bottom_button_layout.addWidget(self.events_button)
+        
         self.reset_button = QPushButton("ÇEKİLİŞİ SIFIRLA")
         self.reset_button.setIcon(QIcon.fromTheme("view-refresh"))
         self.reset_button.clicked.connect(self.reset_lottery)
@@ -591,42 +1925,84 @@ class ModernDrawScreen:
         
         main_layout.addLayout(bottom_button_layout)
         
+        if BROADCAST is not None:
+            broadcast_label = QLabel(f"Seyirci ekranı: http://{socket.gethostname()}:{BROADCAST.port}/")
+            broadcast_label.setAlignment(Qt.AlignCenter)
+            broadcast_label.setStyleSheet("color: #BBBBBB; background: transparent;")
+            main_layout.addWidget(broadcast_label)
+        
         self.layout.addWidget(main_frame)
         self.update_remaining_label()
     
     def remove_specific_name(self):
-        name, ok = QInputDialog.getText(None, 'İsim Çıkar', 'Listeden çıkarılacak ismi girin:')
-        if ok and name:
-            if name in self.names:
-                self.names.remove(name)
-                QMessageBox.information(None, "Başarılı", f"'{name}' ismi listeden çıkarıldı!")
-                self.update_remaining_label()
+        dialog = RemoveNamesDialog(self.engine.names, self.name_index)
+        index_worker = self.index_worker if self.name_index is None else None
+        if index_worker is not None:
+            index_worker.ready.connect(dialog.set_index)
+        accepted = dialog.exec_() == QDialog.Accepted
+        # Diyalog açıkken ekran kapanırsa iş parçacığının sinyalleri zaten koparılmıştır
+        if index_worker is not None and self.index_worker is index_worker:
+            index_worker.ready.disconnect(dialog.set_index)
+        
+        if accepted and dialog.pending:
+            removed = self.engine.remove_names(dialog.pending)
+            if len(removed) == 1:
+                QMessageBox.information(None, "Başarılı", f"'{removed[0]}' ismi listeden çıkarıldı!")
             else:
-                QMessageBox.warning(None, "Uyarı", f"'{name}' ismi listede bulunamadı!")
+                QMessageBox.information(None, "Başarılı", f"{len(removed)} isim listeden çıkarıldı!")
+            self.update_remaining_label()
+            self.update_history_buttons()
+            self.record_results()
+    
+    # Etkinlik veritabanı günlükten türetilir; her adımdan sonra motorun durumu yazılır.
+    # Yükleme sürerken çıkarmalar beklediğinden yazım yükleme bitince yapılır.
+    def record_results(self):
+        if CURRENT_EVENT is None or self.loading:
+            return
+        event_store().record_results(CURRENT_EVENT['id'], self.engine.results(), self.engine.removed_names)
+    
+    # Talihlilerden önceki etkinliklerde de ana talihli olanlar; isim başına dizinden aranır
+    def recent_winners_text(self, winners):
+        if CURRENT_EVENT is None or RECENT_EVENTS <= 0:
+            return ""
+        recent = event_store().recent_winners(winners['main'] + winners['backup'], RECENT_EVENTS,
+                                              before=CURRENT_EVENT['id'])
+        if not recent:
+            return ""
+        return f"<br><br><i>Son {RECENT_EVENTS} etkinlikte de kazananlar:</i> " + " - ".join(recent)
+    
+    def broadcast(self, message):
+        if BROADCAST is not None:
+            BROADCAST.publish(message)
     
     def update_remaining_label(self):
-        self.remaining_label.setText(f"Kalan Katılımcı Sayısı: {len(self.names)}")
+        text = f"Kalan Katılımcı Sayısı: {len(self.engine.names)}"
+        if self.loading:
+            text += " (yükleniyor...)"
+        self.remaining_label.setText(text)
     
     def update_draw_info(self):
-        if self.current_index >= len(self.draws):
+        self.cancel_animation()
+        if self.engine.is_finished:
             QMessageBox.information(None, "Bitti", "Tüm çekilişler tamamlandı.")
             QApplication.quit()
             return
         
-        draw = self.draws[self.current_index]
+        draw = self.engine.current_draw
         self.title_label.setText(draw["title"])
         
-        if self.current_index in self.winners_history:
-            winners = self.winners_history[self.current_index]
+        winners = self.engine.current_winners
+        self.broadcast({'type': "draw", 'index': self.engine.current_index, 'total': len(self.engine.draws),
+                        'title': draw["title"], 'winners': winners})
+        if winners:
             
             # Ana talihlileri yan yana göster
             result_text = "<b>Ana Talihliler:</b> " + " - ".join(winners['main'])            
             # Yedek talihliler varsa, onları da yan yana göster
             if winners['backup']:
                 result_text += "<br><br><b>Yedek Talihliler:</b> " + " - ".join(winners['backup'])            
+            result_text += self.recent_winners_text(winners)
             self.result_label.setText(result_text)
-            self.main_winners = winners['main']
-            self.backup_winners = winners['backup']
             
             self.only_main_button.setEnabled(True)
             self.all_button.setEnabled(True)
@@ -639,44 +2015,59 @@ class ModernDrawScreen:
             self.only_main_button.setEnabled(False)
             self.all_button.setEnabled(False)
         
-        self.back_button.setEnabled(self.current_index > 0)
+        # Havuz tamamlanmadan çekiliş yapılamaz ve isim listesi değişmeye devam eder
+        for button in (self.start_button, self.remove_name_button, self.show_names_button):
+            button.setEnabled(not self.loading)
+        self.update_history_buttons()
         self.update_remaining_label()
     
+    def update_history_buttons(self):
+        self.back_button.setEnabled(self.engine.can_undo and not self.loading)
+        self.redo_button.setEnabled(self.engine.can_redo and not self.loading)
+    
     def start_draw(self):
-        draw = self.draws[self.current_index]
-        total_needed = draw["main_count"] + draw["backup_count"]
-        if len(self.names) < total_needed:
+        if not self.engine.has_enough_participants():
             QMessageBox.critical(None, "Hata", "Yeterli katılımcı kalmadı!")
             return
         
         self.start_button.setEnabled(False)
         
-        self.countdown_thread = CountdownThread()
-        self.countdown_thread.signal.connect(self.update_countdown)
-        self.countdown_thread.finished.connect(self.perform_draw)
-        self.countdown_thread.start()
+        seconds = 0 if self.skip_animation_check.isChecked() else self.countdown_spin.value()
+        if seconds > 0:
+            # Akış yalnızca gösterim içindir; çekiliş üretecinin durumunu değiştirmemesi için
+            # ayrı bir rastgele kaynak kullanılır
+            pool = self.engine.names
+            positions = random.sample(range(len(pool)), min(40, len(pool)))
+            self.rolling_names.set_names([pool[position] for position in positions])
+            self.rolling_names.show()
+            self.skip_button.show()
+        self.animator.start(seconds)
     
     def update_countdown(self, number):
         self.countdown_label.setText(str(number))
+        self.broadcast({'type': "countdown", 'value': number})
     
     def perform_draw(self):
-        draw = self.draws[self.current_index]
-        total_needed = draw["main_count"] + draw["backup_count"]
-        selected_names = random.sample(self.names, total_needed)
-        
-        self.main_winners = selected_names[:draw["main_count"]]
-        self.backup_winners = selected_names[draw["main_count"]:]
-        
-        self.winners_history[self.current_index] = {
-            'main': self.main_winners.copy(),
-            'backup': self.backup_winners.copy()
-        }
+        self.rolling_names.hide()
+        self.skip_button.hide()
+        try:
+            winners = self.engine.draw()
+        except InsufficientParticipantsError as e:
+            # Kurallar (kota, üst sınır, dışlama) kalan katılımcılarla karşılanamıyor
+            logging.warning(str(e))
+            self.countdown_label.setText("")
+            QMessageBox.critical(None, "Hata", f"Çekiliş kuralları kalan katılımcılarla karşılanamıyor:\n{e}")
+            self.start_button.setEnabled(True)
+            return
+        self.broadcast({'type': "winners", 'index': self.engine.current_index, **winners})
         
         # Ana talihlileri yan yana, - ayrılmış şekilde göster
-        result_text = "<b>Ana Talihliler:</b> " + " - ".join(self.main_winners)        
+        result_text = "<b>Ana Talihliler:</b> " + " - ".join(winners['main'])        
         # Yedek talihliler varsa, onları da yan yana göster
-        if self.backup_winners:
-            result_text += "<br><br><b>Yedek Talihliler:</b> " + " - ".join(self.backup_winners)
+        if winners['backup']:
+            result_text += "<br><br><b>Yedek Talihliler:</b> " + " - ".join(winners['backup'])
+        result_text += self.recent_winners_text(winners)
+        self.record_results()
         
         self.countdown_label.setText("")
         self.result_label.setText(result_text)
@@ -686,73 +2077,135 @@ class ModernDrawScreen:
         
         self.start_button.setText("TEKRAR ÇEK")
         self.start_button.setEnabled(True)
+        self.update_history_buttons()
     
     def remove_main_and_next(self):
-        for name in self.main_winners:
-            if name in self.names:
-                self.names.remove(name)
-        
-        self.current_index += 1
+        self.engine.remove_main_and_next()
+        self.record_results()
         self.update_draw_info()
     
     def remove_all_and_next(self):
-        for name in self.main_winners + self.backup_winners:
-            if name in self.names:
-                self.names.remove(name)
-        
-        self.current_index += 1
+        self.engine.remove_all_and_next()
+        self.record_results()
         self.update_draw_info()
     
-    def go_back(self):
-        if self.current_index > 0:
-            self.current_index -= 1
+    def cancel_animation(self):
+        self.animator.cancel()
+        self.rolling_names.hide()
+        self.skip_button.hide()
+    
+    # Son adım (çekiliş, çıkarma ve geçiş ya da isim çıkarma) havuzla birlikte geri alınır
+    def undo(self):
+        if self.engine.undo():
             self.countdown_label.setText("")
-            self.result_label.setText("")
-            self.only_main_button.setEnabled(False)
-            self.all_button.setEnabled(False)
-            self.start_button.setText("ÇEKİLİŞİ BAŞLAT")
-            self.start_button.setEnabled(True)
+            self.record_results()
             self.update_draw_info()
-            self.update_remaining_label()
     
-    def show_names(self):
-        names_dialog = QMessageBox()
-        names_dialog.setWindowTitle("Katılımcı Listesi")
-        
-        names_text = ""
-        for i, name in enumerate(self.names):
-            names_text += name
-            if (i + 1) % 3 == 0:
-                names_text += "\n"
-            else:
-                names_text += " | "
+    def redo(self):
+        if self.engine.redo():
+            self.countdown_label.setText("")
+            self.record_results()
+            self.update_draw_info()
+    
+    def export_results(self):
+        if self.export_worker is not None and self.export_worker.isRunning():
+            self.export_progress.show()
+            return
+        output_dir = QFileDialog.getExistingDirectory(None, "Dışa Aktarma Dizini Seç")
+        if not output_dir:
+            return
         
-        names_dialog.setText(f"Toplam {len(self.names)} katılımcı:\n\n{names_text}")
-        names_dialog.setStandardButtons(QMessageBox.Ok)
+        question = QMessageBox()
+        question.setWindowTitle("Sertifikalar")
+        question.setText("Talihliler için sertifika oluşturulsun mu?")
+        formats = {
+            question.addButton("PDF", QMessageBox.AcceptRole): "pdf",
+            question.addButton("JPEG", QMessageBox.AcceptRole): "jpg",
+            question.addButton("PNG", QMessageBox.AcceptRole): "png",
+            question.addButton("Yalnızca Raporlar", QMessageBox.RejectRole): None,
+        }
+        question.exec_()
+        certificate_format = formats.get(question.clickedButton())
+        
+        # İlerleme penceresi modal değildir; çekilişe devam edilebilir
+        self.export_progress = QProgressDialog("Sonuçlar dışa aktarılıyor...", "İptal", 0, 100)
+        self.export_progress.setWindowTitle("Dışa Aktar")
+        self.export_progress.setWindowModality(Qt.NonModal)
+        self.export_progress.setMinimumDuration(0)
+        
+        meta = {'source': str(JSON_FILE), 'commitment': self.engine.rng.commitment}
+        self.export_worker = ExportWorker(self.engine.results(), output_dir, certificate_format, meta)
+        self.export_worker.progress.connect(self.export_progress.setValue)
+        self.export_worker.exported.connect(self.on_results_exported)
+        self.export_worker.failed.connect(self.on_export_failed)
+        self.export_worker.finished.connect(self.export_progress.close)
+        self.export_progress.canceled.connect(self.export_worker.requestInterruption)
+        self.export_worker.start()
+    
+    def on_results_exported(self, message):
+        QMessageBox.information(None, "Dışa Aktar", message)
+    
+    def on_export_failed(self, message):
+        QMessageBox.critical(None, "Hata", f"Sonuçlar dışa aktarılırken hata oluştu: {message}")
+    
+    def show_names(self):
+        names_dialog = ParticipantDialog(self.engine.names)
         names_dialog.exec_()
     
     def reset_lottery(self):
         reply = QMessageBox.question(None, 'Çekilişi Sıfırla',
                                    'Çekilişi başlangıç durumuna sıfırlamak istediğinizden emin misiniz?\n'
-                                   'Bu işlem mevcut çekiliş listesini silecek ve yeni çekiliş ekleme ekranına yönlendirecektir.',
+                                   'Bu işlem mevcut çekilişi arşivleyecek ve yeni çekiliş ekleme ekranına yönlendirecektir. '
+                                   'Arşivlenen çekilişlere ETKİNLİKLER düğmesinden ulaşabilirsiniz.',
                                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
         
         if reply == QMessageBox.Yes:
             try:
-                logging.debug(f"Removing JSON file: {JSON_FILE}")
-                os.remove(JSON_FILE)
-                logging.debug("JSON file removed successfully")
+                self.stop_workers()
+                self.record_results()
+                self.engine.close()
+                # Liste, günlük ve sonuçlar silinmez; etkinlik arşivlenir
+                if CURRENT_EVENT is not None:
+                    logging.debug("Archiving event %s", CURRENT_EVENT['id'])
+                    event_store().archive(CURRENT_EVENT['id'])
+                    audit("event_archived", event=CURRENT_EVENT['id'])
+                    activate_event(None)
                 QMessageBox.information(None, "Başarılı", "Çekiliş başarıyla sıfırlandı!")
                 self.on_reset()
             except Exception as e:
-                logging.error(f"Error removing JSON file: {str(e)}")
-                QMessageBox.critical(None, "Hata", f"Dosya silinirken hata oluştu: {str(e)}")
+                logging.error("Error archiving event: %s", e)
+                QMessageBox.critical(None, "Hata", f"Çekiliş arşivlenirken hata oluştu: {str(e)}")
 
 
 if __name__ == "__main__":
+    # Paketlenmiş uygulamada sertifika süreçleri aynı çalıştırılabilir dosyayla açılır
+    multiprocessing.freeze_support()
+    LOG_LISTENER = setup_logging(DATA_DIR)
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(LOG_LISTENER.stop)
+    STARTUP.mark("app_created")
+    
+    if "--broadcast" in sys.argv or os.getenv("LOTTERY_BROADCAST"):
+        from broadcast_server import BroadcastServer
+        BROADCAST = BroadcastServer(port=int(os.getenv("LOTTERY_BROADCAST_PORT", "8765")))
+        try:
+            BROADCAST.start()
+            app.aboutToQuit.connect(BROADCAST.stop)
+        except OSError as e:
+            logging.error("Broadcast server could not start: %s", e)
+            BROADCAST = None
+    
+    # Pencere kurulurken kullanıcı hemen bir şey görsün
+    splash_pixmap = load_scaled_pixmap("inovellogo.png", 240, 240)
+    splash = QSplashScreen(splash_pixmap) if not splash_pixmap.isNull() else None
+    if splash:
+        splash.show()
+        app.processEvents()
+        STARTUP.mark("splash_shown")
     
     window = LotteryApp()
     
     window.show()
+    if splash:
+        splash.finish(window)
     sys.exit(app.exec_())
\ No newline at end of file
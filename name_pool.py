@@ -0,0 +1,241 @@
+import random
+
+
+# Çekiliş havuzu: isimler bir dizide, konumları bir sözlükte tutulur.
+# Üyelik kontrolü ve silme O(1), k kişilik örnekleme O(k) maliyetlidir.
+class NamePool:
+    def __init__(self, names=()):
+        self._items = []
+        self._index = {}
+        for name in names:
+            self.add(name)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __getitem__(self, position):
+        return self._items[position]
+
+    def add(self, name):
+        if name in self._index:
+            return False
+        self._index[name] = len(self._items)
+        self._items.append(name)
+        return True
+
+    def remove(self, name):
+        position = self._index.pop(name, None)
+        if position is None:
+            return False
+        # Son elemanı silinen elemanın yerine taşı (swap-remove)
+        last = self._items.pop()
+        if position < len(self._items):
+            self._items[position] = last
+            self._index[last] = position
+        return True
+
+    def remove_many(self, names):
+        return sum(1 for name in names if self.remove(name))
+
+    def position(self, name):
+        return self._index.get(name)
+
+    # remove'un tam tersi: isim eski konumuna döner, oraya taşınmış eleman sona geri gider.
+    # Geri almalar ters sırayla yapıldığında dizi silmeden önceki haline birebir döner;
+    # örnekleme konumlara bağlı olduğundan bu, yeniden oynatmada aynı sonucu verir.
+    def restore(self, name, position):
+        if name in self._index:
+            return False
+        position = min(position, len(self._items))
+        if position < len(self._items):
+            moved = self._items[position]
+            self._index[moved] = len(self._items)
+            self._items.append(moved)
+            self._items[position] = name
+        else:
+            self._items.append(name)
+        self._index[name] = position
+        return True
+
+    def sample(self, k, rng=random):
+        # range üzerinde örnekleme havuzu kopyalamaz, yalnızca k indeks üretir
+        positions = rng.sample(range(len(self._items)), k)
+        return [self._items[position] for position in positions]
+
+    def to_list(self):
+        return list(self._items)
+
+
+# O(n) kurulum: her düğüm kendi değerini ebeveynine aktarır. Boş kapasite düğümleri de
+# aktarılmalı; yoksa sondaki düğümler eksik toplam taşır ve _find dizinin dışına inebilir.
+def build_fenwick(values, capacity):
+    tree = [0] * (capacity + 1)
+    for position, value in enumerate(values, 1):
+        tree[position] = value
+    for position in range(1, capacity + 1):
+        parent = position + (position & -position)
+        if parent <= capacity:
+            tree[parent] += tree[position]
+    return tree
+
+
+# Konum başına değerlerin önek toplamlarını tutan Fenwick ağacı işlemleri (self._tree)
+class FenwickMixin:
+    def _update(self, position, delta):
+        position += 1
+        while position < len(self._tree):
+            self._tree[position] += delta
+            position += position & -position
+
+    def _prefix_sum(self, count):
+        total = 0
+        while count > 0:
+            total += self._tree[count]
+            count -= count & -count
+        return total
+
+    # Önek toplamı target'ı aşan ilk konumu ikili iniş ile bulur
+    def _find(self, target):
+        position = 0
+        step = 1 << (len(self._tree) - 1).bit_length()
+        while step:
+            next_position = position + step
+            if next_position < len(self._tree) and self._tree[next_position] <= target:
+                position = next_position
+                target -= self._tree[next_position]
+            step >>= 1
+        return position
+
+
+# Her ismin bilet sayısı kadar ağırlıkla çekildiği havuz. Ağırlıklar dizideki
+# konumlara göre bir Fenwick ağacında tutulur; çekiliş ve silme O(log n)'dir.
+class WeightedNamePool(FenwickMixin, NamePool):
+    def __init__(self, names=(), weights=None):
+        self.weights = weights or {}
+        super().__init__()
+        for name in names:
+            NamePool.add(self, name)
+        self._rebuild(max(len(self._items), 1))
+
+    def weight(self, name):
+        return self.weights.get(name, 1)
+
+    @property
+    def total_weight(self):
+        return self._prefix_sum(len(self._items))
+
+    def _rebuild(self, capacity):
+        self._tree = build_fenwick((self.weight(name) for name in self._items), capacity)
+
+    def add(self, name):
+        if not super().add(name):
+            return False
+        if len(self._items) >= len(self._tree):
+            self._rebuild(len(self._items) * 2)
+        else:
+            self._update(len(self._items) - 1, self.weight(name))
+        return True
+
+    def remove(self, name):
+        position = self._index.get(name)
+        if position is None:
+            return False
+        last_position = len(self._items) - 1
+        last = self._items[last_position]
+        # Swap-remove'un ağaçtaki karşılığı: son eleman silinenin yerine taşınır
+        if position == last_position:
+            self._update(position, -self.weight(name))
+        else:
+            self._update(position, self.weight(last) - self.weight(name))
+            self._update(last_position, -self.weight(last))
+        return super().remove(name)
+
+    def restore(self, name, position):
+        position = min(position, len(self._items))
+        moved = self._items[position] if position < len(self._items) else None
+        if not super().restore(name, position):
+            return False
+        if len(self._items) >= len(self._tree):
+            self._rebuild(len(self._items) * 2)
+        elif moved is None:
+            self._update(position, self.weight(name))
+        else:
+            self._update(position, self.weight(name) - self.weight(moved))
+            self._update(len(self._items) - 1, self.weight(moved))
+        return True
+
+    def sample(self, k, rng=random):
+        if k > len(self._items):
+            raise ValueError("Sample larger than population")
+        selected = []
+        # Seçilenlerin ağırlığı geçici olarak sıfırlanır, böylece tekrar seçilemezler
+        for _ in range(k):
+            position = self._find(rng.randrange(self.total_weight))
+            name = self._items[position]
+            self._update(position, -self.weight(name))
+            selected.append((position, name))
+        for position, name in selected:
+            self._update(position, self.weight(name))
+        return [name for _, name in selected]
+
+
+# Sırası korunan ve ortasından silinebilen liste. Silinen eleman yerinde mezar taşı olarak
+# kalır, canlı elemanlar bir Fenwick ağacında sayılır: satır -> konum eşlemesi ve silme
+# O(log n)'dir, kaydırma yapılmaz. Mezar taşları canlılardan çok olunca liste bir kez
+# sıkıştırılır (silme başına amortize O(1)).
+class TombstoneList(FenwickMixin):
+    def __init__(self, items=()):
+        self._items = list(items)
+        self._alive = [True] * len(self._items)
+        self._live = len(self._items)
+        self._rebuild(max(len(self._items) * 2, 16))
+
+    def _rebuild(self, capacity):
+        self._tree = build_fenwick(map(int, self._alive), capacity)
+
+    def __len__(self):
+        return self._live
+
+    def __iter__(self):
+        return (item for item, alive in zip(self._items, self._alive) if alive)
+
+    def _position(self, row):
+        if not 0 <= row < self._live:
+            raise IndexError(row)
+        return self._find(row)
+
+    def __getitem__(self, row):
+        return self._items[self._position(row)]
+
+    def append(self, item):
+        self._items.append(item)
+        self._alive.append(True)
+        self._live += 1
+        if len(self._items) >= len(self._tree):
+            self._rebuild(len(self._items) * 2)
+        else:
+            self._update(len(self._items) - 1, 1)
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def delete(self, row):
+        position = self._position(row)
+        self._alive[position] = False
+        self._items[position] = None
+        self._live -= 1
+        self._update(position, -1)
+        if len(self._items) - self._live > max(self._live, 64):
+            self.compact()
+
+    def compact(self):
+        self._items = list(self)
+        self._alive = [True] * len(self._items)
+        self._rebuild(max(len(self._items) * 2, 16))
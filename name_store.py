@@ -0,0 +1,262 @@
+import argparse
+import json
+import mmap
+import os
+import random
+import shutil
+import struct
+import sys
+import tempfile
+import zlib
+from array import array
+
+
+# Sıkıştırılmış, bellek eşlemeli katılımcı deposu (.lns).
+# Düzen: başlık | ofset tablosu (count+1 x u64) | karma tablosu (u32, 0 = boş)
+#        | silinmiş bit eşlemi | UTF-8 isim blobu
+# Tablolar makinenin yerel bayt sırasıyla yazılır; hedef platformlar little-endian'dır.
+MAGIC = b"LTNS"
+VERSION = 1
+HEADER = struct.Struct("<4sIQQQQQQ")
+
+
+class NameStore:
+    def __init__(self, path):
+        self.path = path
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, self.count, self.table_size, offsets_start,
+         table_start, bitmap_start, blob_start) = HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"Not a name store: {path}")
+
+        view = memoryview(self.map)
+        self.offsets = view[offsets_start:table_start].cast("Q")
+        self.table = view[table_start:bitmap_start].cast("I")
+        self.bitmap_start = bitmap_start
+        self.blob = view[blob_start:]
+
+    def __len__(self):
+        return self.count
+
+    def name(self, name_id):
+        return str(self.blob[self.offsets[name_id]:self.offsets[name_id + 1]], "utf-8")
+
+    def lookup(self, name):
+        encoded = name.encode("utf-8")
+        slot = zlib.crc32(encoded) & (self.table_size - 1)
+        while True:
+            entry = self.table[slot]
+            if entry == 0:
+                return None
+            name_id = entry - 1
+            if self.blob[self.offsets[name_id]:self.offsets[name_id + 1]] == encoded:
+                return name_id
+            slot = (slot + 1) & (self.table_size - 1)
+
+    def is_removed(self, name_id):
+        return self.map[self.bitmap_start + (name_id >> 3)] & (1 << (name_id & 7)) != 0
+
+    def removed_ids(self):
+        bitmap = self.map[self.bitmap_start:self.bitmap_start + (self.count + 7) // 8]
+        for byte_index, byte in enumerate(bitmap):
+            if byte:
+                for bit in range(8):
+                    if byte & (1 << bit):
+                        yield byte_index * 8 + bit
+
+    def write_removed(self, removed_ids):
+        bitmap = bytearray((self.count + 7) // 8)
+        for name_id in removed_ids:
+            bitmap[name_id >> 3] |= 1 << (name_id & 7)
+        with open(self.path, "r+b") as file:
+            file.seek(self.bitmap_start)
+            file.write(bitmap)
+
+    def close(self):
+        self.offsets.release()
+        self.table.release()
+        self.blob.release()
+        self.map.close()
+        self.file.close()
+
+
+# NamePool ile aynı arayüz; isimler yerine 4 baytlık kimlikler tutulur ve
+# isim metni yalnızca gerektiğinde eşlenmiş blobdan çözülür
+class MappedNamePool:
+    def __init__(self, store):
+        self.store = store
+        self._ids = array("I", range(store.count))
+        self._positions = array("i", range(store.count))
+        for name_id in store.removed_ids():
+            self._remove_id(name_id)
+
+    @classmethod
+    def open(cls, path):
+        return cls(NameStore(path))
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, name):
+        name_id = self.store.lookup(name)
+        return name_id is not None and self._positions[name_id] >= 0
+
+    def __iter__(self):
+        return (self.store.name(name_id) for name_id in self._ids)
+
+    def __getitem__(self, position):
+        return self.store.name(self._ids[position])
+
+    def add(self, name):
+        name_id = self.store.lookup(name)
+        if name_id is None or self._positions[name_id] >= 0:
+            return False
+        self._positions[name_id] = len(self._ids)
+        self._ids.append(name_id)
+        return True
+
+    def remove(self, name):
+        name_id = self.store.lookup(name)
+        return name_id is not None and self._remove_id(name_id)
+
+    def _remove_id(self, name_id):
+        position = self._positions[name_id]
+        if position < 0:
+            return False
+        last = self._ids.pop()
+        if position < len(self._ids):
+            self._ids[position] = last
+            self._positions[last] = position
+        self._positions[name_id] = -1
+        return True
+
+    def remove_many(self, names):
+        return sum(1 for name in names if self.remove(name))
+
+    def position(self, name):
+        name_id = self.store.lookup(name)
+        if name_id is None or self._positions[name_id] < 0:
+            return None
+        return self._positions[name_id]
+
+    # NamePool.restore ile aynı: swap-remove'u birebir tersine çevirir
+    def restore(self, name, position):
+        name_id = self.store.lookup(name)
+        if name_id is None or self._positions[name_id] >= 0:
+            return False
+        position = min(position, len(self._ids))
+        if position < len(self._ids):
+            moved = self._ids[position]
+            self._positions[moved] = len(self._ids)
+            self._ids.append(moved)
+            self._ids[position] = name_id
+        else:
+            self._ids.append(name_id)
+        self._positions[name_id] = position
+        return True
+
+    def sample(self, k, rng=random):
+        positions = rng.sample(range(len(self._ids)), k)
+        return [self.store.name(self._ids[position]) for position in positions]
+
+    def to_list(self):
+        return list(self)
+
+    def close(self):
+        self.store.close()
+
+    def save_removed(self):
+        self.store.write_removed(name_id for name_id in range(self.store.count)
+                                 if self._positions[name_id] < 0)
+
+
+def write_store(names, path):
+    offsets = array("Q", [0])
+    hashes = array("I")
+    directory = os.path.dirname(os.path.abspath(path))
+
+    # İsimler önce geçici bir blob dosyasına akıtılır; sayı bilinince başlık yazılır
+    with tempfile.TemporaryFile(dir=directory) as blob_file:
+        for name in names:
+            encoded = name.encode("utf-8")
+            blob_file.write(encoded)
+            offsets.append(offsets[-1] + len(encoded))
+            hashes.append(zlib.crc32(encoded))
+        count = len(hashes)
+
+        table_size = 1
+        while table_size < count * 2:
+            table_size <<= 1
+        table = array("I", [0]) * table_size
+        for name_id, name_hash in enumerate(hashes):
+            slot = name_hash & (table_size - 1)
+            while table[slot]:
+                slot = (slot + 1) & (table_size - 1)
+            table[slot] = name_id + 1
+
+        offsets_start = HEADER.size
+        table_start = offsets_start + offsets.itemsize * len(offsets)
+        bitmap_start = table_start + table.itemsize * len(table)
+        blob_start = bitmap_start + (count + 7) // 8
+
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, count, table_size, offsets_start,
+                                   table_start, bitmap_start, blob_start))
+            offsets.tofile(file)
+            table.tofile(file)
+            file.write(bytes((count + 7) // 8))
+            blob_file.seek(0)
+            shutil.copyfileobj(blob_file, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    return count
+
+
+def json_to_store(json_path, store_path):
+    with open(json_path, "r", encoding="utf-8") as file:
+        data = json.load(file)
+    return write_store(data["names"], store_path)
+
+
+# JSON dizisi isim isim yazılır; tüm liste bellekte birleştirilmez
+def store_to_json(store_path, json_path, include_removed=False):
+    store = NameStore(store_path)
+    try:
+        with open(json_path, "w", encoding="utf-8") as file:
+            file.write('{"names": [')
+            first = True
+            for name_id in range(store.count):
+                if not include_removed and store.is_removed(name_id):
+                    continue
+                file.write(("" if first else ", ") + json.dumps(store.name(name_id), ensure_ascii=False))
+                first = False
+            file.write("]}")
+    finally:
+        store.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="JSON isim listesi ile .lns deposu arasında dönüştürür.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    to_store = subparsers.add_parser("to-store", help="list.json -> .lns")
+    to_store.add_argument("source")
+    to_store.add_argument("target")
+    to_json = subparsers.add_parser("to-json", help=".lns -> JSON")
+    to_json.add_argument("source")
+    to_json.add_argument("target")
+    to_json.add_argument("--include-removed", action="store_true")
+    args = parser.parse_args(argv)
+
+    if args.command == "to-store":
+        count = json_to_store(args.source, args.target)
+        print(f"{count} names written to {args.target}")
+    else:
+        store_to_json(args.source, args.target, args.include_removed)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+import csv
+import unicodedata
+from array import array
+from bisect import bisect_left
+
+
+# Harf başına katlama tablosu: bir karakterin NFKD ayrıştırmasından aksan işaretleri
+# (U+0300–U+036F) atılır, ayrıştırılamayan noktasız ı ise i'ye indirgenir. Sonuç ilk
+# karşılaşmada hesaplanıp saklanır; böylece her isim için NFKD çalıştırılmaz.
+class _AccentFold(dict):
+    def __missing__(self, code):
+        folded = "".join(char for char in unicodedata.normalize("NFKD", chr(code))
+                         if not 0x0300 <= ord(char) < 0x0370)
+        self[code] = folded = folded.replace("ı", "i")
+        return folded
+
+
+_ACCENT_FOLD = _AccentFold()
+
+
+# Karşılaştırma anahtarı: Türkçe küçük harf, tek boşluk ve aksansız yazım.
+# "IŞIK", "Işık" ve "isik" aynı anahtarı üretir.
+def normalize_name(name):
+    # Türkçe büyük I/İ harfleri genel küçültmeden önce doğru karşılıklarına çevrilir
+    key = " ".join(name.replace("I", "ı").replace("İ", "i").casefold().split())
+    if not key.isascii():
+        key = key.translate(_ACCENT_FOLD)
+    return key
+
+
+# Tek geçişte, anahtar kümesiyle tekrarları ayıklar; ilk yazım korunur
+def dedupe_names(names):
+    seen = set()
+    unique_names = []
+    duplicate_names = []
+    for name in names:
+        key = normalize_name(name)
+        if key in seen:
+            duplicate_names.append(name)
+        else:
+            seen.add(key)
+            unique_names.append(name)
+    return unique_names, duplicate_names
+
+
+# CSV başlık satırında sık görülen isim sütunu adları (normalize edilmiş halleri)
+_HEADER_NAMES = {"name", "names", "isim", "ad", "ad soyad", "adi soyadi", "katilimci"}
+_WEIGHT_HEADERS = {"weight", "tickets", "bilet", "bilet sayisi", "agirlik"}
+
+
+# Açık bir metin dosyasından isimleri satır satır üretir; tüm dosya belleğe alınmaz.
+# CSV dosyalarında ilk sütun okunur, ayraç (virgül/noktalı virgül) ilk satırdan seçilir.
+# weights sözlüğü verilirse ikinci sütundaki pozitif tam sayılar bilet sayısı olarak eklenir;
+# boş hücre bir bilettir. Sayı olmayan değerler ve 0 satır numarasıyla ValueError verir
+# (0 biletli kişi çekilişe katılamaz; sessizce bir bilete çevrilmek yerine listeden çıkarılmalıdır).
+# Başlık satırı varsa bilet sütunu adından tanınır; diğer sütunlar attributes sözlüğüne
+# isim başına {sütun adı: değer} olarak eklenir (bölüm, kampüs gibi kural öznitelikleri).
+def iter_name_file(file, is_csv=False, weights=None, attributes=None):
+    if not is_csv:
+        for line in file:
+            name = line.strip()
+            if name:
+                yield name
+        return
+
+    first_line = file.readline()
+    delimiter = ";" if first_line.count(";") > first_line.count(",") else ","
+    rows = csv.reader(_prepend(first_line, file), delimiter=delimiter)
+    weight_column = 1
+    attribute_columns = {}
+    for row_number, row in enumerate(rows):
+        if not row:
+            continue
+        name = row[0].strip()
+        if row_number == 0 and normalize_name(name) in _HEADER_NAMES:
+            weight_column = None
+            for position, column in enumerate(row[1:], 1):
+                if normalize_name(column) in _WEIGHT_HEADERS:
+                    weight_column = position
+                elif column.strip():
+                    attribute_columns[position] = column.strip()
+            continue
+        if name:
+            if weights is not None and weight_column is not None and len(row) > weight_column:
+                weight = row[weight_column].strip()
+                if weight:
+                    if not (weight.isascii() and weight.isdigit()):
+                        raise ValueError(f"{rows.line_num}. satır: '{weight}' geçerli bir bilet sayısı değil")
+                    if int(weight) == 0:
+                        raise ValueError(f"{rows.line_num}. satır: '{name}' için bilet sayısı 0; "
+                                         f"çekilişe katılmayacaksa listeden çıkarın")
+                    if int(weight) > 1:
+                        weights[name] = int(weight)
+            if attributes is not None and attribute_columns:
+                values = {column: row[position].strip() for position, column in attribute_columns.items()
+                          if position < len(row) and row[position].strip()}
+                if values:
+                    attributes[name] = values
+            yield name
+
+
+def _prepend(first_line, lines):
+    yield first_line
+    yield from lines
+
+
+# Havuz üzerinde normalize edilmiş anahtarlarla arama dizini. Anahtarlar sıralı bir
+# dizide tutulur; önek araması ikili arama ile O(log n + k) maliyetlidir.
+# Soyadı gibi ikinci ve sonraki kelimelerden başlayan aramalar ayrı bir sıralı dizinde yapılır.
+# Dizin bir kez kurulur; silinen isimler sorgu sırasında contains ile elenir.
+# should_stop verilirse aşamalar arasında ve uzun döngülerde yoklanır; doğru döndüğünde kurulum
+# yarıda bırakılır ve cancelled işaretlenir (yarım dizin kullanılmamalıdır).
+class NameIndex:
+    STOP_CHECK_INTERVAL = 65536
+
+    def __init__(self, names, should_stop=None):
+        self.cancelled = False
+        stop = should_stop or (lambda: False)
+        names = list(names)
+        if stop():
+            self.cancelled = True
+            return
+        keys = []
+        for count, name in enumerate(names, 1):
+            if count % self.STOP_CHECK_INTERVAL == 0 and stop():
+                self.cancelled = True
+                return
+            keys.append(normalize_name(name))
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        if stop():
+            self.cancelled = True
+            return
+        self.keys = [keys[position] for position in order]
+        self.names = [names[position] for position in order]
+
+        tokens = []
+        for position, key in enumerate(self.keys):
+            if position % self.STOP_CHECK_INTERVAL == 0 and stop():
+                self.cancelled = True
+                return
+            start = key.find(" ")
+            # Her kelime sınırından başlayan son ek saklanır: "kaya 12" de "ali kaya 12"yi bulur
+            while start >= 0:
+                tokens.append((key[start + 1:], position))
+                start = key.find(" ", start + 1)
+        tokens.sort()
+        if stop():
+            self.cancelled = True
+            return
+        self.token_keys = [token for token, _ in tokens]
+        self.token_positions = array("I", (position for _, position in tokens))
+        # Yakın eşleşme varyantları yalnızca listede geçen harflerle üretilir
+        self.alphabet = sorted(set("".join(self.keys)) - {" "})
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _prefix_positions(self, prefix, limit):
+        start = bisect_left(self.keys, prefix)
+        for position in range(start, len(self.keys)):
+            if not self.keys[position].startswith(prefix) or limit == 0:
+                return
+            limit -= 1
+            yield position
+
+    def _token_positions(self, prefix, limit):
+        start = bisect_left(self.token_keys, prefix)
+        for token_position in range(start, len(self.token_keys)):
+            if not self.token_keys[token_position].startswith(prefix) or limit == 0:
+                return
+            limit -= 1
+            yield self.token_positions[token_position]
+
+    # Tek harf silme, ekleme, değiştirme ve yer değiştirmeyle oluşan önekler
+    def _edits(self, key):
+        splits = [(key[:cut], key[cut:]) for cut in range(len(key) + 1)]
+        for left, right in splits:
+            if right:
+                yield left + right[1:]
+                for char in self.alphabet:
+                    if char != right[0]:
+                        yield left + char + right[1:]
+            if len(right) > 1:
+                yield left + right[1] + right[0] + right[2:]
+            for char in self.alphabet:
+                yield left + char + right
+
+    # Tam eşleşen anahtarın havuzdaki yazımını döndürür ("isik" -> "IŞIK")
+    def resolve(self, text, contains=None):
+        key = normalize_name(text)
+        for position in self._prefix_positions(key, len(self.keys)):
+            if self.keys[position] != key:
+                break
+            name = self.names[position]
+            if contains is None or contains(name):
+                return name
+        return None
+
+    # Sıralama: tam eşleşme, ismin başı, kelime başı, ardından bir harf hatalı önekler.
+    # Her aşamada en fazla limit aday incelenir; yanıt süresi liste boyutundan bağımsızdır.
+    def suggest(self, text, limit=20, contains=None, fuzzy=True):
+        key = normalize_name(text)
+        if not key:
+            return []
+        found = {}
+
+        def collect(positions):
+            for position in positions:
+                if len(found) >= limit:
+                    return
+                name = self.names[position]
+                if name not in found and (contains is None or contains(name)):
+                    found[name] = None
+
+        collect(self._prefix_positions(key, limit * 4))
+        collect(self._token_positions(key, limit * 4))
+        if fuzzy and len(found) < limit and len(key) >= 3:
+            for variant in self._edits(key):
+                if len(found) >= limit:
+                    break
+                collect(self._prefix_positions(variant, limit))
+                collect(self._token_positions(variant, limit))
+        return list(found)
@@ -0,0 +1,74 @@
+import argparse
+import logging
+import pathlib
+import sys
+import time
+
+from draw_engine import DrawEngine, InsufficientParticipantsError
+from draw_journal import DrawJournal
+
+
+# list.json ve olay geçmişinden etkinliği baştan türetir; kayıtlı her çekilişin
+# aynı tohumla birebir yeniden üretildiğini doğrular
+def replay(json_path, journal):
+    events = list(journal.history())
+    if not events or events[0]['type'] != "rng":
+        return ["Journal does not start with an RNG record; the event cannot be replayed"], None
+
+    engine = DrawEngine.from_file(json_path)
+    mismatches = []
+    for event in events:
+        if event['type'] != "draw":
+            engine.apply_event(event)
+            continue
+
+        seq = event.get('seq')
+        if engine.current_index != event['index']:
+            mismatches.append(f"seq {seq}: draw index {event['index']} recorded, replay is at {engine.current_index}")
+            engine.apply_event({'type': "goto", 'index': event['index']})
+        try:
+            winners = engine.draw()
+        except InsufficientParticipantsError as e:
+            mismatches.append(f"seq {seq}: {str(e)}")
+            engine.apply_event(event)
+            continue
+        if winners['main'] != event['main'] or winners['backup'] != event['backup']:
+            mismatches.append(f"seq {seq}: draw {event['index']} winners differ from the record")
+        if 'rng_state' in event and engine.rng.checkpoint() != event['rng_state']:
+            mismatches.append(f"seq {seq}: RNG state {engine.rng.checkpoint()} != recorded {event['rng_state']}")
+
+    # Uygulamanın kaldığı durum (anlık görüntü + günlük) ile yeniden türetilen sonuç karşılaştırılır
+    stored = DrawEngine.from_file(json_path)
+    stored.replay(*journal.load())
+    if stored.winners_history != engine.winners_history:
+        mismatches.append("Stored winners_history does not match the replayed event")
+    if stored.current_index != engine.current_index:
+        mismatches.append(f"Stored draw index {stored.current_index} != replayed {engine.current_index}")
+    return mismatches, engine
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Kayıtlı bir çekiliş etkinliğini tohumundan yeniden üretip doğrular.")
+    parser.add_argument("input", type=pathlib.Path, help="list.json dosyası (günlük dosyaları yanında olmalı)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    started = time.perf_counter()
+    mismatches, engine = replay(args.input, DrawJournal(args.input))
+    elapsed = (time.perf_counter() - started) * 1000
+
+    for mismatch in mismatches:
+        print(f"MISMATCH {mismatch}")
+    if mismatches:
+        print(f"Verification FAILED ({len(mismatches)} problems, {elapsed:.1f} ms)")
+        return 1
+    print(f"Verified {len(engine.winners_history)} draws, seed commitment {engine.rng.commitment} "
+          f"({elapsed:.1f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
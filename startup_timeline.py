@@ -0,0 +1,53 @@
+import json
+import logging
+import time
+
+
+# Açılış aşamalarının süresini kaydeder. Her işaret bir önceki işaretten bu yana
+# geçen süreyi ve süreç başından itibaren toplam süreyi tutar.
+class StartupTimeline:
+    def __init__(self, target_ms=1000):
+        self.started = time.perf_counter()
+        self.last = self.started
+        self.target_ms = target_ms
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append({
+            'phase': phase,
+            'duration_ms': round((now - self.last) * 1000, 2),
+            'elapsed_ms': round((now - self.started) * 1000, 2)
+        })
+        self.last = now
+
+    def elapsed_ms(self, phase):
+        for entry in self.phases:
+            if entry['phase'] == phase:
+                return entry['elapsed_ms']
+        return None
+
+    def report(self):
+        lines = ["Startup timeline:"]
+        for entry in self.phases:
+            lines.append(f"  {entry['phase']:<20} {entry['duration_ms']:>9.2f} ms  (t={entry['elapsed_ms']:.2f} ms)")
+        first_frame = self.elapsed_ms("first_frame")
+        if first_frame is not None:
+            status = "OK" if first_frame <= self.target_ms else "OVER TARGET"
+            lines.append(f"  time to first frame: {first_frame:.2f} ms / target {self.target_ms} ms [{status}]")
+        return "\n".join(lines)
+
+    # Her açılış bir satır olarak eklenir; böylece sürümler arası karşılaştırma yapılabilir
+    def save(self, path):
+        record = {
+            'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+            'target_ms': self.target_ms,
+            'first_frame_ms': self.elapsed_ms("first_frame"),
+            'phases': self.phases
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as file:
+                file.write(json.dumps(record) + "\n")
+        except OSError as e:
+            logging.warning("Startup timeline could not be saved: %s", e)
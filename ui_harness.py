@@ -0,0 +1,263 @@
+import argparse
+import json
+import logging
+import os
+import pathlib
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+# Oturumlar ekran olmadan çalışsın
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent, QEventLoop, QObject, QTimer
+from PyQt5.QtWidgets import QApplication, QMessageBox
+
+import lottery
+
+# Olay döngüsünün ne sıklıkla yoklandığı; takılma bu aralığı aşan boşluk olarak ölçülür
+HEARTBEAT_MS = 5
+
+
+def synthetic_names(count):
+    return [f"Katılımcı {index:08d}" for index in range(count)]
+
+
+def summarize(values):
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {
+        'count': len(ordered),
+        'median_ms': round(statistics.median(ordered), 3),
+        'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        'max_ms': round(ordered[-1], 3)
+    }
+
+
+# Uygulamaya gelen çizim olaylarını sayar ve süre boyunca olay döngüsünün en uzun
+# takılmasını bir yoklama zamanlayıcısıyla izler
+class UiProbe(QObject):
+    def __init__(self, app):
+        super().__init__()
+        self.paint_events = 0
+        self.last_beat = time.perf_counter()
+        self.max_stall_ms = 0.0
+        app.installEventFilter(self)
+        self.heartbeat = QTimer(self)
+        self.heartbeat.setInterval(HEARTBEAT_MS)
+        self.heartbeat.timeout.connect(self.beat)
+        self.heartbeat.start()
+
+    def eventFilter(self, receiver, event):
+        if event.type() == QEvent.Paint:
+            self.paint_events += 1
+        return False
+
+    def beat(self):
+        now = time.perf_counter()
+        self.max_stall_ms = max(self.max_stall_ms, (now - self.last_beat) * 1000 - HEARTBEAT_MS)
+        self.last_beat = now
+
+    def reset(self):
+        self.paint_events = 0
+        self.max_stall_ms = 0.0
+        self.last_beat = time.perf_counter()
+
+
+# LotteryApp'i betikli oturumlarla sürer. Her eylem için:
+#   handler_ms  eylemin kendisi (GUI iş parçacığında eşzamanlı kısım)
+#   latency_ms  eylemden olay döngüsü yeniden boşalana kadar (kuyruktaki sinyaller ve silmeler dahil)
+#   paint_ms    ardından pencerenin tamamının eşzamanlı yeniden çizimi
+#   paint_events, stall_ms  bu sürede teslim edilen çizim olayları ve en uzun döngü takılması
+class UiHarness:
+    def __init__(self, app, workdir):
+        self.app = app
+        self.samples = []
+
+        # Gerçek veri dizinine dokunmamak için tüm yollar geçici dizine yönlendirilir
+        lottery.DATA_DIR = workdir
+        lottery.JSON_FILE = workdir / "list.json"
+        lottery.STORE_FILE = workdir / "names.lns"
+        lottery.CACHE_DIR = workdir / "cache"
+        lottery.STARTUP_LOG_FILE = workdir / "startup_timings.jsonl"
+        lottery.EVENTS = None
+        lottery.CURRENT_EVENT = None
+
+        self.probe = UiProbe(app)
+        self.window = None
+
+    def drain(self):
+        loop = QEventLoop()
+        QTimer.singleShot(0, loop.quit)
+        loop.exec_()
+        # deleteLater ile bırakılan ekranlar gerçek döngüde bu noktada silinir
+        QApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+    def action(self, session, name, function):
+        self.drain()
+        self.probe.reset()
+        started = time.perf_counter()
+        function()
+        handled = time.perf_counter()
+        self.drain()
+        drained = time.perf_counter()
+        paint_events = self.probe.paint_events
+        stall_ms = self.probe.max_stall_ms
+        self.window.repaint()
+        painted = time.perf_counter()
+        self.samples.append({
+            'session': session,
+            'action': name,
+            'handler_ms': round((handled - started) * 1000, 3),
+            'latency_ms': round((drained - started) * 1000, 3),
+            'paint_ms': round((painted - drained) * 1000, 3),
+            'paint_events': paint_events,
+            'stall_ms': round(stall_ms, 3)
+        })
+
+    # Arka plan işleri (liste yükleme) bitene kadar döngü çalıştırılır; takılma ayrıca kaydedilir
+    def wait(self, session, name, condition, timeout=600):
+        self.probe.reset()
+        started = time.perf_counter()
+        while not condition():
+            if time.perf_counter() - started > timeout:
+                raise TimeoutError(f"{name} did not finish in {timeout} s")
+            self.app.processEvents(QEventLoop.AllEvents, 50)
+        self.samples.append({
+            'session': session,
+            'action': name,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 3),
+            'paint_events': self.probe.paint_events,
+            'stall_ms': round(self.probe.max_stall_ms, 3)
+        })
+
+    def start(self):
+        self.window = lottery.LotteryApp()
+        self.window.show()
+        self.wait("startup", "startup", lambda: self.window.startup_finished and self.window.content_layout.count())
+
+    # Bir oturum: çekiliş satırları eklenir, liste kaydedilir, tüm çekilişler yapılır;
+    # aralarda geri alma/yineleme ve ekranlar arası gidiş geliş yapılır
+    def run_session(self, rows, size):
+        session = f"{rows} rows, {size} names"
+        window = self.window
+        self.action(session, "clear_content", window.clear_content)
+        self.action(session, "open_choose_screen", window.open_choose_screen)
+        choose_screen = window.choose_screen
+        model = choose_screen.draw_model
+        # Satırların yarısı tek tek eklenir, kalanı tablodan yapıştırılmış gibi topluca
+        for _ in range(rows // 2 - model.rowCount()):
+            self.action(session, "add_lottery_entry", choose_screen.add_lottery_entry)
+        pasted = "\n".join(f"Çekiliş {index}\t1\t1" for index in range(rows - max(model.rowCount(), rows // 2)))
+        self.action(session, "append_draw_text", lambda: choose_screen.append_draw_text(pasted))
+        for row in range(model.rowCount()):
+            model.setData(model.index(row, 1), 1)
+            model.setData(model.index(row, 2), 1)
+
+        choose_screen.imported_names = synthetic_names(size)
+        choose_screen.name_entry.clear()
+        self.action(session, "save_and_exit", choose_screen.save_and_exit)
+        self.wait(session, "load_until_ready", lambda: not window.draw_screen.loading)
+
+        draw_screen = window.draw_screen
+        draw_screen.skip_animation_check.setChecked(True)
+        for index in range(rows):
+            self.action(session, "perform_draw", draw_screen.start_draw)
+            if index % 4 == 3:
+                self.action(session, "undo", draw_screen.undo)
+                self.action(session, "redo", draw_screen.redo)
+            if index < rows - 1:
+                self.action(session, "remove_all_and_next", draw_screen.remove_all_and_next)
+        for _ in range(min(rows - 1, 5)):
+            self.action(session, "undo", draw_screen.undo)
+
+        # Ekranlar arası gidiş geliş: seçim ekranı ve aynı etkinliğin yeniden açılması
+        self.action(session, "open_choose_screen", window.open_choose_screen)
+        self.action(session, "open_draw_screen", window.open_draw_screen)
+        self.wait(session, "load_until_ready", lambda: not window.draw_screen.loading)
+        window.release_draw_screen()
+
+    def report(self):
+        groups = {}
+        for sample in self.samples:
+            groups.setdefault((sample['session'], sample['action']), []).append(sample)
+        summary = []
+        for (session, action), samples in groups.items():
+            entry = {'session': session, 'action': action}
+            for key in ("handler_ms", "latency_ms", "paint_ms", "stall_ms"):
+                values = [sample[key] for sample in samples if key in sample]
+                if values:
+                    entry[key] = summarize(values)
+            entry['paint_events'] = sum(sample['paint_events'] for sample in samples)
+            summary.append(entry)
+        return summary
+
+
+def print_summary(summary):
+    print(f"{'session':<24} {'action':<22} {'n':>4} {'latency p95':>12} {'max':>10} {'paint p95':>10} {'stall max':>10}")
+    for entry in summary:
+        latency = entry['latency_ms']
+        paint = entry.get('paint_ms', {})
+        print(f"{entry['session']:<24} {entry['action']:<22} {latency['count']:>4} {latency['p95_ms']:>9.1f} ms"
+              f" {latency['max_ms']:>7.1f} ms {paint.get('p95_ms', 0):>7.1f} ms {entry['stall_ms']['max_ms']:>7.1f} ms",
+              flush=True)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Arayüzü ekransız sürer; eylem başına olay döngüsü gecikmesini ve çizim sürelerini ölçer.")
+    parser.add_argument("--rows", nargs="+", type=int, default=[5, 50], help="Oturum başına çekiliş satırı sayıları")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[10 ** 3, 10 ** 5], help="Katılımcı sayıları")
+    parser.add_argument("--output", type=pathlib.Path, default=pathlib.Path("ui_harness_results.json"),
+                        help="Makinece okunabilir rapor dosyası")
+    parser.add_argument("--max-latency-ms", type=float, default=None,
+                        help="Bir eylemin p95 gecikmesi bunu aşarsa çıkış kodu 1 olur (bekleme adımları hariç)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    app = QApplication.instance() or QApplication(sys.argv)
+    logging.getLogger().setLevel(logging.WARNING)
+    # Bilgi ve onay kutuları oturumu durdurmasın
+    QMessageBox.information = staticmethod(lambda *args, **kwargs: QMessageBox.Ok)
+    QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.Yes)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        harness = UiHarness(app, pathlib.Path(workdir))
+        harness.start()
+        for size in args.sizes:
+            for rows in args.rows:
+                harness.run_session(rows, size)
+        harness.window.background_pool.waitForDone()
+        lottery.event_store().close()
+        summary = harness.report()
+
+    print_summary(summary)
+    report = {
+        'timestamp': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'summary': summary,
+        'samples': harness.samples
+    }
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=4, ensure_ascii=False)
+    print(f"Report written to {args.output}")
+
+    if args.max_latency_ms is not None:
+        slow = [entry for entry in summary if 'handler_ms' in entry
+                and entry['latency_ms']['p95_ms'] > args.max_latency_ms]
+        for entry in slow:
+            print(f"SLOW {entry['session']} / {entry['action']}: p95 {entry['latency_ms']['p95_ms']:.1f} ms "
+                  f"> {args.max_latency_ms} ms")
+        if slow:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())